@@ -0,0 +1,151 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Row extraction (``check_values``) of a class returning many rows.
+
+Usage:
+    python -m benchmarks.extraction [--rows N] [--repeat N] [--json]
+
+Turns ``Win32_Printer`` rows into records, with every property present
+and with one property missing from every row, once with the
+per-property ``try``/``getattr`` loop lshw used to run and once with
+``RowExtractor``. Reports the median microseconds per row.
+
+Rows are ``WMIObject``, which looks properties up the way the ``wmi``
+package does, so missing properties cost what they cost there (without
+the COM calls themselves).
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+
+from lshw.classes.printer import Printer
+from lshw.classes.synthetic import build_fixture
+
+logger = logging.getLogger('lshw.classes.hardware_class')
+
+
+def legacy_check_values(collector):
+    """``HardwareClass.check_values`` before ``RowExtractor``."""
+    for hw_item in collector.hardware_set:
+        for prop in collector.properties_to_return:
+            try:
+                collector.properties_to_return[prop] = getattr(hw_item, prop)
+            except AttributeError as e:
+                logger.warning(f'Could not get property {prop} from {hw_item}: {e}')
+                collector.properties_to_return[prop] = collector.__DESC__
+        collector.hardware_set_to_return.append(collector.properties_to_return.copy())
+
+
+class WMIObject:
+    """
+    Row looked up like ``wmi._wmi_object``: ``properties`` lists the
+    property names of its class, other names go to the COM dispatcher
+    (here a case-insensitive dict), which raises ``AttributeError``.
+    """
+
+    def __init__(self, path, values):
+        self.path = path
+        self.properties = dict.fromkeys(values)
+        self._values = values
+        self._dispatch = {name.lower(): value for name, value in values.items()}
+
+    def __getattr__(self, name):
+        if name in self.properties:
+            return self._values[name]
+        try:
+            return self._dispatch[name.lower()]
+        except KeyError:
+            raise AttributeError(f'<unknown>.{name}') from None
+
+    def __repr__(self):
+        return f'<_wmi_object: {self.path}>'
+
+
+def printer_rows(rows, missing=None):
+    table = build_fixture(printers=rows)['tables']['Win32_Printer']
+    ret = []
+    for values in table['rows']:
+        row = {column: value for column, value in zip(table['columns'], values) if column != missing}
+        ret.append(WMIObject(f'\\\\BENCH\\root\\cimv2:Win32_Printer.DeviceID="{row["DeviceID"]}"', row))
+    return ret
+
+
+def _time(check_values, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        collector = Printer()
+        collector.hardware_set = list(rows)
+        start = time.perf_counter()
+        check_values(collector)
+        timings.append(time.perf_counter() - start)
+    return collector.hardware_set_to_return, statistics.median(timings)
+
+
+def measure(rows=1000, repeat=5):
+    """
+    Returns:
+        list: ``us_per_row`` of the ``legacy`` loop and of the
+        ``extractor``, for complete rows and for rows missing ``Local``.
+    """
+    results = []
+    for scenario, missing in (('complete', None), ('missing', 'Local')):
+        data = printer_rows(rows, missing)
+        legacy, legacy_seconds = _time(legacy_check_values, data, repeat)
+        extracted, extractor_seconds = _time(Printer.check_values, data, repeat)
+        if legacy != extracted:
+            raise AssertionError(f'{scenario}: the extractor returned different records')
+        results.append(
+            {
+                'scenario': scenario,
+                'rows': rows,
+                'legacy_us_per_row': round(legacy_seconds / rows * 1e6, 2),
+                'extractor_us_per_row': round(extractor_seconds / rows * 1e6, 2),
+            }
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.extraction', description=__doc__.split('\n\n')[0].strip()
+    )
+    parser.add_argument('--rows', type=int, default=1000, help='rows per run (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per scenario (default: 5)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    logging.disable(logging.WARNING)
+
+    results = measure(args.rows, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f'{"scenario":<9} {"rows":>6} {"legacy us/row":>14} {"extractor us/row":>17}')
+    for result in results:
+        print(
+            f'{result["scenario"]:<9} {result["rows"]:>6} {result["legacy_us_per_row"]:>14.2f} '
+            f'{result["extractor_us_per_row"]:>17.2f}'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Memory held per inventory node: ``Hardware`` versus ``CompactHardware``.
+
+Usage:
+    python -m benchmarks.memory [--machines N] [--json]
+
+Collects the ``large`` synthetic machine once, then keeps ``--machines``
+copies of its tree in memory in each representation, as an aggregation
+server would, and reports the traced bytes per node.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import sys
+import tracemalloc
+
+from lshw.classes.hardware import CompactHardware
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+from .run import SIZES, count_nodes
+
+
+def retained_bytes(build):
+    """Traced bytes still allocated by ``build()`` once it returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def measure(machines=20):
+    fixture = build_fixture(**{family: sizes[-1] for family, sizes in SIZES.items()})
+    tree = collect('ComputerSystem', children=True, connection=ReplayWMIConnection(fixture))
+    nodes = count_nodes(tree) * machines
+
+    full = retained_bytes(lambda: [copy.deepcopy(tree) for _ in range(machines)])
+    compact = retained_bytes(lambda: [[CompactHardware.from_hardware(node) for node in tree] for _ in range(machines)])
+
+    return {
+        'nodes': nodes,
+        'hardware_bytes_per_node': round(full / nodes, 1),
+        'compact_bytes_per_node': round(compact / nodes, 1),
+        'saving': round(1 - compact / full, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.memory', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--machines', type=int, default=20, help='inventories kept in memory (default: 20)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    logging.disable(logging.WARNING)
+
+    result = measure(args.machines)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(
+            f'{result["nodes"]} nodes: Hardware {result["hardware_bytes_per_node"]:.0f} B/node, '
+            f'CompactHardware {result["compact_bytes_per_node"]:.0f} B/node '
+            f'({result["saving"]:.0%} less)'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Peak memory of collecting a class that returns many rows.
+
+Usage:
+    python -m benchmarks.pipeline [--properties N] [--json]
+
+Collects ``Processor`` from connections returning more and more
+``Win32_Processor`` rows, created afresh on every call as the ``wmi``
+package creates COM objects. Besides the selected properties, rows carry
+``--properties`` more values, like the system properties (``__PATH``,
+``__CLASS``...) of WMI objects. Reports the peak traced memory of the pipeline lshw used to
+run (raw rows, records and nodes all kept until the class was done), of
+``format_data()`` and of ``iter_hardware()`` consumed one node at a time.
+Every run is a ``WMIConnection.session()``, as in the CLI and ``lshw.collector``.
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.processor import Processor
+from lshw.classes.replay import ReplayRow, ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+
+ROWS = (1000, 10000)
+
+
+class FreshRowsConnection(ReplayWMIConnection):
+    """``ReplayWMIConnection`` returning new row objects on every call, as WMI does."""
+
+    def _serve(self, key, answer, fields=None):
+        return [ReplayRow(row.properties) for row in super()._serve(key, answer, fields)]
+
+
+def processor_fixture(rows, properties):
+    """Fixture with ``rows`` processors, each with ``properties`` values besides the ones lshw reads."""
+    fixture = build_fixture()
+    table = fixture['tables']['Win32_Processor']
+    template = dict(zip(table['columns'], table['rows'][0]))
+    template.update((f'Property{index:03d}', f'Property{index:03d} value') for index in range(properties))
+    table['columns'] = list(template)
+    table['rows'] = [
+        [f'{value} #{index}' if isinstance(value, str) else value for value in template.values()]
+        for index in range(rows)
+    ]
+    return fixture
+
+
+def legacy_format_data(collector):
+    """``HardwareClass.format_data`` before rows and records were released."""
+    collector._validate_entity(collector.wmi_method)
+    for element in getattr(collector.wmi_system, collector.wmi_method)(collector.properties_to_get):
+        collector.hardware_set.append(element)
+    collector.hardware_set_to_return.extend(collector._extractor()(collector.hardware_set))
+
+    sentinels = (collector.__ERROR__, collector.__DESC__)
+    ret = []
+    for hw_item in collector.hardware_set_to_return:
+        item_ret = collector._populate_hardware(collector._new_item(), hw_item)
+        if item_ret is not None:
+            item_ret.blank_sentinels(sentinels)
+            ret.append(item_ret)
+    return ret
+
+
+def streamed(collector):
+    """Consume ``iter_hardware()`` as a writer would, keeping no node."""
+    return sum(len(json.dumps(node.to_dict())) for node in collector.iter_hardware())
+
+
+def peak_bytes(run, connection):
+    """Peak traced bytes while ``run(collector)`` collects ``Processor`` from ``connection`` in a session."""
+    tracemalloc.start()
+    try:
+        with WMIConnection.session(connection):
+            run(Processor())
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(rows, properties=10):
+    """
+    Returns:
+        dict: Peak ``legacy``, ``format_data`` and ``iter_hardware`` bytes.
+    """
+    connection = FreshRowsConnection(processor_fixture(rows, properties))
+
+    with WMIConnection.session(connection):
+        legacy = [node.to_dict() for node in legacy_format_data(Processor())]
+        current = [node.to_dict() for node in Processor().format_data()]
+    if legacy != current:
+        raise AssertionError('format_data() collects different processors')
+
+    return {
+        'rows': rows,
+        'legacy': peak_bytes(legacy_format_data, connection),
+        'format_data': peak_bytes(Processor.format_data, connection),
+        'iter_hardware': peak_bytes(streamed, connection),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.pipeline', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument(
+        '--properties', type=int, default=10, help='values per row besides the ones lshw reads (default: 10)'
+    )
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = [measure(rows, args.properties) for rows in ROWS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f'{"rows":>6} {"legacy MiB":>11} {"format_data MiB":>16} {"iter_hardware MiB":>18}')
+    for result in results:
+        print(
+            f'{result["rows"]:>6} {result["legacy"] / 2**20:>11.1f} {result["format_data"] / 2**20:>16.1f} '
+            f'{result["iter_hardware"] / 2**20:>18.1f}'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+``SELECT *`` against the declared projection of ``Win32_Printer``.
+
+Usage:
+    python -m benchmarks.projection [--repeat N] [--value-latency SECONDS] [--json]
+
+Collects the ``Printer`` class over print servers with more and more
+queues, whose rows carry every ``Win32_Printer`` property, once with the
+``SELECT *`` query lshw used to issue and once with the projection built
+from the class schema. Reports the property values marshalled through
+COM and the median time, with ``--value-latency`` seconds per value.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from lshw.classes.printer import Printer
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+
+QUEUES = (100, 1000)
+
+# Properties of Win32_Printer besides the ones lshw reads
+OTHER_PROPERTIES = (
+    'Attributes',
+    'Availability',
+    'AvailableJobSheets',
+    'AveragePagesPerMinute',
+    'Capabilities',
+    'CapabilityDescriptions',
+    'Comment',
+    'ConfigManagerErrorCode',
+    'ConfigManagerUserConfig',
+    'CreationClassName',
+    'CurrentCapabilities',
+    'CurrentCharSet',
+    'CurrentLanguage',
+    'CurrentMimeType',
+    'CurrentNaturalLanguage',
+    'CurrentPaperType',
+    'Default',
+    'DefaultCapabilities',
+    'DefaultCopies',
+    'DefaultLanguage',
+    'DefaultMimeType',
+    'DefaultNumberUp',
+    'DefaultPaperType',
+    'DefaultPriority',
+    'Description',
+    'DetectedErrorState',
+    'Direct',
+    'DoCompleteFirst',
+    'EnableBIDI',
+    'EnableDevQueryPrint',
+    'ErrorCleared',
+    'ErrorDescription',
+    'ErrorInformation',
+    'ExtendedDetectedErrorState',
+    'ExtendedPrinterStatus',
+    'Hidden',
+    'HorizontalResolution',
+    'InstallDate',
+    'JobCountSinceLastReset',
+    'KeepPrintedJobs',
+    'LanguagesSupported',
+    'LastErrorCode',
+    'Location',
+    'MarkingTechnology',
+    'MaxCopies',
+    'MaxNumberUp',
+    'MaxSizeSupported',
+    'MimeTypesSupported',
+    'NaturalLanguagesSupported',
+    'PaperSizesSupported',
+    'PaperTypesAvailable',
+    'Parameters',
+    'PNPDeviceID',
+    'PowerManagementCapabilities',
+    'PowerManagementSupported',
+    'PrinterPaperNames',
+    'PrinterState',
+    'PrinterStatus',
+    'PrintJobDataType',
+    'PrintProcessor',
+    'Priority',
+    'Published',
+    'Queued',
+    'RawOnly',
+    'SeparatorFile',
+    'ServerName',
+    'Shared',
+    'ShareName',
+    'SpoolEnabled',
+    'StartTime',
+    'Status',
+    'StatusInfo',
+    'SystemCreationClassName',
+    'SystemName',
+    'TimeOfLastReset',
+    'UntilTime',
+    'VerticalResolution',
+    'WorkOffline',
+)
+
+
+def print_server(queues):
+    """Fixture with ``queues`` printers carrying every ``Win32_Printer`` property."""
+    fixture = build_fixture(printers=queues)
+    printers = fixture['tables']['Win32_Printer']
+    printers['columns'] = printers['columns'] + list(OTHER_PROPERTIES)
+    for row in printers['rows']:
+        row.extend(f'{prop} value' for prop in OTHER_PROPERTIES)
+    return fixture
+
+
+def _select_all(table, where_clause=''):
+    return f'SELECT * FROM {table}'
+
+
+def collect_printers(fixture, select_all=False, value_latency=0.0):
+    """
+    Returns:
+        tuple: The printers and the ``ReplayWMIConnection`` that served them.
+    """
+    connection = ReplayWMIConnection(fixture, value_latency=value_latency)
+    printer = Printer()
+    printer.wmi_system = connection
+    if select_all:
+        printer.build_wql_select = _select_all
+    return printer.format_data(), connection
+
+
+def measure(queues, repeat=3, value_latency=1e-6):
+    """
+    Returns:
+        dict: ``values`` marshalled and median ``seconds`` for ``select_all``
+        and ``projection``.
+    """
+    fixture = print_server(queues)
+    result = {'queues': queues}
+    for name, select_all in (('select_all', True), ('projection', False)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            printers, connection = collect_printers(fixture, select_all, value_latency)
+            timings.append(time.perf_counter() - start)
+        result[name] = {'values': connection.values, 'seconds': round(statistics.median(timings), 4)}
+    if [p.to_dict() for p in collect_printers(fixture, True)[0]] != [p.to_dict() for p in printers]:
+        raise AssertionError('SELECT * and the projection collect different printers')
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.projection', description=__doc__.split('\n\n')[0].strip()
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size (default: 3)')
+    parser.add_argument(
+        '--value-latency', type=float, default=1e-6, help='seconds per marshalled property value (default: 1e-6)'
+    )
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = [measure(queues, args.repeat, args.value_latency) for queues in QUEUES]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f'{"queues":>6} {"query":<11} {"values":>8} {"seconds":>9}')
+    for result in results:
+        for name in ('select_all', 'projection'):
+            print(f'{result["queues"]:>6} {name:<11} {result[name]["values"]:>8} {result[name]["seconds"]:>9.4f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Full ``ComputerSystem`` collection over synthetic fixtures of increasing size.
+
+Usage:
+    python -m benchmarks.run [--quick] [--latency SECONDS] [--json] [--output FILE] [--baseline FILE]
+
+Each scenario grows one device family while the others stay at one
+device, plus a ``large`` scenario with every family at its maximum. Query
+count, wall time (median of ``--repeat`` runs) and peak traced memory are
+reported; with ``--baseline`` the run fails when queries grow at all or
+time/memory grow beyond the allowed ratios.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+SIZES = {
+    'disks': (1, 8, 64),
+    'usb_devices': (1, 50, 200),
+    'nics': (1, 8, 32),
+    'printers': (1, 100, 500),
+}
+
+
+def scenarios(quick=False):
+    """``{name: build_fixture kwargs}``, smallest first."""
+    ret = {'baseline': {}}
+    for family, sizes in SIZES.items():
+        for size in sizes[1:2] if quick else sizes[1:]:
+            ret[f'{family}={size}'] = {family: size}
+    if not quick:
+        ret['large'] = {family: sizes[-1] for family, sizes in SIZES.items()}
+    return ret
+
+
+def count_nodes(nodes):
+    return sum(1 + count_nodes(node.children or []) for node in nodes)
+
+
+def measure(fixture, latency=0.0, repeat=3, jobs=1):
+    """
+    Collect the whole tree over ``fixture``.
+
+    Returns:
+        dict: ``queries`` and ``rows`` served by WMI, ``nodes`` in the tree,
+        median ``seconds`` and ``peak_kib`` of traced memory.
+    """
+    timings = []
+    for _ in range(repeat):
+        connection = ReplayWMIConnection(fixture, latency=latency)
+        start = time.perf_counter()
+        nodes = collect('ComputerSystem', children=True, jobs=jobs, connection=connection)
+        timings.append(time.perf_counter() - start)
+
+    connection = ReplayWMIConnection(fixture)
+    tracemalloc.start()
+    try:
+        collect('ComputerSystem', children=True, jobs=jobs, connection=connection)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'queries': connection.calls,
+        'rows': connection.rows,
+        'nodes': count_nodes(nodes),
+        'seconds': round(statistics.median(timings), 6),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, max_slowdown=1.5, max_memory_growth=1.25):
+    """Regressions of ``results`` against a previous ``--output`` file, as messages."""
+    failures = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            failures.append(f'{name}: queries {previous["queries"]} -> {current["queries"]}')
+        if previous['seconds'] and current['seconds'] > previous['seconds'] * max_slowdown:
+            failures.append(f'{name}: time {previous["seconds"]:.4f}s -> {current["seconds"]:.4f}s')
+        if previous['peak_kib'] and current['peak_kib'] > previous['peak_kib'] * max_memory_growth:
+            failures.append(f'{name}: peak memory {previous["peak_kib"]} KiB -> {current["peak_kib"]} KiB')
+    return failures
+
+
+def format_table(results):
+    lines = [f'{"scenario":<18} {"queries":>8} {"rows":>8} {"nodes":>7} {"seconds":>9} {"peak KiB":>10}']
+    for name, result in results.items():
+        lines.append(
+            f'{name:<18} {result["queries"]:>8} {result["rows"]:>8} {result["nodes"]:>7} '
+            f'{result["seconds"]:>9.4f} {result["peak_kib"]:>10.1f}'
+        )
+    return '\n'.join(lines)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--quick', action='store_true', help='only the baseline and one mid-size scenario per family')
+    parser.add_argument('--latency', type=float, default=0.0005, help='seconds per WMI call (default: 0.0005)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per scenario (default: 3)')
+    parser.add_argument('--jobs', type=int, default=1, help='worker threads per fan-out (default: 1)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--output', metavar='FILE', help='save results as JSON, to be used as a later baseline')
+    parser.add_argument('--baseline', metavar='FILE', help='fail if results regress against this file')
+    parser.add_argument('--max-slowdown', type=float, default=1.5, help='allowed time ratio (default: 1.5)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.disable(logging.WARNING)
+
+    results = {}
+    for name, sizes in scenarios(args.quick).items():
+        results[name] = measure(build_fixture(**sizes), latency=args.latency, repeat=args.repeat, jobs=args.jobs)
+
+    print(json.dumps(results, indent=2) if args.json else format_table(results))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures = compare(results, json.load(f), max_slowdown=args.max_slowdown)
+        for failure in failures:
+            sys.stderr.write(f'REGRESSION {failure}\n')
+        return 1 if failures else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
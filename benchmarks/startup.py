@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cold-start latency of the ``lshw`` command.
+
+Usage:
+    python -m benchmarks.startup [--repeat N] [--json] [--max-import-ms MS]
+
+Runs ``lshw --help`` and ``lshw -c list`` in fresh interpreters and reports
+their median wall time beyond a bare ``python -c pass``, plus the import
+time of ``lshw.__main__`` as reported by ``python -X importtime``. With
+``--max-import-ms`` the run fails when that import is slower.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    'help': ['-m', 'lshw', '--help'],
+    'list': ['-m', 'lshw', '-c', 'list'],
+}
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(args):
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    return time.perf_counter() - start
+
+
+def import_ms(module='lshw.__main__'):
+    """Cumulative import time of ``module`` in a fresh interpreter, in milliseconds."""
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$', line)
+        if match and match.group(3) == module and not match.group(2):
+            return int(match.group(1)) / 1000
+    raise ValueError(f'{module} not found in the import profile')
+
+
+def measure(repeat=5):
+    """
+    Returns:
+        dict: median milliseconds per command beyond interpreter start-up,
+        and ``import_ms`` (median) of ``lshw.__main__``.
+    """
+    python = statistics.median(_run(['-c', 'pass']) for _ in range(repeat))
+    results = {
+        name: round((statistics.median(_run(args) for _ in range(repeat)) - python) * 1000, 1)
+        for name, args in COMMANDS.items()
+    }
+    results['import_ms'] = round(statistics.median(import_ms() for _ in range(repeat)), 1)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--repeat', type=int, default=5, help='runs per command (default: 5)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--max-import-ms', type=float, help='fail if importing lshw.__main__ takes longer')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = measure(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f'{name:<10} {value:>8.1f} ms')
+
+    if args.max_import_ms is not None and results['import_ms'] > args.max_import_ms:
+        sys.stderr.write(f'REGRESSION import lshw.__main__: {results["import_ms"]} ms > {args.max_import_ms} ms\n')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Scaling of the IDE and USB topology builders.
+
+Usage:
+    python -m benchmarks.topology [--repeat N] [--json] [--max-growth RATIO]
+
+Collects the ``Ide`` and ``Usb`` subtrees of synthetic machines with more
+and more controllers and dependents (disks without partitions, USB
+devices) and reports the median time per dependent. The builders are
+linear when that time stays flat; with ``--max-growth`` the run fails
+when it grows more than RATIO times from the smallest to the largest size.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+# (controllers, dependents per family)
+SIZES = ((10, 100), (100, 1000), (400, 4000))
+
+
+def measure(controllers, dependents, repeat=3):
+    """
+    Returns:
+        dict: median ``seconds`` and ``us_per_dependent`` of the ``Ide`` and
+        ``Usb`` collections, and the WMI ``queries`` they issued.
+    """
+    fixture = build_fixture(
+        disks=dependents,
+        usb_devices=dependents,
+        partitions_per_disk=1,
+        ide_controllers=controllers,
+        usb_controllers=controllers,
+    )
+    timings = []
+    for _ in range(repeat):
+        connection = ReplayWMIConnection(fixture)
+        start = time.perf_counter()
+        nodes = collect('Ide', connection=connection) + collect('Usb', connection=connection)
+        timings.append(time.perf_counter() - start)
+
+    attached = sum(len(node.children) for node in nodes)
+    if attached != 2 * dependents:
+        raise AssertionError(f'{attached} dependents attached, {2 * dependents} expected')
+
+    seconds = statistics.median(timings)
+    return {
+        'controllers': controllers,
+        'dependents': dependents,
+        'seconds': round(seconds, 4),
+        'us_per_dependent': round(seconds / (2 * dependents) * 1e6, 1),
+        'queries': connection.calls,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.topology', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size (default: 3)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--max-growth', type=float, help='fail if the time per dependent grows more than RATIO times')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = [measure(controllers, dependents, args.repeat) for controllers, dependents in SIZES]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'{"controllers":>11} {"dependents":>10} {"seconds":>9} {"us/dependent":>13} {"queries":>8}')
+        for result in results:
+            print(
+                f'{result["controllers"]:>11} {result["dependents"]:>10} {result["seconds"]:>9.4f} '
+                f'{result["us_per_dependent"]:>13.1f} {result["queries"]:>8}'
+            )
+
+    growth = results[-1]['us_per_dependent'] / results[0]['us_per_dependent']
+    if args.max_growth is not None and growth > args.max_growth:
+        sys.stderr.write(f'REGRESSION time per dependent grew {growth:.1f}x > {args.max_growth}x\n')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,13 +21,10 @@ import argparse
 import json
 import logging
 import sys
+from contextlib import ExitStack, contextmanager, suppress
 
-if sys.platform == 'win32':
-    import wmi
-else:
-    from lshw.classes.hardware_class import wmi  # use the stub
-
-from lshw.classes import HardwareClass
+# Feature modules (hardware classes, caches, replay, diff, streaming...) are
+# imported by the branches using them, so "-c list" and "--help" stay fast.
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +33,7 @@ ALL_OK = 0
 EXIT_ERROR = 1
 EXIT_USAGE = 2
 EXIT_PERMISSION = 13
+EXIT_UNCHANGED = 100  # --if-changed: same hardware fingerprint, nothing collected
 
 AVAILABLE_CLASSES = {
     'system': 'ComputerSystem',
@@ -61,6 +59,8 @@ AVAILABLE_CLASSES = {
     'cache': 'CacheMemory',
 }
 
+STREAM_FORMATS = ('json', 'ndjson')  # lshw.stream.WRITERS
+
 
 def _exit_manager(exit_code, exit_element='', error_detail=None):
     """
@@ -99,6 +99,210 @@ def _usage_examples():
     print(f'\t{PROGRAM} --c memory')
     print(f'\t{PROGRAM} --class-hw memory')
 
+    print('\n  ' + 'Print several hardware classes, with the subtree of some of them:')
+    print(f'\t{PROGRAM} -c disk,network,memory')
+    print(f'\t{PROGRAM} -c disk,network --with-children disk')
+
+    print('\n  ' + 'Print only the changes since a previous JSON output:')
+    print(f'\t{PROGRAM} --delta last.json')
+    print(f'\t{PROGRAM} diff last.json current.json')
+
+    print('\n  ' + 'Keep a server answering lshw-client requests:')
+    print(f'\t{PROGRAM} --serve')
+    print('\tlshw-client -c disk --with-children --max-age 60')
+
+    print('\n  ' + 'Print the WMI queries of a collection without running it, then with recorded timings:')
+    print(f'\t{PROGRAM} --explain -c disk --with-children')
+    print(f'\t{PROGRAM} --profile json 2> profile.json && {PROGRAM} --explain profile.json')
+
+    print('\n  ' + 'Skip the inventory when the hardware has not changed (exit code 100):')
+    print(f'\t{PROGRAM} --fingerprint')
+    print(f'\t{PROGRAM} -j --if-changed <fingerprint>')
+
+
+@contextmanager
+def _collection(args, connection=None):
+    """Run-scoped WMI session, executor and (with --profile) profiler."""
+    from lshw.classes.hardware_class import WMIConnection
+
+    with ExitStack() as stack:
+        stack.enter_context(WMIConnection.session(connection, cache=_cache(args)))
+        if args.jobs > 1:
+            from lshw.classes.parallel import parallel_collection
+
+            stack.enter_context(parallel_collection(args.jobs))
+        if args.profile:
+            from lshw.classes.profiler import profiling
+
+            yield stack.enter_context(profiling())
+        else:
+            yield None
+
+    if args.record and not args.replay:  # --replay wins, see _connection()
+        connection.save(args.record)
+
+
+def _cache(args):
+    """On-disk inventory cache for --cache, --cache-dir and --max-age, or None."""
+    if args.record or not (args.cache or args.cache_dir or args.max_age is not None):
+        # a recording must contain every WMI call of the run
+        return None
+
+    from lshw.classes.inventory_cache import InventoryCache
+
+    return InventoryCache(args.cache_dir, max_age=args.max_age)
+
+
+def _connection(args):
+    """WMI connection replaying or recording a fixture, or None for the local WMI service."""
+    if not (args.replay or args.record):
+        return None
+
+    from lshw.classes.replay import RecordingWMIConnection, ReplayWMIConnection
+
+    if args.replay:
+        return ReplayWMIConnection(args.replay)
+    return RecordingWMIConnection()
+
+
+def _collect(args, connection, plan, failed):
+    """
+    Collect every ``(entity, children)`` of ``plan`` in one run, or stream
+    them to stdout with --stream (then nothing is returned).
+
+    With -c, ``failed[0]`` is set to the entity being collected, for error reporting.
+    """
+    with _collection(args, connection) as profiler:
+        if args.stream:
+            from lshw.stream import WRITERS, iter_events
+
+            writer = WRITERS[args.stream](sys.stdout)
+            writer.start()
+            for entity, children in plan:
+                if args.class_hw:
+                    failed[0] = entity
+                for kind, node in iter_events(entity, children):
+                    writer.write(kind, node)
+            writer.finish()
+            formatted_data = None
+        else:
+            from lshw.classes import HardwareClass
+            from lshw.classes.parallel import SubtreeTask, current_executor
+
+            formatted_data = []
+            tasks = [SubtreeTask(HardwareClass.factory(entity), children=children) for entity, children in plan]
+            for (entity, _), result in zip(plan, current_executor().map(tasks)):
+                if args.class_hw:
+                    failed[0] = entity
+                formatted_data.extend(result())
+
+    if profiler is not None:
+        _print_profile(profiler, args.profile)
+
+    return formatted_data
+
+
+def _plan(args):
+    """
+    ``(entity, children)`` collections for -c and --with-children, or None on unknown classes.
+    """
+    if not args.class_hw:
+        return [('ComputerSystem', True)]
+
+    names = [name.strip() for name in args.class_hw.split(',') if name.strip()]
+    if args.with_children is True:
+        with_children = names
+    else:
+        with_children = [name.strip() for name in (args.with_children or '').split(',') if name.strip()]
+
+    unknown = [name for name in names + with_children if name not in AVAILABLE_CLASSES]
+    if not names or unknown:
+        return None
+    if not set(with_children) <= set(names):
+        sys.stderr.write('--with-children classes must also be selected with -c\n')
+        return None
+
+    from lshw.collector import plan_collection
+
+    return plan_collection(
+        [AVAILABLE_CLASSES[name] for name in names],
+        [AVAILABLE_CLASSES[name] for name in with_children],
+    )
+
+
+def _explain(args, plan):
+    """Print the query plan of ``plan`` (--explain), with the timings of a --profile json report if given."""
+    from lshw.explain import add_profile, explain, format_text
+
+    entries = explain(plan)
+    if args.explain is not True:
+        try:
+            with open(args.explain, encoding='utf-8') as f:
+                add_profile(entries, json.load(f))
+        except (OSError, ValueError) as e:
+            return _exit_manager(EXIT_USAGE, 'explain', f'Could not read profile: {e}')
+
+    if args.compact:
+        print(json.dumps(entries, separators=(',', ':')))
+    elif args.json:
+        print(json.dumps(entries, indent=2))
+    else:
+        print(format_text(entries))
+    return ALL_OK
+
+
+def _print_delta(old, new, compact):
+    from lshw.diff import diff
+
+    patch = diff(old, new)
+    print(json.dumps(patch, separators=(',', ':')) if compact else json.dumps(patch, indent=2))
+
+
+def serve(args, connection):
+    """``lshw --serve``: answer requests until interrupted."""
+    # only the server needs the socket machinery
+    from lshw.server import InventoryServer
+
+    server = InventoryServer(args.serve or None, connection, args.jobs, _cache(args), AVAILABLE_CLASSES)
+    try:
+        server.bind()
+    except OSError as e:
+        return _exit_manager(EXIT_USAGE, 'serve', str(e))
+
+    sys.stderr.write(f'Serving on {server.address}\n')
+    with suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return ALL_OK
+
+
+def diff_main(argv):
+    """``lshw diff OLD NEW``: changes between two JSON inventories."""
+    parser = argparse.ArgumentParser(
+        prog=f'{PROGRAM} diff',
+        description='Print the nodes added, removed and changed between two inventories written by "lshw -j"',
+    )
+    parser.add_argument('old', help='previous JSON inventory')
+    parser.add_argument('new', help='current JSON inventory')
+    parser.add_argument('--compact', action='store_true', help='output the delta in compact JSON format')
+    args = parser.parse_args(argv)
+
+    from lshw.diff import load_snapshot
+
+    try:
+        old, new = load_snapshot(args.old), load_snapshot(args.new)
+    except (OSError, ValueError) as e:
+        return _exit_manager(EXIT_USAGE, 'diff', f'Could not read inventory: {e}')
+
+    _print_delta(old, new, args.compact)
+    return ALL_OK
+
+
+def _print_profile(profiler, output):
+    if output == 'json':
+        sys.stderr.write(json.dumps(profiler.report(), indent=2) + '\n')
+    else:
+        sys.stderr.write(profiler.format_text() + '\n')
+
 
 def parse_args(argv):
     parser = argparse.ArgumentParser(
@@ -108,18 +312,131 @@ def parse_args(argv):
 
     parser.add_argument('--json', '-j', action='store_true', help='output in JSON format (indented)')
 
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='output in compact JSON format (no indentation nor spaces), for machine consumers',
+    )
+
     parser.add_argument(
         '--class-hw',
         '-c',
         action='store',
-        help='print a specific hardware class (write "-c list" to get available classes)',
+        help='print specific hardware classes, comma-separated (write "-c list" to get available classes)',
+    )
+
+    parser.add_argument(
+        '--with-children',
+        nargs='?',
+        const=True,
+        metavar='CLASSES',
+        help='with -c, include the subtree of every selected class, or only of the comma-separated CLASSES',
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='collect independent hardware subtrees with N worker threads (default: 1, serial)',
+    )
+
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='text',
+        choices=['text', 'json'],
+        help='print per-class and per-query timings to stderr, as a sorted table (default) or JSON',
+    )
+
+    parser.add_argument(
+        '--explain',
+        nargs='?',
+        const=True,
+        metavar='PROFILE',
+        help='print the WMI queries the collection (or -c classes) would issue, without querying WMI, and how often '
+        'each one runs, flagging per-row (N+1) queries; with PROFILE, a "--profile json" report, add its timings',
+    )
+
+    parser.add_argument(
+        '--record',
+        metavar='FILE',
+        help='save every WMI result of this run to a fixture file (gzip-compressed if FILE ends with .gz)',
+    )
+
+    parser.add_argument(
+        '--replay',
+        metavar='FILE',
+        help='read WMI results from a fixture file instead of querying WMI (works on any OS)',
+    )
+
+    parser.add_argument(
+        '--stream',
+        nargs='?',
+        const='json',
+        choices=STREAM_FORMATS,
+        help='write nodes to stdout as soon as they are collected: the same JSON as --json (default), '
+        'or NDJSON with one node per line and its parent path',
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='reuse WMI results of previous runs while they are valid: a day for firmware, boards, '
+        'processors and memory, an hour for internal devices; volatile classes are always queried',
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='directory of the inventory cache (implies --cache)',
+    )
+
+    parser.add_argument(
+        '--max-age',
+        type=int,
+        metavar='SECONDS',
+        help='with --cache, never reuse results older than SECONDS (0 refreshes the cache; implies --cache)',
+    )
+
+    parser.add_argument(
+        '--delta',
+        metavar='SNAPSHOT',
+        help='print only the nodes added, removed and changed since SNAPSHOT, a previous "lshw -j" output '
+        '(compact with --compact); see also "lshw diff OLD NEW"',
+    )
+
+    parser.add_argument(
+        '--fingerprint',
+        action='store_true',
+        help='print a digest of the hardware identifiers (devices, disks, volumes, memory banks, BIOS) and exit',
+    )
+
+    parser.add_argument(
+        '--if-changed',
+        metavar='FINGERPRINT',
+        help=f'exit with code {EXIT_UNCHANGED} without collecting anything if the hardware fingerprint '
+        'still is FINGERPRINT',
+    )
+
+    parser.add_argument(
+        '--serve',
+        nargs='?',
+        const='',
+        metavar='ADDRESS',
+        help='keep running and answer lshw-client requests on a Unix socket or named pipe '
+        '(default: a per-user socket, or \\\\.\\pipe\\lshw on Windows)',
     )
 
     # Compatibility for -json (single dash)
     if '-json' in argv:
         argv = ['--json' if x == '-json' else x for x in argv]
 
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.with_children is not None and not args.class_hw:
+        parser.error('--with-children requires -c')
+
+    return args
 
 
 def pretty(d, indent=0):
@@ -139,50 +456,89 @@ def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
 
+    if argv[:1] == ['diff']:
+        return diff_main(argv[1:])
+
     args = parse_args(argv)
 
-    if args.class_hw:
-        _piece = args.class_hw.strip()
-        _class = ''
-        if _piece == 'list':
-            _help_msg = 'Pieces of hardware to choice:\n'
-            for x in AVAILABLE_CLASSES:
-                _help_msg += f'\t{x}\n'
-
-            print(_help_msg)
-            return ALL_OK
-
-        for x, y in AVAILABLE_CLASSES.items():
-            if _piece == x:
-                _class = y
-                try:
-                    hw_class = HardwareClass.factory(_class)()
-                    formatted_data = hw_class.format_data(children=False)
-                except wmi.x_access_denied as e:
-                    return _exit_manager(EXIT_PERMISSION, _class, f'Access denied: {e}')
-                except wmi.x_wmi as e:
-                    return _exit_manager(EXIT_ERROR, _class, f'WMI error: {e}')
-                except (AttributeError, KeyError, TypeError) as e:
-                    return _exit_manager(EXIT_ERROR, _class, str(e))
-
-        if not _class:
-            # parser.print_help()
-            _usage_examples()
+    try:
+        connection = _connection(args)
+    except (OSError, ValueError) as e:
+        return _exit_manager(EXIT_USAGE, 'replay', f'Could not read fixture: {e}')
+
+    if args.serve is not None:
+        return serve(args, connection)
+
+    snapshot = None
+    if args.delta:
+        if args.stream:
+            sys.stderr.write('--delta cannot be combined with --stream\n')
             return EXIT_USAGE
-    else:
-        # get full computer information
+
+        from lshw.diff import load_snapshot
+
+        try:
+            snapshot = load_snapshot(args.delta)
+        except (OSError, ValueError) as e:
+            return _exit_manager(EXIT_USAGE, 'delta', f'Could not read snapshot: {e}')
+
+    if args.class_hw and args.class_hw.strip() == 'list':
+        _help_msg = 'Pieces of hardware to choice:\n'
+        for x in AVAILABLE_CLASSES:
+            _help_msg += f'\t{x}\n'
+
+        print(_help_msg)
+        return ALL_OK
+
+    from lshw.classes.hardware_class import wmi  # pywin32 itself is loaded on first use
+
+    if args.fingerprint:
+        from lshw.fingerprint import fingerprint
+
+        try:
+            print(fingerprint(connection))
+        except (wmi.x_wmi, wmi.x_access_denied, AttributeError, TypeError, ValueError) as e:
+            return _exit_manager(EXIT_ERROR, 'fingerprint', str(e))
+        return ALL_OK
+
+    plan = _plan(args)
+    if plan is None:
+        # parser.print_help()
+        _usage_examples()
+        return EXIT_USAGE
+
+    if args.explain:
+        return _explain(args, plan)
+
+    if args.if_changed:
+        from lshw.fingerprint import fingerprint
+
         try:
-            hw_class = HardwareClass.factory('ComputerSystem')()
-            formatted_data = hw_class.format_data(children=True)
-        except wmi.x_access_denied as e:
-            return _exit_manager(EXIT_PERMISSION, 'system', f'Access denied: {e}')
-        except wmi.x_wmi as e:
-            return _exit_manager(EXIT_ERROR, 'system', f'WMI error: {e}')
-        except (AttributeError, KeyError, TypeError) as e:
-            return _exit_manager(EXIT_ERROR, 'system', str(e))
-
-    if args.json:
-        print(json.dumps([x.to_dict() for x in formatted_data], indent=2))
+            if fingerprint(connection) == args.if_changed.strip().lower():
+                return EXIT_UNCHANGED
+        except (wmi.x_wmi, wmi.x_access_denied, AttributeError, TypeError, ValueError) as e:
+            logger.warning('Could not compute the hardware fingerprint, collecting everything: %s', e)
+
+    # full computer information unless -c selects classes
+    failed = ['system' if not args.class_hw else plan[0][0]]
+    try:
+        formatted_data = _collect(args, connection, plan, failed)
+    except wmi.x_access_denied as e:
+        return _exit_manager(EXIT_PERMISSION, failed[0], f'Access denied: {e}')
+    except wmi.x_wmi as e:
+        return _exit_manager(EXIT_ERROR, failed[0], f'WMI error: {e}')
+    except (AttributeError, KeyError, TypeError) as e:
+        return _exit_manager(EXIT_ERROR, failed[0], str(e))
+
+    if formatted_data is None:  # already streamed
+        return ALL_OK
+
+    if snapshot is not None:
+        _print_delta(snapshot, [x.to_dict() for x in formatted_data], args.compact)
+    elif args.json or args.compact:
+        from lshw.serializer import dumps
+
+        print(dumps(formatted_data, compact=args.compact))
     else:
         pretty([x.to_dict() for x in formatted_data])
 
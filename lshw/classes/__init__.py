@@ -17,18 +17,10 @@
 __author__ = ['Jose Antonio Chavarría <jachavar@gmail.com>', 'Alfonso Gómez Sánchez <agomez@zaragoza.es>']
 __license__ = 'GPLv3'
 
-import importlib
-import pkgutil
-from pathlib import Path
-
 # Explicitly export the base class
 from .hardware_class import HardwareClass
 
 __all__ = ['HardwareClass']
 
-# Dynamically import all modules in this package -> triggers @HardwareClass.register
-package_dir = Path(__file__).resolve().parent
-for _, module_name, _ in pkgutil.iter_modules([str(package_dir)]):
-    if module_name == 'hardware_class':
-        continue
-    importlib.import_module(f'.{module_name}', package=__name__)
+# Hardware class modules are imported on demand by HardwareClass.factory()
+# and HardwareClass.load(), following HardwareClass._modules_.
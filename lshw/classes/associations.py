@@ -0,0 +1,104 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import re
+
+from .prefetch import normalize_device_id
+
+# Key value of a WMI object path, e.g. \\PC\root\cimv2:Win32_Bus.DeviceID="PCI_BUS_0"
+_PATH_KEY = re.compile(r'\.\w+\s*=\s*(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\')')
+
+
+def reference_id(reference) -> str:
+    """
+    Key (usually ``DeviceID``) of an association reference.
+
+    Args:
+        reference: WMI object path, or the referenced object itself.
+
+    Returns:
+        The key with WMI's doubled backslashes undone, or '' if there is none.
+    """
+    if isinstance(reference, str):
+        match = _PATH_KEY.search(reference)
+        if match is None:
+            return ''
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        return value.replace('\\\\', '\\')
+
+    value = getattr(reference, 'DeviceID', '') if reference is not None else ''
+    return value if isinstance(value, str) else ''
+
+
+def _endpoint(row, name):
+    # the lowercase spelling returns the raw object path, while the declared
+    # one makes the wmi package fetch the referenced object (one more COM call)
+    path = getattr(row, name.lower(), None)
+    if isinstance(path, str):
+        return reference_id(path)
+    return reference_id(getattr(row, name, None))
+
+
+class AssociationGraph:
+    """
+    Both directions of one WMI association class (e.g. ``Win32_DeviceBus``).
+
+    References are parsed once; antecedents and dependents are keyed by
+    their normalized ID (see ADR 003), so finding the devices of a
+    controller or the bus of a device is a dictionary access instead of a
+    scan of the association rows. Lookups return raw IDs, in WMI order.
+    """
+
+    def __init__(self, rows):
+        self._roots = []
+        self._leaves = {}
+        self._links = 0
+        self._dependents = {}
+        self._antecedents = {}
+        for row in rows:
+            antecedent, dependent = _endpoint(row, 'Antecedent'), _endpoint(row, 'Dependent')
+            if not antecedent or not dependent:
+                continue
+            key = normalize_device_id(antecedent)
+            if key not in self._dependents:
+                self._roots.append(antecedent)
+                self._dependents[key] = []
+            self._dependents[key].append(dependent)
+            self._links += 1
+            self._leaves.setdefault(dependent, None)
+            self._antecedents.setdefault(normalize_device_id(dependent), []).append(antecedent)
+
+    def __len__(self):
+        return self._links
+
+    def dependents(self, antecedent=None):
+        """
+        IDs associated to ``antecedent`` (e.g. the devices of a controller).
+
+        Without ``antecedent``, every dependent of the association, once.
+        """
+        if antecedent is None:
+            return list(self._leaves)
+        return list(self._dependents.get(normalize_device_id(antecedent), ()))
+
+    def antecedents(self, dependent=None):
+        """
+        IDs ``dependent`` is associated to (e.g. the bus of a device).
+
+        Without ``dependent``, every antecedent of the association, once.
+        """
+        if dependent is None:
+            return list(self._roots)
+        return list(self._antecedents.get(normalize_device_id(dependent), ()))
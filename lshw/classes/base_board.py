@@ -21,6 +21,7 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .inventory_cache import STATIC
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,8 @@ class BaseBoard(HardwareClass):
     Gets Base Board information using WMI
     """
 
+    _cache_ttl_ = STATIC
+
     def __init__(self):
         super().__init__()
 
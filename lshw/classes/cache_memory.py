@@ -18,6 +18,7 @@ __license__ = 'GPLv3'
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .inventory_cache import STATIC
 
 
 @HardwareClass.register('CacheMemory', parent='Processor')
@@ -26,6 +27,9 @@ class CacheMemory(HardwareClass):
     Gets cache memory information (L1, L2, L3) using WMI
     """
 
+    _cache_ttl_ = STATIC
+    _shared_rows_ = True  # collected once per processor
+
     def __init__(self):
         super().__init__()
 
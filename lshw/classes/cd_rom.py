@@ -19,6 +19,7 @@ __license__ = 'GPLv3'
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .query_plan import PlannedQuery
 
 
 @HardwareClass.register('CdRom', parent='Ide')
@@ -27,6 +28,25 @@ class CdRom(HardwareClass):
     Gets CDROM/DVDROM information using WMI
     """
 
+    _prefetch_ = {  # noqa: RUF012
+        'Win32_cdromdrive': [
+            'DeviceID',
+            'PNPDeviceID',
+            'Manufacturer',
+            'Name',
+            'Caption',
+            'MediaType',
+            'SCSIBus',
+            'SCSILogicalUnit',
+            'SCSIPort',
+            'Description',
+            'MediaLoaded',
+            'Drive',
+        ],
+    }
+
+    _queries_ = (PlannedQuery('Win32_cdromdrive', method=True, note='only when collected on its own'),)
+
     def __init__(self, dev_id=''):
         super().__init__()
 
@@ -60,20 +80,7 @@ class CdRom(HardwareClass):
             'dvd-ram': '',
         }
 
-        self.properties_to_get = [
-            'DeviceID',
-            'PNPDeviceID',
-            'Manufacturer',
-            'Name',
-            'Caption',
-            'MediaType',
-            'SCSIBus',
-            'SCSILogicalUnit',
-            'SCSIPort',
-            'Description',
-            'MediaLoaded',
-            'Drive',
-        ]
+        self.properties_to_get = list(self._prefetch_['Win32_cdromdrive'])
 
         self._update_properties_to_return()
 
@@ -85,11 +92,14 @@ class CdRom(HardwareClass):
 
         # Win32_CDROMDrive
         if self.dev_id == '':
-            for element in self.wmi_system.Win32_cdromdrive(self.properties_to_get):
+            for element in self.wmi_system.Win32_cdromdrive(self.projection('Win32_cdromdrive')):
                 self.hardware_set.append(element)
         else:
-            wql = self.build_wql_select('Win32_cdromdrive', f'PNPDeviceID LIKE "%{self.dev_id}%"')
-            self.execute_wql_query(wql)
+            # an exact match is a dictionary access, a partial one scans every drive
+            self.hardware_set.extend(
+                self.lookup('Win32_cdromdrive', 'PNPDeviceID', self.dev_id)
+                or self.lookup('Win32_cdromdrive', 'PNPDeviceID', self.dev_id, partial=True)
+            )
 
         self.check_values()
 
@@ -27,6 +27,11 @@ class Communication(HardwareClass):
     Gets communication (serial ports and modems) information using WMI
     """
 
+    _schema_ = {  # noqa: RUF012
+        'Win32_SerialPort': ['DeviceID', 'Description', 'Name', 'Caption', 'ProviderType', 'MaxBaudRate'],
+        'Win32_POTSModem': ['DeviceID', 'Description', 'Name', 'Caption', 'AttachedTo', 'ProviderName'],
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -66,15 +71,13 @@ class Communication(HardwareClass):
 
         # Query Win32_SerialPort
         try:
-            self._validate_entity('Win32_SerialPort')
-            self.execute_wql_query('SELECT * FROM Win32_SerialPort')
+            self.execute_wql_query(self.build_wql_select('Win32_SerialPort'))
         except Exception as e:
             logger.debug('Could not query Win32_SerialPort: %s', e, exc_info=True)
 
         # Query Win32_POTSModem
         try:
-            self._validate_entity('Win32_POTSModem')
-            self.execute_wql_query('SELECT * FROM Win32_POTSModem')
+            self.execute_wql_query(self.build_wql_select('Win32_POTSModem'))
         except Exception as e:
             logger.debug('Could not query Win32_POTSModem: %s', e, exc_info=True)
 
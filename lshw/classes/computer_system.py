@@ -21,6 +21,8 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .inventory_cache import STATIC
+from .query_plan import PlannedQuery
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,14 @@ class ComputerSystem(HardwareClass):
     Gets ceneric computer system information using WMI
     """
 
+    # Name and NumberOfProcessors (Win32_ComputerSystem) change without new hardware
+    _cache_ttl_ = {'Win32_SystemEnclosure': STATIC, 'Win32_ComputerSystemProduct': STATIC}  # noqa: RUF012
+
+    _queries_ = (
+        PlannedQuery('Win32_SystemEnclosure', ('ChassisTypes',), method=True),
+        PlannedQuery('Win32_Computersystemproduct', ('UUID', 'IdentifyingNumber'), method=True),
+    )
+
     def __init__(self):
         super().__init__()
 
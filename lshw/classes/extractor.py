@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class RowExtractor:
+    """
+    Turns WMI rows into plain records (``{property: value}``) of fixed properties.
+
+    WMI objects and ``ReplayRow`` list the properties they have in a
+    ``properties`` dict. For each distinct list, the spelling rows use for
+    every property is resolved once: properties the rows lack become
+    ``default`` and the others are read with the rows' own spelling, so no
+    ``AttributeError`` is raised and caught per row. Other rows (e.g. test
+    doubles) are read with ``getattr`` and a default.
+    """
+
+    def __init__(self, properties, default):
+        self.properties = tuple(properties)
+        self.default = default
+        self._plans = {}
+
+    def _plan(self, names):
+        """
+        ``(property, name)`` pairs reading rows that list the properties
+        ``names``, ``name`` being their spelling or None when they lack it.
+        """
+        plan = self._plans.get(names)
+        if plan is not None:
+            return plan
+
+        spelling = {name.lower(): name for name in names}
+        plan = []
+        for prop in self.properties:
+            name = spelling.get(prop.lower())
+            if name is None:
+                logger.warning('WMI rows have no property %s', prop)
+            plan.append((prop, name))
+
+        plan = self._plans[names] = tuple(plan)
+        return plan
+
+    def _record(self, plan, row):
+        default = self.default
+        return {prop: default if name is None else getattr(row, name) for prop, name in plan}
+
+    def _generic(self, row, warned):
+        record = {}
+        for prop in self.properties:
+            value = getattr(row, prop, _MISSING)
+            if value is _MISSING:
+                if prop not in warned:
+                    warned.add(prop)
+                    logger.warning('Could not get property %s from %s', prop, row)
+                value = self.default
+            record[prop] = value
+        return record
+
+    def stream(self, rows):
+        """Yield the records of ``rows`` (any iterable), in the same order, holding no row."""
+        warned = set()
+        for row in rows:
+            names = getattr(row, 'properties', None)
+            if not isinstance(names, dict):
+                yield self._generic(row, warned)
+                continue
+            try:
+                record = self._record(self._plan(tuple(names)), row)
+            except AttributeError:
+                # listed but unreadable (e.g. a provider error)
+                record = self._generic(row, warned)
+            yield record
+
+    def __call__(self, rows):
+        """Records of ``rows``, in the same order."""
+        return list(self.stream(rows))
+
+
+@functools.lru_cache(maxsize=None)
+def compile_extractor(properties, default):
+    """Shared ``RowExtractor`` of ``properties`` (a tuple), built once per property list."""
+    return RowExtractor(properties, default)
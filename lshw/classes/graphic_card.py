@@ -19,6 +19,7 @@ __license__ = 'GPLv3'
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .inventory_cache import STABLE
 
 
 @HardwareClass.register('GraphicCard', parent='Pci')
@@ -27,6 +28,8 @@ class GraphicCard(HardwareClass):
     Gets graphic card information using WMI
     """
 
+    _cache_ttl_ = STABLE
+
     def __init__(self):
         super().__init__()
 
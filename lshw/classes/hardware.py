@@ -13,9 +13,32 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from typing import Dict, List
 
+# Fields included by to_dict() only when they are set, in output order
+OPTIONAL_FIELDS = (
+    'width',
+    'size',
+    'clock',
+    'capacity',
+    'units',
+    'date',
+    'version',
+    'logicalname',
+    'dev',
+    'businfo',
+    'slot',
+    'deviceid',
+    'pnpdeviceid',
+    'parent_pnpdeviceid',
+    'configuration',
+    'capabilities',
+)
+
+# Text fields blanked by blank_sentinels() when they hold a placeholder
+SENTINEL_FIELDS = ('product', 'vendor', 'serial', 'version', 'date', 'slot', 'width', 'clock')
+
 
 @dataclass
 class Hardware:
@@ -48,6 +71,39 @@ class Hardware:
     configuration: Dict[str, str] = field(default_factory=dict)
     capabilities: Dict[str, str] = field(default_factory=dict)
 
+    def copy(self):
+        """
+        Fresh instance from this template, far cheaper than ``copy.deepcopy``.
+
+        Scalars are shared (they are immutable), while ``configuration``,
+        ``capabilities`` and ``children`` are copied so the new instance can
+        be filled in without touching the template. Dictionary values must
+        be immutable, as in every hardware template.
+        """
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.configuration = dict(self.configuration)
+        new.capabilities = dict(self.capabilities)
+        new.children = [child.copy() for child in self.children]
+        return new
+
+    def blank_sentinels(self, sentinels):
+        """
+        Empty the ``SENTINEL_FIELDS`` holding a placeholder instead of data.
+
+        Args:
+            sentinels: Placeholder strings (e.g. 'Error getting data', 'Unknown').
+                Blank strings and 'unknown' in any case are always cleared.
+        """
+        values = self.__dict__
+        for attr in SENTINEL_FIELDS:
+            val = values.get(attr)
+            if isinstance(val, str):
+                if val in sentinels or not val.strip() or val.strip().lower() == 'unknown':
+                    values[attr] = ''
+            elif val in sentinels:
+                values[attr] = ''
+
     def to_dict(self):
         """
         Convert to dictionary, handling the 'class_' field renaming.
@@ -65,37 +121,148 @@ class Hardware:
             'children': [child.to_dict() for child in self.children],
         }
 
-        if self.width:
-            data['width'] = self.width
-        if self.size:
-            data['size'] = self.size
-        if self.clock:
-            data['clock'] = self.clock
-        if self.capacity:
-            data['capacity'] = self.capacity
-        if self.units:
-            data['units'] = self.units
-        if self.date:
-            data['date'] = self.date
-        if self.version:
-            data['version'] = self.version
-        if self.logicalname:
-            data['logicalname'] = self.logicalname
-        if self.dev:
-            data['dev'] = self.dev
-        if self.businfo:
-            data['businfo'] = self.businfo
-        if self.slot:
-            data['slot'] = self.slot
-        if self.deviceid:
-            data['deviceid'] = self.deviceid
-        if self.pnpdeviceid:
-            data['pnpdeviceid'] = self.pnpdeviceid
-        if self.parent_pnpdeviceid:
-            data['parent_pnpdeviceid'] = self.parent_pnpdeviceid
-        if self.configuration:
-            data['configuration'] = self.configuration
-        if self.capabilities:
-            data['capabilities'] = self.capabilities
+        for attr in OPTIONAL_FIELDS:
+            value = getattr(self, attr)
+            if value:
+                data[attr] = value
+
+        return data
+
+
+_DEFAULTS = {f.name: f.default for f in fields(Hardware) if f.default is not MISSING}
+_CONTAINERS = ('children', 'configuration', 'capabilities')
+
+
+class CompactHardware:
+    """
+    Memory-compact, read-mostly ``Hardware`` for holding many inventories.
+
+    Fields live in ``__slots__`` instead of a per-instance dict, and
+    ``configuration``, ``capabilities`` and ``children`` are only created
+    when first accessed, so leaf nodes and nodes without extra data carry
+    no empty containers. ``to_dict()`` output is identical to ``Hardware``.
+
+    Attributes that are not ``Hardware`` fields (e.g. ``class_guid`` on USB
+    devices) are still accepted and kept in ``_extra``, a dict created on
+    first use.
+    """
+
+    __slots__ = (*_DEFAULTS, '_children', '_configuration', '_capabilities', '_extra')
+
+    def __init__(self, children=None, configuration=None, capabilities=None, **kwargs):
+        for name, default in _DEFAULTS.items():
+            object.__setattr__(self, name, kwargs.pop(name, default))
+        if kwargs:
+            raise TypeError(f'Unexpected Hardware fields: {", ".join(kwargs)}')
+
+        self._children = children or None
+        self._configuration = configuration or None
+        self._capabilities = capabilities or None
+        self._extra = None
+
+    def __getattr__(self, name):
+        # only reached for names that are neither slots nor class attributes
+        extra = object.__getattribute__(self, '_extra')
+        if extra is None or name not in extra:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        return extra[name]
+
+    def __setattr__(self, name, value):
+        if hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        elif self._extra is None:
+            self._extra = {name: value}
+        else:
+            self._extra[name] = value
+
+    @property
+    def children(self) -> List['CompactHardware']:
+        if self._children is None:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
+    @property
+    def configuration(self) -> Dict[str, str]:
+        if self._configuration is None:
+            self._configuration = {}
+        return self._configuration
+
+    @configuration.setter
+    def configuration(self, value):
+        self._configuration = value
+
+    @property
+    def capabilities(self) -> Dict[str, str]:
+        if self._capabilities is None:
+            self._capabilities = {}
+        return self._capabilities
+
+    @capabilities.setter
+    def capabilities(self, value):
+        self._capabilities = value
+
+    @classmethod
+    def from_hardware(cls, hardware):
+        """Compact copy of a ``Hardware`` tree."""
+        values = dict(vars(hardware))
+        node = cls(
+            **{name: values.pop(name) for name in _DEFAULTS if name in values},
+            configuration=values.pop('configuration', None),
+            capabilities=values.pop('capabilities', None),
+        )
+        node._children = [cls.from_hardware(child) for child in values.pop('children', None) or []] or None
+        for name, value in values.items():
+            setattr(node, name, value)
+        return node
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a tree from ``to_dict()`` output (e.g. an inventory received as JSON)."""
+        values = dict(data)
+        values['class_'] = values.pop('class', _DEFAULTS['class_'])
+        children = [cls.from_dict(child) for child in values.pop('children', None) or []]
+        node = cls(
+            **{name: values.pop(name) for name in _DEFAULTS if name in values},
+            configuration=values.pop('configuration', None),
+            capabilities=values.pop('capabilities', None),
+        )
+        node._children = children or None
+        for name, value in values.items():
+            setattr(node, name, value)
+        return node
+
+    def to_dict(self):
+        """Same output as ``Hardware.to_dict()``; reading never creates containers."""
+        data = {
+            'id': self.id,
+            'class': self.class_,
+            'claimed': self.claimed,
+            'handle': self.handle,
+            'description': self.description,
+            'product': self.product,
+            'vendor': self.vendor,
+            'physid': self.physid,
+            'serial': self.serial,
+            'children': [child.to_dict() for child in self._children or ()],
+        }
+
+        for attr in OPTIONAL_FIELDS:
+            value = getattr(self, '_' + attr if attr in _CONTAINERS else attr)
+            if value:
+                data[attr] = value
 
         return data
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactHardware):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'CompactHardware(id={self.id!r}, class_={self.class_!r}, product={self.product!r})'
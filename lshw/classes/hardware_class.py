@@ -17,13 +17,73 @@
 __author__ = ['Jose Antonio Chavarría <jachavar@gmail.com>', 'Alfonso Gómez Sánchez <agomez@zaragoza.es>']
 __license__ = 'GPLv3'
 
+import importlib
+import importlib.util
 import logging
 import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List
+
+from .associations import AssociationGraph
+from .extractor import compile_extractor
+from .hardware import Hardware
+from .prefetch import RowIndex
+
+# The session, disk cache, executor, profiler and query plan modules are
+# imported by the methods using them: ``import lshw.classes`` stays cheap.
+if TYPE_CHECKING:
+    from .query_plan import PlannedQuery
+
+
+def _lazy_module(name):
+    """
+    ``name`` imported on first attribute access instead of now.
+
+    Falls back to a regular import when the module cannot be loaded lazily
+    (e.g. from some frozen executables).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+        loader = importlib.util.LazyLoader(spec.loader)
+    except (AttributeError, ImportError, TypeError, ValueError):
+        return importlib.import_module(name)
+
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def _instance_of(obj, module, name):
+    """
+    ``isinstance(obj, module.name)`` for a module of this package, without
+    importing it: while nothing has imported it, no instance can exist.
+    """
+    cls = getattr(sys.modules.get(f'{__package__}.{module}'), name, None)
+    return cls is not None and isinstance(obj, cls)
+
+
+def _drain(items):
+    """
+    Yield the items of list ``items`` in order, removing each one first.
+
+    Nothing keeps a yielded item alive but the consumer, so raw WMI rows
+    (COM objects) and records are freed as soon as they are converted.
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
 
 if sys.platform == 'win32':
-    import wmi
+    # pywin32/COM is only loaded when a connection is opened or a WMI error is handled
+    wmi = _lazy_module('wmi')
 elif 'wmi' in sys.modules:
     wmi = sys.modules['wmi']
 else:
@@ -34,8 +94,6 @@ else:
     wmi.x_wmi = type('x_wmi', (Exception,), {})
     wmi.x_access_denied = type('x_access_denied', (Exception,), {})
 
-from .hardware import Hardware
-
 logger = logging.getLogger(__name__)
 
 
@@ -44,23 +102,96 @@ class WMIConnection:
     Singleton for WMI connection management.
 
     Threading note: WMI relies on Windows COM, which requires
-    per-thread apartment initialization (CoInitialize). This singleton
-    is safe for the standard single-threaded CLI usage. If this module
-    is ever imported as a library from a background thread, callers must
-    ensure pythoncom.CoInitialize() is called on that thread before
-    accessing this connection.
+    per-thread apartment initialization (CoInitialize). The singleton
+    belongs to the main thread; any other thread gets its own connection.
+    Worker threads of a parallel collection are prepared by
+    ``initialize_thread()``. If this module is imported as a library from
+    a background thread, callers must ensure pythoncom.CoInitialize() is
+    called on that thread before accessing its connection.
+
+    Inside a ``session()`` block every caller shares a run-scoped
+    ``CachedWMIConnection``, so identical queries issued by different
+    hardware classes of the same inventory reach WMI only once. A session
+    may also be given an ``InventoryCache``, which keeps the results of
+    classes with a ``_cache_ttl_`` on disk for later runs.
     """
 
     _instance = None
+    _session = None
+    _cache = None
+    _local = threading.local()
 
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls, entity=None, ttl=0):
+        """
+        Connection for the hardware class ``entity``, whose results may be
+        reused for ``ttl`` seconds (or seconds per WMI class, see
+        ``HardwareClass._cache_ttl_``) by the session's ``InventoryCache``.
+        """
+        if cls._session is not None:
+            if cls._cache is not None and entity is not None and ttl:
+                return cls._cache.view(cls._session, entity, ttl)
+            return cls._session
+        return cls._connect()
+
+    @classmethod
+    def _connect(cls):
         if wmi.WMI is None:
             raise RuntimeError('WMI is only available on Windows systems')
+        if threading.current_thread() is not threading.main_thread():
+            if getattr(cls._local, 'instance', None) is None:
+                cls._local.instance = wmi.WMI()
+            return cls._local.instance
         if cls._instance is None:
             cls._instance = wmi.WMI()
         return cls._instance
 
+    @staticmethod
+    def initialize_thread():
+        """
+        Prepare a worker thread for WMI access.
+
+        Joins the COM multithreaded apartment, so WMI objects cached by one
+        worker can be read from every other worker (but never from the main
+        thread, see ``CachedWMIConnection``). Only recorded outside Windows.
+        """
+        from .wmi_cache import join_multithreaded_apartment
+
+        if sys.platform == 'win32':
+            import pythoncom
+
+            pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+        join_multithreaded_apartment()
+
+    @classmethod
+    @contextmanager
+    def session(cls, connection=None, cache=None):
+        """
+        Scope a query cache to one inventory run.
+
+        Nested sessions reuse the outer one. The cache is dropped on exit,
+        so later runs always see fresh WMI data, unless ``cache`` keeps it.
+
+        Args:
+            connection: Optional WMI connection to wrap instead of the singleton.
+            cache: Optional ``InventoryCache``, saved when the session ends.
+        """
+        if cls._session is not None:
+            yield cls._session
+            return
+
+        from .wmi_cache import CachedWMIConnection
+
+        cls._session = CachedWMIConnection(connection, connect=cls._connect)
+        cls._cache = cache
+        try:
+            yield cls._session
+        finally:
+            cls._session = None
+            cls._cache = None
+            if cache is not None:
+                cache.save()
+
 
 class HardwareClass(ABC):
     _WMI_ENTITY_ALLOWLIST = frozenset(
@@ -73,6 +204,7 @@ class HardwareClass(ABC):
             'win32_cdromdrive',
             'win32_computersystem',
             'win32_computersystemproduct',
+            'win32_devicebus',
             'win32_diskdrive',
             'win32_diskdrivetodiskpartition',
             'win32_diskpartition',
@@ -119,8 +251,86 @@ class HardwareClass(ABC):
     _entities_ = {}  # noqa: RUF012
     _children_ = {}  # noqa: RUF012
 
+    # Module (in this package) registering each class, imported on first use.
+    # Children are listed in this order, whatever the import order.
+    _modules_ = {  # noqa: RUF012
+        'BaseBoard': 'base_board',
+        'CacheMemory': 'cache_memory',
+        'CdRom': 'cd_rom',
+        'Communication': 'communication',
+        'ComputerSystem': 'computer_system',
+        'Firmware': 'firmware',
+        'GraphicCard': 'graphic_card',
+        'Ide': 'ide',
+        'LogicalDisk': 'logical_disk',
+        'NetworkCard': 'network_card',
+        'PartitionDisk': 'partition_disk',
+        'Pci': 'pci',
+        'PhysicalDisk': 'physical_disk',
+        'PhysicalMemory': 'physical_memory',
+        'Power': 'power',
+        'Printer': 'printer',
+        'Processor': 'processor',
+        'SoundDevice': 'sound_device',
+        'Usb': 'usb',
+        'UsbDevice': 'usb_device',
+    }
+    _loaded_ = False
+
+    # WMI classes looked up per device, fetched once per run with the union
+    # of the properties every registered class declares: {table: [properties]}
+    _prefetch_ = {}  # noqa: RUF012
+
+    # Properties each WMI class queried by ``build_wql_select()`` actually
+    # has, for classes reading several of them: {table: [properties]}.
+    # Selecting a property the class lacks makes WMI reject the query.
+    _schema_ = {}  # noqa: RUF012
+
+    # Seconds the WMI results of the class may be reused from an
+    # ``InventoryCache`` (see ``WMIConnection.session()``); 0 never caches them.
+    # A dict sets them per WMI class instead; classes not listed are never cached.
+    _cache_ttl_ = 0
+
+    # Longest WQL statement issued by ``select_by_keys()``; WMI rejects
+    # queries beyond an undocumented length, so this stays well below it
+    _WQL_MAX_LENGTH = 4096
+
+    # Queries ``planned_queries()`` cannot derive from ``wmi_method``,
+    # ``_schema_`` and ``_prefetch_``: a tuple of ``PlannedQuery``.
+    _queries_ = ()
+
+    # How often each child class is collected: once per node of this class
+    # (PER_ROW, as ``_fetch_children()`` does) or once per collection (ONE_SHOT)
+    _child_fanout_ = 'per-row'  # query_plan.PER_ROW
+
+    # Whether the ``wmi_method`` rows stay in the session cache for the rest of
+    # the run, for classes collected once per node of a parent with several
+    # nodes. Otherwise each row is freed once converted, even in a session.
+    _shared_rows_ = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        from .profiler import PHASES, profiled
+
+        # pipeline phases, inherited or overridden, stay visible to the profiler
+        for owner in (HardwareClass, cls):
+            for phase in PHASES:
+                method = owner.__dict__.get(phase)
+                if callable(method) and not hasattr(method, '__profiled__'):
+                    setattr(owner, phase, profiled(phase)(method))
+
+    @classmethod
+    def load(cls):
+        """Import every module of ``_modules_``, so the whole registry is known."""
+        if not cls._loaded_:
+            for module in cls._modules_.values():
+                importlib.import_module(f'{__package__}.{module}')
+            cls._loaded_ = True
+
     @classmethod
     def factory(cls, entity):
+        if entity not in cls._entities_ and entity in cls._modules_:
+            importlib.import_module(f'{__package__}.{cls._modules_[entity]}')
         return cls._entities_[entity]
 
     @classmethod
@@ -128,8 +338,50 @@ class HardwareClass(ABC):
         """
         Get the list of registered children classes for a given entity.
         """
+        cls.load()
         return [cls._entities_[child_name] for child_name in cls._children_.get(entity, [])]
 
+    @classmethod
+    def get_descendants(cls, entity):
+        """
+        Names of every class registered below ``entity``, at any depth.
+        """
+        cls.load()
+        descendants = set()
+        pending = list(cls._children_.get(entity, []))
+        while pending:
+            child = pending.pop()
+            if child not in descendants:
+                descendants.add(child)
+                pending.extend(cls._children_.get(child, []))
+
+        return descendants
+
+    @classmethod
+    def prefetch_properties(cls, table):
+        """
+        Union of the properties that registered classes need from a prefetched table.
+
+        Args:
+            table: WMI class name (case-insensitive).
+
+        Returns:
+            List of property names in declaration order, without duplicates.
+        """
+        cls.load()
+        properties = []
+        seen = set()
+        for subclass in cls._entities_.values():
+            for prefetch_table, prefetch_properties in subclass._prefetch_.items():
+                if prefetch_table.lower() != table.lower():
+                    continue
+                for prop in prefetch_properties:
+                    if prop.lower() not in seen:
+                        seen.add(prop.lower())
+                        properties.append(prop)
+
+        return properties
+
     @classmethod
     def register(cls, entity, parent=None):
         def decorator(subclass):
@@ -138,11 +390,14 @@ class HardwareClass(ABC):
 
             if parent:
                 parents = [parent] if isinstance(parent, str) else parent
+                order = list(cls._modules_)
                 for p in parents:
                     if p not in cls._children_:
                         cls._children_[p] = []
                     if entity not in cls._children_[p]:
                         cls._children_[p].append(entity)
+                        # classes outside _modules_ keep their registration order, last
+                        cls._children_[p].sort(key=lambda e: order.index(e) if e in order else len(order))
 
             return subclass
 
@@ -160,11 +415,13 @@ class HardwareClass(ABC):
         self.hardware_set = []
         self.hardware_set_to_return = []
 
+        self._derived = {}
+
     @property
     def wmi_system(self):
         """Lazy WMI connection: acquired on first use, not at instantiation."""
         if self._wmi_system is None:
-            self._wmi_system = WMIConnection.get_instance()
+            self._wmi_system = WMIConnection.get_instance(self._entity_, self._cache_ttl_)
         return self._wmi_system
 
     @wmi_system.setter
@@ -196,9 +453,47 @@ class HardwareClass(ABC):
         """Remove characters that could alter WQL query semantics."""
         return str(value).replace('"', '').replace("'", '').replace(';', '')
 
+    @staticmethod
+    def _validate_properties(table, properties):
+        """
+        Check that the WMI class ``table`` has every one of ``properties``
+        (see ``wmi_schema``), and return them as a list.
+
+        Raises:
+            ValueError: If ``table`` or one of the properties is unknown.
+        """
+        from .wmi_schema import unknown_properties
+
+        unknown = unknown_properties(table, properties)
+        if unknown:
+            raise ValueError(f'{table} has no property {", ".join(unknown)}')
+        return list(properties)
+
+    def projection(self, table):
+        """
+        Properties selected from ``table``: ``properties_to_get``, narrowed to
+        the ones ``_schema_`` declares for it when the class declares a schema.
+
+        Raises:
+            ValueError: If the class declares a schema without ``table``,
+                none of ``properties_to_get`` belongs to it, or ``table``
+                lacks one of the selected properties.
+        """
+        if not self._schema_:
+            return self._validate_properties(table, self.properties_to_get)
+
+        schema = next((props for name, props in self._schema_.items() if name.lower() == table.lower()), None)
+        if schema is None:
+            raise ValueError(f'No property schema declared for {table}')
+        declared = {prop.lower() for prop in schema}
+        fields = [prop for prop in self.properties_to_get if prop.lower() in declared]
+        if not fields:
+            raise ValueError(f'No property of {table} to select')
+        return self._validate_properties(table, fields)
+
     def build_wql_select(self, table, where_clause=''):
         """
-        Build a WQL SELECT statement.
+        Build a WQL SELECT statement of the ``projection()`` of ``table``.
 
         Args:
             table: WMI table name (e.g., 'Win32_NetworkAdapter')
@@ -208,7 +503,7 @@ class HardwareClass(ABC):
             Complete WQL SELECT statement
         """
         self._validate_entity(table)
-        fields = self.build_wql_fields()
+        fields = ','.join(self.projection(table))
         wql = f'SELECT {fields} FROM {table}'
         if where_clause:
             wql += f' WHERE {where_clause}'
@@ -224,29 +519,282 @@ class HardwareClass(ABC):
         for element in self.wmi_system.query(wql):
             self.hardware_set.append(element)
 
+    def _memoize(self, key, build):
+        """
+        Keep a value derived from WMI data for the rest of the run.
+
+        Inside a ``WMIConnection.session()`` the value is shared by every
+        hardware class of the run; otherwise it lives as long as this instance.
+        Classes with different lifetimes share it, so ``build`` reads WMI
+        through the session, never through the ``InventoryCache`` of a class.
+        """
+        connection = self.wmi_system
+        if _instance_of(connection, 'inventory_cache', 'CachedEntityConnection'):
+            return connection.connection.memoize(key, self._bypassing_cache(build, connection.connection))
+        if _instance_of(connection, 'wmi_cache', 'CachedWMIConnection'):
+            return connection.memoize(key, build)
+
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def _bypassing_cache(self, build, session):
+        """``build`` reading WMI from ``session`` instead of the ``InventoryCache`` view of this class."""
+
+        def run():
+            view, self._wmi_system = self._wmi_system, session
+            try:
+                return build()
+            finally:
+                self._wmi_system = view
+
+        return run
+
+    def _prefetched_index(self, table, key):
+        """Fetch a whole WMI class once and index its rows by ``key``."""
+
+        def fetch_rows():
+            self._validate_entity(table)
+            properties = self.prefetch_properties(table) or self.properties_to_get
+            if key.lower() not in {prop.lower() for prop in properties}:
+                properties = [*properties, key]
+            self._validate_properties(table, properties)
+            return list(self.wmi_system.query(f'SELECT {",".join(properties)} FROM {table}'))
+
+        def build_index():
+            return RowIndex(self._memoize(('rows', table.lower()), fetch_rows), key)
+
+        return self._memoize(('index', table.lower(), key.lower()), build_index)
+
+    def select_by_keys(self, table, key, values):
+        """
+        Rows of ``table`` whose ``key`` is one of ``values``, in as few queries as possible.
+
+        The values are sanitized and OR-ed together (``key="a" OR key="b"
+        ...``) in statements of at most ``_WQL_MAX_LENGTH`` characters.
+
+        Args:
+            table: WMI table name (e.g., 'Win32_LogicalDisk').
+            key: Property to match (e.g., 'DeviceID').
+            values: Identifiers to fetch.
+
+        Returns:
+            dict: Every value mapped to its rows in WMI order, matched
+            case-insensitively as WQL does.
+        """
+        self._validate_entity(table)
+        fields = self.projection(table)
+        if key.lower() not in {field.lower() for field in fields}:
+            fields = self._validate_properties(table, [*fields, key])
+        wanted = {}
+        for value in values:
+            wanted.setdefault(self._sanitize_wql_value(value).lower(), []).append(value)
+
+        prefix = f'SELECT {",".join(fields)} FROM {table} WHERE '
+        chunks, terms, length = [], [], len(prefix)
+        for value in wanted:
+            term = f'{key}="{value}"'
+            if terms and length + len(' OR ') + len(term) > self._WQL_MAX_LENGTH:
+                chunks.append(terms)
+                terms, length = [], len(prefix)
+            length += len(term) + (len(' OR ') if terms else 0)
+            terms.append(term)
+        if terms:
+            chunks.append(terms)
+
+        rows = {value: [] for values in wanted.values() for value in values}
+        for terms in chunks:
+            for row in self.wmi_system.query(prefix + ' OR '.join(terms)):
+                for value in wanted.get(str(getattr(row, key, '')).lower(), ()):
+                    rows[value].append(row)
+        return rows
+
+    def lookup(self, table, key, value, partial=False):
+        """
+        Find rows of a prefetched WMI class by device identifier.
+
+        Args:
+            table: WMI class name declared in some class' ``_prefetch_``.
+            key: Property to match (e.g. 'PNPDeviceID' or 'DeviceID').
+            value: Identifier to look up; normalized as described in ADR 003.
+            partial: Match rows whose key contains ``value`` (like ``LIKE "%value%"``).
+
+        Returns:
+            List of matching WMI rows, in WMI order.
+        """
+        index = self._prefetched_index(table, key)
+        return index.search(value) if partial else index.get(value)
+
+    def associations(self, table) -> AssociationGraph:
+        """
+        WMI association class ``table`` (e.g. 'Win32_USBControllerDevice'),
+        read once per run and indexed in both directions.
+        """
+
+        def build_graph():
+            self._validate_entity(table)
+            return AssociationGraph(getattr(self.wmi_system, table)(['Antecedent', 'Dependent']))
+
+        return self._memoize(('associations', table.lower()), build_graph)
+
+    def planned_queries(self) -> List['PlannedQuery']:
+        """
+        WMI queries a collection of the class may issue, without issuing any.
+
+        ``wmi_method`` and the tables of ``_schema_`` and ``_prefetch_`` are
+        planned from their declarations, the other queries are declared in
+        ``_queries_``. Queries without properties select the ``projection()``
+        of their table.
+        """
+        from dataclasses import replace
+
+        from .query_plan import ONE_SHOT, PlannedQuery
+
+        planned = []
+        if self.wmi_method:
+            planned.append(PlannedQuery(self.wmi_method, method=True))
+        planned.extend(PlannedQuery(table) for table in self._schema_)
+        planned.extend(self._queries_)
+        planned.extend(
+            PlannedQuery(table, tuple(self.prefetch_properties(table)), ONE_SHOT, note='prefetched for lookups')
+            for table in self._prefetch_
+        )
+        return [
+            query if query.properties is not None else replace(query, properties=tuple(self.projection(query.table)))
+            for query in planned
+        ]
+
     def _update_properties_to_return(self):
         self.properties_to_return = dict.fromkeys(self.properties_to_get, self.__DESC__)
 
+    def _extractor(self):
+        return compile_extractor(tuple(self.properties_to_return), self.__DESC__)
+
     def check_values(self):
-        for hw_item in self.hardware_set:
-            for prop in self.properties_to_return:
-                try:
-                    self.properties_to_return[prop] = getattr(hw_item, prop)
-                except AttributeError as e:
-                    logger.warning(f'Could not get property {prop} from {hw_item}: {e}')
-                    self.properties_to_return[prop] = self.__DESC__
+        """
+        Move every row of ``hardware_set`` to ``hardware_set_to_return`` as a
+        record; missing properties are ``__DESC__``. Rows are released as
+        they are converted, so ``hardware_set`` ends up empty.
+        """
+        self.hardware_set_to_return.extend(self._extractor().stream(_drain(self.hardware_set)))
+
+    def _iter_rows(self):
+        """
+        Raw WMI rows of the class, released one by one as they are consumed.
 
-            self.hardware_set_to_return.append(self.properties_to_return.copy())
+        The session cache only keeps them when ``_shared_rows_`` is set.
+        """
+        if not self.wmi_method:
+            raise NotImplementedError
+        self._validate_entity(self.wmi_method)
+        connection = self.wmi_system
+        if not self._shared_rows_ and (
+            _instance_of(connection, 'wmi_cache', 'CachedWMIConnection')
+            or _instance_of(connection, 'inventory_cache', 'CachedEntityConnection')
+        ):
+            method = connection.transient(self.wmi_method)
+        else:
+            method = getattr(connection, self.wmi_method)
+        return _drain(list(method(self.projection(self.wmi_method))))
 
     def get_hardware(self):
-        if self.wmi_method:
-            self._validate_entity(self.wmi_method)
-            for element in getattr(self.wmi_system, self.wmi_method)(self.properties_to_get):
-                self.hardware_set.append(element)
+        self.hardware_set.extend(self._iter_rows())
+        self.check_values()
+
+    def _streams(self):
+        """True when records can be extracted row by row (the default ``get_hardware``)."""
+        return getattr(self.get_hardware, '__func__', None) is HardwareClass.get_hardware
+
+    def _stream_records(self):
+        """
+        Records of the default ``get_hardware``, extracted as they are consumed.
+
+        While profiling, the time spent fetching and extracting them, not
+        the time the consumer spends between two records, is recorded as
+        one ``get_hardware`` and one ``check_values`` call, as a
+        ``format_data()`` of the class records them.
+        """
+        from .profiler import current_profiler
+
+        profiler = current_profiler()
+        if profiler is None:
+            yield from self._extractor().stream(self._iter_rows())
+            return
+
+        fetching = extracting = 0.0
+        rows = None
+        error = False
+        try:
+            start = time.perf_counter()
+            try:
+                with profiler.attributed(self, self._entity_, 'get_hardware'):
+                    rows = self._iter_rows()
+            finally:
+                fetching = time.perf_counter() - start
+
+            records = self._extractor().stream(rows)
+            while True:
+                start = time.perf_counter()
+                try:
+                    record = next(records)
+                except StopIteration:
+                    break
+                finally:
+                    extracting += time.perf_counter() - start
+                yield record
+        except GeneratorExit:
+            raise  # the consumer stopped early
+        except BaseException:
+            error = True
+            raise
+        finally:
+            if rows is not None:
+                profiler.add(self._entity_, 'check_values', extracting, error)
+            profiler.add(self._entity_, 'get_hardware', fetching + extracting, error)
+
+    def _build(self, records):
+        """``Hardware`` nodes of ``records``, without the ones ``_populate_hardware`` discards."""
+        # Hybrid Policy: Successful WMI queries with missing/unsupported fields default to empty.
+        # Fallback sentinels ('Error getting data', 'Unknown', or spaces) are cleaned up in final fields.
+        sentinels = (self.__ERROR__, self.__DESC__)
+        for hw_item in records:
+            item_ret = self._populate_hardware(self._new_item(), hw_item)
+            if item_ret is not None:
+                item_ret.blank_sentinels(sentinels)
+                yield item_ret
 
-            self.check_values()
+    def iter_hardware(self, children=False):
+        """
+        Yield the hardware components of the class one by one.
+
+        With the default ``get_hardware``, each WMI row is converted and
+        released before the next one is read, so callers can process (and
+        drop) a component before the class is complete. Classes collecting
+        their rows otherwise yield them once collected, and classes with
+        their own ``format_data`` yield its result.
+
+        Args:
+            children: If True, the subtree of each component is collected
+                before it is yielded (``format_data`` collects the
+                subtrees of sibling components together instead).
+
+        Yields:
+            Hardware: The same components as ``format_data``.
+        """
+        if type(self).format_data is not HardwareClass.format_data:
+            yield from self.format_data(children)
+            return
+
+        if self._streams():
+            records = self._stream_records()
         else:
-            raise NotImplementedError
+            self.get_hardware()
+            records = _drain(self.hardware_set_to_return)
+
+        for item in self._build(records):
+            if children:
+                self._fetch_children([item])
+            yield item
 
     def format_data(self, children=False):
         """
@@ -258,33 +806,23 @@ class HardwareClass(ABC):
         Returns:
             List[Hardware]: A list of hardware components.
         """
-        import copy
-
         self.get_hardware()
-
-        ret = []
-        for hw_item in self.hardware_set_to_return:
-            item_ret = copy.deepcopy(self.hardware)
-            item_ret = self._populate_hardware(item_ret, hw_item)
-            if item_ret is not None:
-                # Hybrid Policy: Successful WMI queries with missing/unsupported fields default to empty.
-                # Clean up fallback sentinels ('Error getting data', 'Unknown', or spaces) in final fields.
-                for attr in ['product', 'vendor', 'serial', 'version', 'date', 'slot', 'width', 'clock']:
-                    if hasattr(item_ret, attr):
-                        val = getattr(item_ret, attr)
-                        if (
-                            val == self.__ERROR__
-                            or val == self.__DESC__
-                            or (isinstance(val, str) and (val.strip() == '' or val.strip().lower() == 'unknown'))
-                        ):
-                            setattr(item_ret, attr, '')
-                ret.append(item_ret)
+        ret = list(self._build(_drain(self.hardware_set_to_return)))
 
         if children:
             self._fetch_children(ret)
 
         return ret
 
+    def _new_item(self) -> Hardware:
+        """
+        Fresh output item for one WMI row.
+
+        Copies the ``self.hardware`` template, which is never modified
+        itself. Classes may override it with a cheaper factory.
+        """
+        return self.hardware.copy()
+
     @abstractmethod
     def _populate_hardware(self, item_ret: Hardware, hw_item: dict) -> Hardware:
         """
@@ -293,14 +831,41 @@ class HardwareClass(ABC):
         """
         return item_ret
 
+    def _collect_subtrees(self, tasks):
+        """
+        Run sibling subtree collectors, concurrently inside ``parallel_collection()``.
+
+        Args:
+            tasks: Zero-argument callables, usually wrapping ``format_data(children=True)``.
+
+        Returns:
+            One getter per task, in the same order; calling it returns the
+            task result or raises the task exception.
+        """
+        from .parallel import current_executor
+
+        return current_executor().map(tasks)
+
+    @staticmethod
+    def _subtree(child_class, *args, **kwargs):
+        """Task collecting the whole subtree of ``child_class(*args, **kwargs)``."""
+        from .parallel import SubtreeTask
+
+        return SubtreeTask(child_class, *args, **kwargs)
+
     def _fetch_children(self, hardware_list: List[Hardware]):
         """Default children fetching logic using get_children()."""
-        for hw_instance in hardware_list:
-            for child_class in self.get_children(self._entity_):
-                try:
-                    res = child_class().format_data(children=True)
-                    hw_instance.children.extend(res)
-                except Exception as e:
-                    logger.warning(
-                        'Could not get children %s for %s: %s', child_class.__name__, self._entity_, e, exc_info=True
-                    )
+        jobs = [
+            (hw_instance, child_class)
+            for hw_instance in hardware_list
+            for child_class in self.get_children(self._entity_)
+        ]
+        results = self._collect_subtrees(self._subtree(child_class) for _, child_class in jobs)
+
+        for (hw_instance, child_class), result in zip(jobs, results):
+            try:
+                hw_instance.children.extend(result())
+            except Exception as e:
+                logger.warning(
+                    'Could not get children %s for %s: %s', child_class.__name__, self._entity_, e, exc_info=True
+                )
@@ -21,6 +21,9 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass, wmi
+from .inventory_cache import STABLE
+from .prefetch import RowIndex
+from .query_plan import PlannedQuery, association
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,19 @@ class Ide(HardwareClass):
     Gets the relationship between IDE controllers
     """
 
+    # controllers only change with the hardware; what hangs from them is never cached
+    _cache_ttl_ = {'Win32_IDEController': STABLE}  # noqa: RUF012
+
+    _prefetch_ = {  # noqa: RUF012
+        'Win32_PNPEntity': ['PNPDeviceID'],
+        'Win32_diskdrive': ['PNPDeviceID'],
+    }
+
+    _queries_ = (
+        PlannedQuery('Win32_IDEController'),
+        association('Win32_IDEControllerdevice'),
+    )
+
     def __init__(self):
         super().__init__()
 
@@ -56,26 +72,21 @@ class Ide(HardwareClass):
 
         self._update_properties_to_return()
         self._ide_results = []
-        self._cached_disk_pnp_ids = set()
-
-    def get_hardware(self):
-        ide_controller_device_set = []
-        ide_controller_device_primary = []
-        self._validate_entity('Win32_IDEControllerdevice')
-        for ide_assoc in self.wmi_system.Win32_IDEControllerdevice(['Antecedent', 'Dependent']):
-            ant_value = ide_assoc.antecedent.split('=')[1].replace('"', '').replace('\\\\', '\\')
-            dep_value = ide_assoc.dependent.split('=')[1].replace('"', '').replace('\\\\', '\\')
 
-            if ant_value[0:4] == 'PCI\\' and ant_value not in ide_controller_device_primary:
-                ide_controller_device_primary.append(ant_value)
+    def _ide_controllers(self):
+        """Every ``Win32_IDEController`` row, indexed by PNPDeviceID."""
+        return RowIndex(self.wmi_system.query(self.build_wql_select('Win32_IDEController')), 'PNPDeviceID')
 
-            ide_controller_device_set.append({'ant_value': ant_value, 'dep_value': dep_value})
+    def get_hardware(self):
+        controllers = self.associations('Win32_IDEControllerdevice')
+        ide_controllers = self._ide_controllers()
 
         self._ide_results = []
         id_cont_prim = 0
-        for element in ide_controller_device_primary:
-            wql = self.build_wql_select('Win32_IDEController', f'PNPDeviceID="{self._sanitize_wql_value(element)}"')
-            for ide in self.wmi_system.query(wql):
+        for element in controllers.antecedents():
+            if element[0:4] != 'PCI\\':
+                continue
+            for ide in ide_controllers.get(element):
                 primary_controller = Hardware(
                     id=f'ide:{id_cont_prim}',
                     class_='storage',
@@ -87,22 +98,18 @@ class Ide(HardwareClass):
                 primary_controller.pnpdeviceid = ide.PNPDeviceID
                 id_cont_prim += 1
 
-                for assoc in ide_controller_device_set:
-                    if assoc['ant_value'] == ide.PNPDeviceID:
-                        wql2 = self.build_wql_select(
-                            'Win32_IDEController', f'PNPDeviceID="{self._sanitize_wql_value(assoc["dep_value"])}"'
+                for channel in controllers.dependents(ide.PNPDeviceID):
+                    for ide2 in ide_controllers.get(channel):
+                        secondary_controller = Hardware(
+                            id=f'channel:{ide2.PNPDeviceID[-1]}',
+                            class_='storage',
+                            claimed=True,
+                            description=ide2.Description,
+                            product=ide2.Caption,
+                            vendor=ide2.Manufacturer,
                         )
-                        for ide2 in self.wmi_system.query(wql2):
-                            secondary_controller = Hardware(
-                                id=f'channel:{ide2.PNPDeviceID[-1]}',
-                                class_='storage',
-                                claimed=True,
-                                description=ide2.Description,
-                                product=ide2.Caption,
-                                vendor=ide2.Manufacturer,
-                            )
-                            secondary_controller.pnpdeviceid = ide2.PNPDeviceID
-                            primary_controller.children.append(secondary_controller)
+                        secondary_controller.pnpdeviceid = ide2.PNPDeviceID
+                        primary_controller.children.append(secondary_controller)
 
                 self._ide_results.append(primary_controller)
 
@@ -115,48 +122,26 @@ class Ide(HardwareClass):
 
     def format_data(self, children=False):
         try:
-            self._cached_disk_pnp_ids = set()
-            try:
-                self._validate_entity('Win32_diskdrive')
-                for d in self.wmi_system.Win32_diskdrive(['PNPDeviceID']):
-                    if getattr(d, 'PNPDeviceID', None):
-                        self._cached_disk_pnp_ids.add(d.PNPDeviceID.strip().replace('\\', '').lower())
-            except Exception as e:
-                logger.debug('Error populating disk PNP device cache (non-critical): %s', e, exc_info=True)
-
             self.get_hardware()
             if children:
-                self._validate_entity('Win32_IDEControllerdevice')
+                controllers = self.associations('Win32_IDEControllerdevice')
                 for primary in self._ide_results:
-                    for element in self.wmi_system.Win32_IDEControllerdevice(['Antecedent', 'Dependent']):
-                        ant = element.antecedent.split('=')[1].replace('"', '').replace('\\\\', '\\')
-                        dep = element.dependent.split('=')[1].replace('"', '').replace('\\\\', '\\')
-                        if ant == primary.pnpdeviceid:
-                            self._attach_ide_child(primary, dep)
-                        for secondary in primary.children:
-                            if ant == secondary.pnpdeviceid:
-                                self._attach_ide_child(secondary, dep)
+                    for controller in [primary, *primary.children]:
+                        for dep in controllers.dependents(controller.pnpdeviceid):
+                            self._attach_ide_child(controller, dep)
             return self._ide_results
         except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
             logger.error(f'Critical error getting IDE hardware data: {e}')
             return []
 
     def _attach_ide_child(self, parent: Hardware, pnp_id: str):
-        wql = self.build_wql_select('Win32_PNPEntity', f'PNPDeviceID="{self._sanitize_wql_value(pnp_id)}"')
-        for item in self.wmi_system.query(wql):
+        for item in self.lookup('Win32_PNPEntity', 'PNPDeviceID', pnp_id):
             try:
                 is_disk = False
-                if item.PNPDeviceID and item.PNPDeviceID.strip().replace('\\', '').lower() in self._cached_disk_pnp_ids:
-                    is_disk = True
-
-                if not is_disk:
-                    try:
-                        self._validate_entity('Win32_diskdrive')
-                        wql_test = f'SELECT PNPDeviceID FROM Win32_diskdrive WHERE PNPDeviceID="{self._sanitize_wql_value(item.PNPDeviceID)}"'
-                        if len(self.wmi_system.query(wql_test)) != 0:
-                            is_disk = True
-                    except Exception as e:
-                        logger.debug('Error checking disk PNP device (non-critical): %s', e, exc_info=True)
+                try:
+                    is_disk = bool(item.PNPDeviceID and self.lookup('Win32_diskdrive', 'PNPDeviceID', item.PNPDeviceID))
+                except Exception as e:
+                    logger.debug('Error checking disk PNP device (non-critical): %s', e, exc_info=True)
 
                 if is_disk:
                     disk = self.factory('PhysicalDisk')(item.PNPDeviceID).format_data(children=True)
@@ -0,0 +1,232 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from .profiler import current_profiler
+from .replay import call_key, decode_rows, encode_rows, parse_select, query_key
+from .wmi_cache import normalize_wql
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 'lshw-inventory-cache'
+CACHE_VERSION = 1
+
+# lifetimes for HardwareClass._cache_ttl_, in seconds
+STATIC = 24 * 60 * 60  # firmware, boards, CPUs, memory banks
+STABLE = 60 * 60  # internal devices, changing only with drivers or hardware
+
+
+def default_cache_dir():
+    """Per-user cache directory: ``%LOCALAPPDATA%\\lshw\\cache`` or ``$XDG_CACHE_HOME/lshw``."""
+    if sys.platform == 'win32':
+        return os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'lshw', 'cache')
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'lshw')
+
+
+def _replace(source, target, attempts=5):
+    """``os.replace`` retrying while a reader holds ``target`` open (Windows)."""
+    for attempt in range(attempts):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+class InventoryCache:
+    """
+    WMI results of each hardware class kept on disk between runs.
+
+    Every hardware class declares in ``_cache_ttl_`` how many seconds its
+    data stays valid (0, the default, never caches it). Results younger
+    than that lifetime, also capped by ``max_age``, are served from disk;
+    anything else reaches WMI and is stored for later runs. Failed calls
+    are never stored.
+
+    There is one JSON file per entity in ``path``. Files are written to a
+    temporary name and renamed over the previous version, so concurrent
+    readers (other ``lshw`` processes) always see a complete file. When
+    two runs update the same entity, the last one wins.
+
+    Args:
+        path: Cache directory, ``default_cache_dir()`` if omitted.
+        max_age: Upper bound, in seconds, for the age of any cached result.
+            0 ignores cached data but still refreshes it.
+        clock: Time source, in seconds since the epoch.
+    """
+
+    def __init__(self, path=None, max_age=None, clock=time.time):
+        self.path = path or default_cache_dir()
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entities = {}
+        self._dirty = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, entity):
+        return os.path.join(self.path, f'{entity}.json')
+
+    def _calls(self, entity):
+        """Stored calls of ``entity``, read once per run. Must hold the lock."""
+        calls = self._entities.get(entity)
+        if calls is None:
+            try:
+                with open(self._file(entity), encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') != CACHE_FORMAT or data.get('version') != CACHE_VERSION:
+                    raise ValueError('unknown format')
+                calls = dict(data['calls'])
+            except FileNotFoundError:
+                calls = {}
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.debug('Ignoring cache file of %s: %s', entity, e)
+                calls = {}
+            self._entities[entity] = calls
+        return calls
+
+    def lifetime(self, ttl):
+        """Seconds a result of a class with ``_cache_ttl_ = ttl`` may be served."""
+        return ttl if self.max_age is None else min(ttl, self.max_age)
+
+    def get(self, entity, ttl, key):
+        """
+        Rows stored for ``key`` of ``entity``, or None when missing or too old.
+        """
+        lifetime = self.lifetime(ttl)
+        with self._lock:
+            entry = self._calls(entity).get(key) if lifetime > 0 else None
+            if entry is not None and 0 <= self._clock() - entry['time'] <= lifetime:
+                self.hits += 1
+                return decode_rows(entry['rows'])
+            self.misses += 1
+            return None
+
+    def put(self, entity, key, rows, properties=None):
+        encoded = encode_rows(rows, properties)
+        with self._lock:
+            self._calls(entity)[key] = {'time': self._clock(), 'rows': encoded}
+            self._dirty.add(entity)
+
+    def view(self, connection, entity, ttl):
+        """Connection for the hardware class ``entity``, answering from this cache."""
+        return CachedEntityConnection(self, connection, entity, ttl)
+
+    def save(self):
+        """
+        Write the entities updated during this run.
+
+        Errors are logged, never raised: a read-only or full disk must not
+        fail the inventory itself.
+        """
+        import tempfile  # only needed when something was fetched: not at start-up
+
+        with self._lock:
+            pending = {entity: dict(self._entities[entity]) for entity in sorted(self._dirty)}
+            self._dirty.clear()
+
+        for entity, calls in pending.items():
+            data = {'format': CACHE_FORMAT, 'version': CACHE_VERSION, 'entity': entity, 'calls': calls}
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(prefix=f'.{entity}.', suffix='.tmp', dir=self.path)
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, separators=(',', ':'), sort_keys=True)
+                    _replace(tmp, self._file(entity))
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+            except OSError as e:
+                logger.warning('Could not write the inventory cache of %s: %s', entity, e)
+
+
+class CachedEntityConnection:
+    """
+    Connection seen by one hardware class while an ``InventoryCache`` is active.
+
+    ``query()`` and ``Win32_*()`` calls are looked up in the cache under the
+    class' entity and otherwise forwarded to ``connection`` (the run-scoped
+    ``CachedWMIConnection``). Any other attribute is delegated to it.
+
+    ``ttl`` is the ``_cache_ttl_`` of the class: seconds, or a dict of
+    seconds per WMI class, where calls to unlisted classes bypass the cache.
+    """
+
+    def __init__(self, cache, connection, entity, ttl):
+        self.cache = cache
+        self.connection = connection
+        self.entity = entity
+        self.ttl = ttl
+
+    def _ttl(self, table):
+        if not isinstance(self.ttl, dict):
+            return self.ttl
+        table = (table or '').lower()
+        return next((ttl for name, ttl in self.ttl.items() if name.lower() == table), 0)
+
+    def _cached(self, table, key, fetch, properties, label):
+        ttl = self._ttl(table)
+        if not ttl:
+            return list(fetch())
+
+        rows = self.cache.get(self.entity, ttl, key)
+        if rows is not None:
+            profiler = current_profiler()
+            if profiler is not None:
+                profiler.cache_hit(label)
+            return rows
+
+        rows = list(fetch())
+        self.cache.put(self.entity, key, rows, properties)
+        return rows
+
+    def query(self, wql):
+        try:
+            fields, table, _ = parse_select(wql)
+        except ValueError:
+            fields, table = None, None
+        return self._cached(table, query_key(wql), lambda: self.connection.query(wql), fields, normalize_wql(wql))
+
+    def _method(self, name, keep=True):
+        method = self.connection.transient(name) if not keep else getattr(self.connection, name)
+
+        def call(properties=None, **kwargs):
+            label = f'{name}({",".join(properties or [])})'
+            if properties is None:
+                return self._cached(name, call_key(name, None, kwargs), lambda: method(**kwargs), None, label)
+            return self._cached(
+                name, call_key(name, properties, kwargs), lambda: method(properties, **kwargs), properties, label
+            )
+
+        return call
+
+    def transient(self, name):
+        """``Win32_*`` method ``name``, not kept by the run-scoped cache (see ``CachedWMIConnection``)."""
+        return self._method(name, keep=False)
+
+    def __getattr__(self, name):
+        if name.lower().startswith('win32_'):
+            return self._method(name)
+        return getattr(self.connection, name)
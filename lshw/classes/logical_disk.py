@@ -21,6 +21,7 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .query_plan import BATCHED, PER_ROW, PlannedQuery, association
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,27 @@ class LogicalDisk(HardwareClass):
     Gets logical disk information using WMI
     """
 
+    _queries_ = (
+        PlannedQuery('Win32_LogicalDisk', method=True, note='only when collected on its own'),
+        association('Win32_LogicalDiskToPartition'),
+        PlannedQuery('Win32_LogicalDisk', scope=BATCHED, where='DeviceID="<volume>" OR ...'),
+        PlannedQuery(
+            'Win32_diskpartition',
+            ('DeviceID',),
+            PER_ROW,
+            where='DeviceID="<partition>"',
+            note='when Win32_LogicalDiskToPartition is empty',
+        ),
+        PlannedQuery(
+            'Win32_LogicalDisk',
+            (),
+            PER_ROW,
+            where='Win32_DiskPartition.DeviceID="<partition>"',
+            association='Win32_LogicalDiskToPartition',
+            note='when Win32_LogicalDiskToPartition is empty',
+        ),
+    )
+
     def __init__(self, dev_id=''):
         super().__init__()
 
@@ -81,7 +103,7 @@ class LogicalDisk(HardwareClass):
 
         if self.dev_id == '':
             # Gets everything
-            for element in self.wmi_system.Win32_LogicalDisk(self.properties_to_get):
+            for element in self.wmi_system.Win32_LogicalDisk(self.projection('Win32_LogicalDisk')):
                 self.hardware_set.append(element)
         else:
             # Gets associated partitions to a disk (DeviceID = self.dev_id)
@@ -89,37 +111,15 @@ class LogicalDisk(HardwareClass):
             self._validate_entity('Win32_LogicalDisk')
             success = False
             try:
-                import re
-
-                def _extract_id(ref):
-                    if not ref:
-                        return ''
-                    if isinstance(ref, str):
-                        match = re.search(r'DeviceID\s*=\s*"([^"]+)"', ref)
-                        if match:
-                            return match.group(1)
-                        match = re.search(r"DeviceID\s*=\s*'([^']+)'", ref)
-                        if match:
-                            return match.group(1)
-                        return ''
-                    try:
-                        return getattr(ref, 'DeviceID', '')
-                    except Exception as e:
-                        logger.debug('Error extracting DeviceID (non-critical): %s', e, exc_info=True)
-                        return ''
-
-                for assoc in self.wmi_system.Win32_LogicalDiskToPartition():
-                    try:
-                        part_id = _extract_id(assoc.Antecedent)
-                        if part_id.strip().lower() == self.dev_id.strip().lower():
-                            ld_id = _extract_id(assoc.Dependent)
-                            if ld_id:
-                                wql = f'SELECT {self.build_wql_fields()} FROM Win32_LogicalDisk WHERE DeviceID="{self._sanitize_wql_value(ld_id)}"'
-                                for ld in self.wmi_system.query(wql):
-                                    self.hardware_set.append(ld)
-                                success = True
-                    except (AttributeError, TypeError, KeyError):
-                        continue
+                volumes = self.associations('Win32_LogicalDiskToPartition')
+                # the volumes of every partition, in a few queries shared by the run
+                rows = self._memoize(
+                    ('volumes',), lambda: self.select_by_keys('Win32_LogicalDisk', 'DeviceID', volumes.dependents())
+                )
+                for ld_id in volumes.dependents(self.dev_id):
+                    self.hardware_set.extend(rows[ld_id])
+                # a partition missing from a non-empty association has no volume
+                success = len(volumes) > 0
             except Exception as e:
                 logger.debug(
                     'Error in association-based partition-volume matching (falling back): %s', e, exc_info=True
@@ -22,6 +22,7 @@ import platform
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .query_plan import PlannedQuery
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,15 @@ class NetworkCard(HardwareClass):
     Gets network card information using WMI
     """
 
+    _queries_ = (
+        PlannedQuery(
+            'Win32_NetworkAdapter',
+            where='(NOT PNPDeviceID LIKE "%ROOT%")',
+            note='PhysicalAdapter=True on Windows 10 1903 and later',
+        ),
+        PlannedQuery('Win32_NetworkAdapterConfiguration', ('Index', 'IPAddress')),
+    )
+
     def __init__(self):
         super().__init__()
 
@@ -0,0 +1,315 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class SubtreeTask:
+    """
+    Collects the subtree of one hardware class: ``cls(*args, **kwargs).format_data(children)``.
+
+    ``entity`` names the hardware class, so executors can apply per-class
+    policies such as timeouts.
+    """
+
+    def __init__(self, hardware_class, *args, children=True, **kwargs):
+        self.hardware_class = hardware_class
+        self.children = children
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def entity(self):
+        return getattr(self.hardware_class, '_entity_', None) or self.hardware_class.__name__
+
+    def __call__(self):
+        return self.hardware_class(*self.args, **self.kwargs).format_data(children=self.children)
+
+
+class _Claim:
+    """Task of a nested fan-out, run once by whichever thread claims it first."""
+
+    def __init__(self, task):
+        self.task = task
+        self.future = Future()
+        self._claimed = False
+        self._lock = threading.Lock()
+
+    def claim(self):
+        """True for the one caller that gets to run the task."""
+        with self._lock:
+            claimed, self._claimed = self._claimed, True
+        return not claimed
+
+    def _settle(self):
+        try:
+            self.future.set_result(self.task())
+        except BaseException as e:
+            self.future.set_exception(e)
+
+    def run(self):
+        if self.claim():
+            self._settle()
+
+
+def _caller_runs(claims, get):
+    """Getter running the unclaimed tasks of its fan-out in the waiting worker, then calling ``get``."""
+
+    def run_pending_then_get():
+        for pending in claims:
+            pending.run()
+        return get()
+
+    return run_pending_then_get
+
+
+class SubtreeExecutor:
+    """
+    Runs the collectors of sibling hardware subtrees.
+
+    ``map()`` takes zero-argument callables and returns one zero-argument
+    getter per task, in the same order. Calling a getter returns the task
+    result or raises its exception, so callers keep their own error
+    handling whatever the execution mode.
+
+    With ``jobs`` <= 1 every getter simply runs its task in the calling
+    thread, which is exactly the classic serial loop. Otherwise tasks are
+    submitted to one pool of at most ``jobs`` threads, created on first use
+    and kept until ``shutdown()``; ``initializer`` prepares each thread once.
+    Fan-outs nested in a task are submitted to the same pool, and idle
+    workers pick them up. The worker waiting for them runs the ones no
+    worker has started yet itself (caller runs), so it never waits on a
+    task queued behind busy workers, and the run never holds more than
+    ``jobs`` threads (and WMI connections).
+    """
+
+    def __init__(self, jobs=1, initializer=None):
+        self.jobs = max(1, int(jobs or 1))
+        self.initializer = initializer
+        self._pool = None
+        self._lock = threading.Lock()
+        self._worker = threading.local()
+
+    @property
+    def concurrent(self):
+        return self.jobs > 1
+
+    def _initialize_worker(self):
+        self._worker.active = True
+        if self.initializer:
+            self.initializer()
+
+    def _submit(self, tasks):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.jobs, initializer=self._initialize_worker, thread_name_prefix='lshw'
+                )
+            return [self._pool.submit(task) for task in tasks]
+
+    def map(self, tasks):
+        tasks = list(tasks)
+        if not self.concurrent or len(tasks) < 2:
+            return tasks
+
+        if not getattr(self._worker, 'active', False):
+            return [future.result for future in self._submit(tasks)]
+
+        claims = [_Claim(task) for task in tasks]
+        self._submit(claim.run for claim in claims)
+        return [_caller_runs(claims, claim.future.result) for claim in claims]
+
+    def shutdown(self):
+        """Let the worker threads exit once their queued tasks are done."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+class _GuardedRun(_Claim):
+    """One task of a ``GuardedExecutor`` fan-out, with the timeout of its class."""
+
+    def __init__(self, task, executor):
+        super().__init__(task)
+        self.entity = getattr(task, 'entity', None)
+        self.timeout = executor.timeout_for(self.entity)
+        self._cancelled = executor.cancelled
+        self.started = threading.Event()
+        self.started_at = None
+        self.timed_out = False
+
+    def run(self):
+        if not self.claim():
+            return
+        if self._cancelled.is_set():
+            self.future.set_result([])
+        else:
+            self.started_at = time.monotonic()
+            self.started.set()
+            self._settle()
+        self.started.set()
+
+    def add_done_callback(self, callback):
+        """Call ``callback(run)`` once the task settles (from the worker thread if still running)."""
+        self.future.add_done_callback(lambda future: callback(self))
+
+    def remaining(self):
+        """Seconds left before the class timeout expires (None = no limit)."""
+        if self.timeout is None or self.started_at is None:
+            return self.timeout
+        return max(0.0, self.timeout - (time.monotonic() - self.started_at))
+
+    def abandon(self):
+        """Give up waiting and drop the result."""
+        self.timed_out = True
+        logger.warning('Timed out collecting %s, its subtree is skipped', self.entity)
+
+    def get(self):
+        self.started.wait()
+        try:
+            return self.future.result(self.remaining())
+        except FutureTimeoutError:
+            self.abandon()
+            return []
+
+
+class GuardedExecutor(SubtreeExecutor):
+    """
+    Subtree executor that never lets one hardware class stall the run.
+
+    Tasks of every nesting level share one pool of at most ``jobs`` threads,
+    as in ``SubtreeExecutor``, and so do their WMI connections. A task that
+    exceeds its class timeout (counted from the moment it starts) is
+    abandoned: its subtree is replaced by an empty list and the WMI call,
+    which cannot be interrupted, is left to finish on its worker, which
+    then takes the next task. A worker waiting for a nested fan-out runs
+    its tasks without a timeout itself, while tasks with a timeout start
+    on a worker of their own, unless every worker is busy: they are then
+    bounded by the timeout of the waiting worker's subtree instead.
+    Setting ``cancelled`` skips every task not started yet.
+
+    Args:
+        jobs: Maximum number of tasks collecting at the same time.
+        initializer: Called once in every worker thread before its first task.
+        timeout: Default seconds allowed per class subtree (None = no limit).
+        timeouts: Per-class overrides, e.g. ``{'Printer': 5}``.
+        cancelled: ``threading.Event`` shared with the caller.
+    """
+
+    def __init__(self, jobs=1, initializer=None, timeout=None, timeouts=None, cancelled=None):
+        super().__init__(jobs, initializer)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.cancelled = cancelled if cancelled is not None else threading.Event()
+        self._running = 0
+
+    @property
+    def concurrent(self):
+        return True
+
+    def _work(self, run):
+        def work():
+            with self._lock:
+                self._running += 1
+            try:
+                run.run()
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        return work
+
+    def _nested_get(self, runs, run):
+        """Getter of ``run`` for a worker waiting for its fan-out ``runs``."""
+
+        def get():
+            for pending in runs:
+                if pending.timeout is None:
+                    pending.run()
+            while not run.started.wait(0.05):
+                if self._running >= self.jobs:
+                    run.run()  # no worker left to start it
+            return run.get()
+
+        return get
+
+    def timeout_for(self, entity):
+        return self.timeouts.get(entity, self.timeout)
+
+    def start(self, tasks):
+        """Submit ``tasks`` as one fan-out and return their runs, in order."""
+        runs = [_GuardedRun(task, self) for task in tasks]
+        self._submit(self._work(run) for run in runs)
+        return runs
+
+    def map(self, tasks):
+        runs = self.start(tasks)
+        if not getattr(self._worker, 'active', False):
+            return [run.get for run in runs]
+        return [self._nested_get(runs, run) for run in runs]
+
+
+SERIAL = SubtreeExecutor()
+
+_active = SERIAL
+
+
+def current_executor():
+    """Executor used by hardware classes to collect their children."""
+    return _active
+
+
+@contextmanager
+def use_executor(executor):
+    """Make ``executor`` collect every subtree inside this block."""
+    global _active
+
+    previous = _active
+    _active = executor
+    try:
+        yield executor
+    finally:
+        _active = previous
+
+
+@contextmanager
+def parallel_collection(jobs=1, initializer=None):
+    """
+    Collect sibling subtrees concurrently inside this block.
+
+    Args:
+        jobs: Maximum number of worker threads of the whole block (1 = serial).
+        initializer: Called once in every worker thread before its first task.
+            Defaults to ``WMIConnection.initialize_thread``.
+    """
+    if initializer is None:
+        from .hardware_class import WMIConnection
+
+        initializer = WMIConnection.initialize_thread
+
+    executor = SubtreeExecutor(jobs, initializer)
+    try:
+        with use_executor(executor):
+            yield executor
+    finally:
+        executor.shutdown()
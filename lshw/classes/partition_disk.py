@@ -21,6 +21,7 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass, wmi
+from .query_plan import BATCHED, PER_ROW, PlannedQuery, association
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,27 @@ class PartitionDisk(HardwareClass):
     Gets partition disk information using WMI
     """
 
+    _queries_ = (
+        PlannedQuery('Win32_Diskpartition', method=True, note='only when collected on its own'),
+        association('Win32_DiskDriveToDiskPartition'),
+        PlannedQuery('Win32_diskpartition', scope=BATCHED, where='DeviceID="<partition>" OR ...'),
+        PlannedQuery(
+            'Win32_diskdrive',
+            ('DeviceID',),
+            PER_ROW,
+            where='DeviceID="<disk>"',
+            note='when Win32_DiskDriveToDiskPartition is empty',
+        ),
+        PlannedQuery(
+            'Win32_DiskPartition',
+            (),
+            PER_ROW,
+            where='Win32_DiskDrive.DeviceID="<disk>"',
+            association='Win32_DiskDriveToDiskPartition',
+            note='when Win32_DiskDriveToDiskPartition is empty',
+        ),
+    )
+
     def __init__(self, dev_id=''):
         super().__init__()
 
@@ -91,7 +113,7 @@ class PartitionDisk(HardwareClass):
         """
         if self.dev_id == '':
             # Gets everything
-            for element in self.wmi_system.Win32_Diskpartition(self.properties_to_get):
+            for element in self.wmi_system.Win32_Diskpartition(self.projection('Win32_Diskpartition')):
                 self.hardware_set.append(element)
         else:
             # Gets associated partitions to a disk (DeviceID = self.dev_id)
@@ -99,37 +121,16 @@ class PartitionDisk(HardwareClass):
             self._validate_entity('Win32_diskpartition')
             success = False
             try:
-                import re
-
-                def _extract_id(ref):
-                    if not ref:
-                        return ''
-                    if isinstance(ref, str):
-                        match = re.search(r'DeviceID\s*=\s*"([^"]+)"', ref)
-                        if match:
-                            return match.group(1)
-                        match = re.search(r"DeviceID\s*=\s*'([^']+)'", ref)
-                        if match:
-                            return match.group(1)
-                        return ''
-                    try:
-                        return getattr(ref, 'DeviceID', '')
-                    except Exception as e:
-                        logger.debug('Error extracting DeviceID (non-critical): %s', e, exc_info=True)
-                        return ''
-
-                for assoc in self.wmi_system.Win32_DiskDriveToDiskPartition():
-                    try:
-                        drive_id = _extract_id(assoc.Antecedent)
-                        if drive_id.strip().replace('\\', '').lower() == self.dev_id.strip().replace('\\', '').lower():
-                            part_id = _extract_id(assoc.Dependent)
-                            if part_id:
-                                wql = f'SELECT {self.build_wql_fields()} FROM Win32_diskpartition WHERE DeviceID="{self._sanitize_wql_value(part_id)}"'
-                                for part in self.wmi_system.query(wql):
-                                    self.hardware_set.append(part)
-                                success = True
-                    except (AttributeError, TypeError, KeyError):
-                        continue
+                partitions = self.associations('Win32_DiskDriveToDiskPartition')
+                # the partitions of every disk, in a few queries shared by the run
+                rows = self._memoize(
+                    ('partitions',),
+                    lambda: self.select_by_keys('Win32_diskpartition', 'DeviceID', partitions.dependents()),
+                )
+                for part_id in partitions.dependents(self.dev_id):
+                    self.hardware_set.extend(rows[part_id])
+                # a disk missing from a non-empty association has no partitions
+                success = len(partitions) > 0
             except Exception as e:
                 logger.debug('Error in association-based disk-partition matching (falling back): %s', e, exc_info=True)
 
@@ -182,9 +183,12 @@ class PartitionDisk(HardwareClass):
         return item_ret
 
     def _fetch_children(self, hardware_list):
-        for hw_instance in hardware_list:
+        results = self._collect_subtrees(
+            self._subtree(self.factory('LogicalDisk'), hw_instance.deviceid) for hw_instance in hardware_list
+        )
+        for hw_instance, result in zip(hardware_list, results):
             try:
                 # LogicalDisk returns List[Hardware]
-                hw_instance.children = self.factory('LogicalDisk')(hw_instance.deviceid).format_data(children=True)
+                hw_instance.children = result()
             except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
                 logger.warning(f'Could not get children for PartitionDisk {hw_instance.deviceid}: {e}')
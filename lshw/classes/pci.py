@@ -20,8 +20,11 @@ __license__ = 'GPLv3'
 import logging
 from typing import List
 
+from .associations import AssociationGraph
 from .hardware import Hardware
 from .hardware_class import HardwareClass, wmi
+from .prefetch import normalize_device_id
+from .query_plan import ONE_SHOT, association
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +35,11 @@ class Pci(HardwareClass):
     Gets PCI bus information using WMI
     """
 
+    _queries_ = (association('Win32_DeviceBus', note='with children'),)
+
+    # every child class is collected once, then spread over the bridges
+    _child_fanout_ = ONE_SHOT
+
     def __init__(self):
         super().__init__()
 
@@ -82,32 +90,62 @@ class Pci(HardwareClass):
         # I need to override format_data for Pci to keep the single container behavior.
         pass
 
+    def _place_devices(self, bridges, devices):
+        """
+        Attach every device to the bridge of its bus.
+
+        Args:
+            bridges: {normalized Win32_Bus DeviceID: bridge}, in WMI order.
+            devices: Collected child devices.
+
+        Devices without a known bus (no PNPDeviceID, or missing from
+        ``Win32_DeviceBus``) go to the first PCI bridge, or else the first one.
+        """
+        try:
+            buses = self.associations('Win32_DeviceBus')
+        except (wmi.x_wmi, wmi.x_access_denied, AttributeError, IndexError, TypeError) as e:
+            logger.warning(f'Could not get device buses for Pci, devices go to the first bridge: {e}')
+            buses = AssociationGraph(())
+
+        fallback = next((bridge for bridge in bridges.values() if bridge.id.startswith('pci:')), None)
+        if fallback is None:
+            fallback = next(iter(bridges.values()))
+        for device in devices:
+            bus = normalize_device_id(next(iter(buses.antecedents(device.pnpdeviceid)), ''))
+            bridge = bridges.get(bus, fallback) if bus else fallback
+            bridge.children.append(device)
+
     def format_data(self, children=False):
         self.get_hardware()
 
         pci_bridges = []
+        bridges = {}
         for hw_item in self.hardware_set_to_return:
             bridge = Hardware(id='', class_='bridge', claimed=True)
             bridge = self._populate_hardware(bridge, hw_item)
             pci_bridges.append(bridge)
+            bridges.setdefault(normalize_device_id(hw_item.get('DeviceID', '')), bridge)
 
-        if children:
-            usb_controllers = []
-            usb_fetched = False
-            for bridge in pci_bridges:
-                for child_class in self.get_children(self._entity_):
-                    try:
-                        if child_class.__name__ == 'Usb':
-                            if not usb_fetched:
-                                for i, element in enumerate(child_class().format_data(children=True)):
-                                    element.id = f'usb:{i}'
-                                    usb_controllers.append(element)
-                                usb_fetched = True
-                        else:
-                            bridge.children.extend(child_class().format_data(children=True))
-                    except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
-                        logger.warning(f'Could not get children {child_class.__name__} for Pci: {e}')
+        if children and pci_bridges:
+            # every child class is collected once, then its devices are spread over the bridges
+            child_classes = self.get_children(self._entity_)
+            results = self._collect_subtrees(self._subtree(child_class) for child_class in child_classes)
 
+            devices = []
+            usb_controllers = []
+            for child_class, result in zip(child_classes, results):
+                try:
+                    if child_class.__name__ == 'Usb':
+                        # USB controllers hang from the container
+                        for i, element in enumerate(result()):
+                            element.id = f'usb:{i}'
+                            usb_controllers.append(element)
+                    else:
+                        devices.extend(result())
+                except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
+                    logger.warning(f'Could not get children {child_class.__name__} for Pci: {e}')
+
+            self._place_devices(bridges, devices)
             pci_bridges.extend(usb_controllers)
             self.hardware.children = pci_bridges
 
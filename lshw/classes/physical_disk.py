@@ -21,6 +21,7 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass, wmi
+from .query_plan import PlannedQuery
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,21 @@ class PhysicalDisk(HardwareClass):
     Gets physical disk information using WMI
     """
 
+    _prefetch_ = {  # noqa: RUF012
+        'Win32_diskdrive': [
+            'Caption',
+            'Description',
+            'DeviceID',
+            'Index',
+            'Manufacturer',
+            'PNPDeviceID',
+            'Size',
+            'SerialNumber',
+        ],
+    }
+
+    _queries_ = (PlannedQuery('Win32_Diskdrive', method=True, note='only when collected on its own'),)
+
     def __init__(self, dev_id=''):
         super().__init__()
 
@@ -58,16 +74,7 @@ class PhysicalDisk(HardwareClass):
         self.hardware.configuration = {'ansiversion': '', 'signature': ''}
         self.hardware.capabilities = {'partitioned': '', 'partitioned:dos': ''}
 
-        self.properties_to_get = [
-            'Caption',
-            'Description',
-            'DeviceID',
-            'Index',
-            'Manufacturer',
-            'PNPDeviceID',
-            'Size',
-            'SerialNumber',
-        ]
+        self.properties_to_get = list(self._prefetch_['Win32_diskdrive'])
 
         self._update_properties_to_return()
 
@@ -77,11 +84,14 @@ class PhysicalDisk(HardwareClass):
         If self.dev_id exists get hardware for DeviceID
         """
         if self.dev_id == '':
-            for element in self.wmi_system.Win32_Diskdrive(self.properties_to_get):
+            for element in self.wmi_system.Win32_Diskdrive(self.projection('Win32_Diskdrive')):
                 self.hardware_set.append(element)
         else:
-            wql = self.build_wql_select('Win32_diskdrive', f'PNPDeviceID LIKE "%{self.dev_id}%"')
-            self.execute_wql_query(wql)
+            # an exact match is a dictionary access, a partial one scans every disk
+            self.hardware_set.extend(
+                self.lookup('Win32_diskdrive', 'PNPDeviceID', self.dev_id)
+                or self.lookup('Win32_diskdrive', 'PNPDeviceID', self.dev_id, partial=True)
+            )
 
         self.check_values()
 
@@ -110,9 +120,12 @@ class PhysicalDisk(HardwareClass):
         return item_ret
 
     def _fetch_children(self, hardware_list):
-        for hw_instance in hardware_list:
+        results = self._collect_subtrees(
+            self._subtree(self.factory('PartitionDisk'), hw_instance.deviceid) for hw_instance in hardware_list
+        )
+        for hw_instance, result in zip(hardware_list, results):
             try:
                 # PartitionDisk returns List[Hardware]
-                hw_instance.children = self.factory('PartitionDisk')(hw_instance.deviceid).format_data(children=True)
+                hw_instance.children = result()
             except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
                 logger.warning(f'Could not get children for PhysicalDisk {hw_instance.deviceid}: {e}')
@@ -21,6 +21,8 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass, wmi
+from .inventory_cache import STATIC
+from .query_plan import PlannedQuery
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,12 @@ class PhysicalMemory(HardwareClass):
     Gets physical memory information using WMI
     """
 
+    _cache_ttl_ = STATIC
+
+    _queries_ = (
+        PlannedQuery('Win32_ComputerSystem', ('TotalPhysicalMemory',), method=True, note='when no bank is found'),
+    )
+
     def __init__(self):
         super().__init__()
 
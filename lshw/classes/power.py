@@ -27,6 +27,20 @@ class Power(HardwareClass):
     Gets power supply and battery information using WMI
     """
 
+    _schema_ = {  # noqa: RUF012
+        'Win32_Battery': ['DeviceID', 'Description', 'Name', 'Caption', 'DesignCapacity', 'Chemistry'],
+        'Win32_PortableBattery': [
+            'DeviceID',
+            'Description',
+            'Name',
+            'Caption',
+            'Manufacturer',
+            'DesignCapacity',
+            'Chemistry',
+        ],
+        'Win32_UninterruptiblePowerSupply': ['DeviceID', 'Description', 'Name', 'Caption'],
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -67,22 +81,19 @@ class Power(HardwareClass):
 
         # Query Win32_Battery
         try:
-            self._validate_entity('Win32_Battery')
-            self.execute_wql_query('SELECT * FROM Win32_Battery')
+            self.execute_wql_query(self.build_wql_select('Win32_Battery'))
         except Exception as e:
             logger.debug('Could not query Win32_Battery: %s', e, exc_info=True)
 
         # Query Win32_PortableBattery
         try:
-            self._validate_entity('Win32_PortableBattery')
-            self.execute_wql_query('SELECT * FROM Win32_PortableBattery')
+            self.execute_wql_query(self.build_wql_select('Win32_PortableBattery'))
         except Exception as e:
             logger.debug('Could not query Win32_PortableBattery: %s', e, exc_info=True)
 
         # Query Win32_UninterruptiblePowerSupply
         try:
-            self._validate_entity('Win32_UninterruptiblePowerSupply')
-            self.execute_wql_query('SELECT * FROM Win32_UninterruptiblePowerSupply')
+            self.execute_wql_query(self.build_wql_select('Win32_UninterruptiblePowerSupply'))
         except Exception as e:
             logger.debug('Could not query Win32_UninterruptiblePowerSupply: %s', e, exc_info=True)
 
@@ -0,0 +1,55 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+def normalize_device_id(value):
+    """Canonical device ID form used for matching (see ADR 003)."""
+    if not value:
+        return ''
+    return str(value).strip().replace('\\', '').lower()
+
+
+class RowIndex:
+    """
+    In-memory index over the rows of one WMI class.
+
+    Rows are keyed by the normalized value of a single property
+    (typically ``PNPDeviceID`` or ``DeviceID``), so per-device lookups
+    that used to be one WQL query each become dictionary accesses.
+    """
+
+    def __init__(self, rows, key):
+        self.key = key
+        self._entries = []
+        self._by_key = {}
+        for row in rows:
+            value = normalize_device_id(getattr(row, key, None))
+            self._entries.append((value, row))
+            if value:
+                self._by_key.setdefault(value, []).append(row)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, value):
+        """Rows whose key equals ``value`` (WQL ``key="value"``)."""
+        return list(self._by_key.get(normalize_device_id(value), ()))
+
+    def search(self, fragment):
+        """Rows whose key contains ``fragment`` (WQL ``key LIKE "%fragment%"``)."""
+        fragment = normalize_device_id(fragment)
+        if not fragment:
+            return []
+        return [row for value, row in self._entries if fragment in value]
@@ -17,6 +17,7 @@ import logging
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .query_plan import PlannedQuery
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,8 @@ class Printer(HardwareClass):
     Gets printer and print queue information using WMI
     """
 
+    _queries_ = (PlannedQuery('Win32_Printer'),)
+
     def __init__(self):
         super().__init__()
 
@@ -66,8 +69,7 @@ class Printer(HardwareClass):
         self.hardware_set_to_return = []
 
         try:
-            self._validate_entity('Win32_Printer')
-            self.execute_wql_query('SELECT * FROM Win32_Printer')
+            self.execute_wql_query(self.build_wql_select('Win32_Printer'))
         except Exception as e:
             logger.debug('Could not query Win32_Printer: %s', e, exc_info=True)
 
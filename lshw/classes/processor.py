@@ -19,6 +19,7 @@ __license__ = 'GPLv3'
 
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .inventory_cache import STATIC
 
 
 @HardwareClass.register('Processor', parent='BaseBoard')
@@ -27,6 +28,8 @@ class Processor(HardwareClass):
     Gets processor/CPU information using WMI
     """
 
+    _cache_ttl_ = STATIC
+
     def __init__(self):
         super().__init__()
 
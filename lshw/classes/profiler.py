@@ -0,0 +1,275 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# HardwareClass methods timed per entity, in pipeline order
+PHASES = ('get_hardware', 'execute_wql_query', 'check_values', '_populate_hardware', '_fetch_children')
+
+
+class Timing:
+    """Accumulated measurements of one phase or one WMI query."""
+
+    __slots__ = ('calls', 'errors', 'rows', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.errors = 0
+
+    def add(self, seconds, rows=0, error=False):
+        self.calls += 1
+        self.seconds += seconds
+        self.rows += rows
+        self.errors += int(error)
+
+    def to_dict(self):
+        return {'calls': self.calls, 'seconds': round(self.seconds, 6), 'rows': self.rows, 'errors': self.errors}
+
+
+class Profiler:
+    """
+    Collects wall time, call, row and exception counts of an inventory run.
+
+    Phases are keyed by ``(entity, phase)``; WMI round-trips by
+    ``(entity, query)``, where the entity is the hardware class that issued
+    the query. Queries are measured by the run-scoped ``CachedWMIConnection``,
+    so they are only recorded inside a ``WMIConnection.session()`` (the CLI
+    and ``lshw.collector`` always open one); cache hits are counted apart.
+
+    Thread-safe: parallel collections record from every worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.phases = {}
+        self.queries = {}
+        self.cache_hits = {}
+        self.started = time.perf_counter()
+        self.seconds = None
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @property
+    def current_entity(self):
+        stack = self._stack()
+        return stack[-1][1] if stack else None
+
+    def _record(self, table, key, seconds, rows=0, error=False):
+        with self._lock:
+            timing = table.get(key)
+            if timing is None:
+                timing = table[key] = Timing()
+            timing.add(seconds, rows, error)
+
+    def call(self, instance, entity, phase, method, *args, **kwargs):
+        """Run ``method`` and record it as ``phase`` of ``entity``."""
+        stack = self._stack()
+        frame = (id(instance), entity, phase)
+        if stack and stack[-1] == frame:
+            # a subclass override calling super(): already measured
+            return method(*args, **kwargs)
+
+        stack.append(frame)
+        start = time.perf_counter()
+        error = False
+        try:
+            return method(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            stack.pop()
+            self._record(self.phases, (entity, phase), time.perf_counter() - start, error=error)
+
+    @contextmanager
+    def attributed(self, instance, entity, phase):
+        """Attribute the WMI queries of this block to ``entity``, without timing it (see ``add()``)."""
+        stack = self._stack()
+        stack.append((id(instance), entity, phase))
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def add(self, entity, phase, seconds, error=False):
+        """Record one ``phase`` call of ``entity`` that the caller measured itself."""
+        self._record(self.phases, (entity, phase), seconds, error=error)
+
+    def query(self, name, fetch):
+        """Run a WMI round-trip ``fetch`` and record it under ``name``."""
+        start = time.perf_counter()
+        error = False
+        rows = []
+        try:
+            rows = fetch()
+            return rows
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self._record(
+                self.queries,
+                (self.current_entity, name),
+                time.perf_counter() - start,
+                rows=len(rows) if not error else 0,
+                error=error,
+            )
+
+    def cache_hit(self, name):
+        with self._lock:
+            key = (self.current_entity, name)
+            self.cache_hits[key] = self.cache_hits.get(key, 0) + 1
+
+    def stop(self):
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+
+    def report(self):
+        """
+        Measurements as plain data, slowest first.
+
+        Returns:
+            dict: ``seconds`` of the run, ``entities`` (per hardware class:
+            own time, query and row counts, errors and per-phase timings)
+            and ``queries`` (per WQL string or ``Win32_*`` call).
+        """
+        with self._lock:
+            phases = {key: timing.to_dict() for key, timing in self.phases.items()}
+            queries = {key: timing.to_dict() for key, timing in self.queries.items()}
+            hits = dict(self.cache_hits)
+
+        entities = {}
+
+        def entity_entry(entity):
+            if entity not in entities:
+                entities[entity] = {
+                    'entity': entity,
+                    'seconds': 0.0,
+                    'queries': 0,
+                    'rows': 0,
+                    'errors': 0,
+                    'phases': {},
+                }
+            return entities[entity]
+
+        for (entity, phase), timing in phases.items():
+            entry = entity_entry(entity)
+            entry['phases'][phase] = timing
+            entry['errors'] += timing['errors']
+            if phase in ('get_hardware', '_populate_hardware'):
+                # own time: children are collected in _fetch_children
+                entry['seconds'] += timing['seconds']
+
+        query_list = []
+        for (entity, name), timing in queries.items():
+            entry = entity_entry(entity)
+            entry['queries'] += timing['calls']
+            entry['rows'] += timing['rows']
+            query_list.append({'query': name, 'entity': entity, 'cache_hits': hits.get((entity, name), 0), **timing})
+
+        for entry in entities.values():
+            entry['seconds'] = round(entry['seconds'], 6)
+
+        return {
+            'seconds': round(self.seconds if self.seconds is not None else time.perf_counter() - self.started, 6),
+            'entities': sorted(entities.values(), key=lambda entry: entry['seconds'], reverse=True),
+            'queries': sorted(query_list, key=lambda entry: entry['seconds'], reverse=True),
+        }
+
+    def format_text(self, limit=20):
+        """Human-readable report, slowest entities and queries first."""
+        report = self.report()
+        lines = [
+            f'Profile: {report["seconds"]:.3f} s total',
+            '',
+            'Entity                    own s  queries     rows  errors',
+        ]
+        for entry in report['entities']:
+            lines.append(
+                f'{entry["entity"] or "-":<24} {entry["seconds"]:>6.3f} {entry["queries"]:>8} '
+                f'{entry["rows"]:>8} {entry["errors"]:>7}'
+            )
+
+        lines += ['', f'Slowest queries (top {limit}):', '     s  calls     rows  entity / query']
+        for entry in report['queries'][:limit]:
+            lines.append(
+                f'{entry["seconds"]:>6.3f} {entry["calls"]:>6} {entry["rows"]:>8}  {entry["entity"] or "-"}: {entry["query"]}'
+            )
+
+        return '\n'.join(lines)
+
+
+_active = None
+
+
+def current_profiler():
+    """Profiler of the running ``profiling()`` block, or None."""
+    return _active
+
+
+def profiled(phase):
+    """Decorator timing a ``HardwareClass`` method as ``phase`` while profiling is active."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            return profiler.call(self, self._entity_, phase, method, self, *args, **kwargs)
+
+        wrapper.__profiled__ = phase
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profiling(callback=None):
+    """
+    Profile every hardware class collected inside this block.
+
+    Args:
+        callback: Called with ``Profiler.report()`` when the block exits,
+            e.g. to ship the metrics to a telemetry backend. Callback
+            errors are logged, never raised.
+    """
+    global _active
+
+    previous = _active
+    profiler = _active = Profiler()
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        profiler.stop()
+        if callback is not None:
+            try:
+                callback(profiler.report())
+            except Exception as e:
+                logger.warning('Profile callback failed: %s', e, exc_info=True)
@@ -0,0 +1,62 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# How often a planned query reaches WMI
+ONE_SHOT = 'one-shot'  # once per run: the statement never changes, so the session cache answers repeats
+BATCHED = 'batched'  # once per run, split in statements of at most _WQL_MAX_LENGTH characters
+PER_ROW = 'per-row'  # once per row of the parent (N+1)
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """
+    One WMI round-trip a hardware class may issue, as ``lshw --explain`` shows it.
+
+    Attributes:
+        table: WMI class queried.
+        properties: Selected properties; None for the ``projection()`` of the class.
+        scope: ``ONE_SHOT``, ``BATCHED`` or ``PER_ROW``.
+        where: WHERE clause, with placeholders such as ``<disk>`` for row values;
+            with ``association``, the object whose associators are fetched.
+        method: Issued as a ``Win32_*()`` method call instead of a WQL SELECT.
+        association: Association class of an ``ASSOCIATORS OF`` query.
+        note: When the query is issued, if not on every collection.
+    """
+
+    table: str
+    properties: Optional[Tuple[str, ...]] = None
+    scope: str = ONE_SHOT
+    where: str = ''
+    method: bool = False
+    association: str = ''
+    note: str = ''
+
+    @property
+    def statement(self) -> str:
+        """The query as the profiler labels it: a method call or a WQL statement."""
+        if self.association:
+            return f'ASSOCIATORS OF {{{self.where}}} WHERE AssocClass={self.association} ResultClass={self.table}'
+        if self.method:
+            return f'{self.table}({",".join(self.properties or ())})'
+        wql = f'SELECT {",".join(self.properties) if self.properties else "*"} FROM {self.table}'
+        return f'{wql} WHERE {self.where}' if self.where else wql
+
+
+def association(table, note=''):
+    """Both ends of association class ``table``, read once per run (see ``HardwareClass.associations()``)."""
+    return PlannedQuery(table, ('Antecedent', 'Dependent'), method=True, note=note)
@@ -0,0 +1,522 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+
+from .prefetch import normalize_device_id
+from .wmi_cache import normalize_properties, normalize_wql
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_FORMAT = 'lshw-wmi-fixture'
+FIXTURE_VERSION = 1
+
+# properties identifying a WMI instance, used to merge rows of one table
+_IDENTITY_PROPERTIES = ('DeviceID', 'PNPDeviceID', 'Tag')
+
+
+def call_key(name, properties=None, kwargs=None):
+    """Fixture key of a ``Win32_*()`` method call (same semantics as the query cache)."""
+    key = f'{name.lower()}({",".join(normalize_properties(properties))})'
+    if kwargs:
+        key += '[' + ','.join(f'{k.lower()}={v!r}' for k, v in sorted(kwargs.items())) + ']'
+    return key
+
+
+def query_key(wql):
+    return f'query:{normalize_wql(wql)}'
+
+
+def load_fixture(path):
+    """Read a fixture file (gzip-compressed when the name ends with ``.gz``)."""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        fixture = json.load(f)
+
+    if fixture.get('format') != FIXTURE_FORMAT:
+        raise ValueError(f'Not a WMI fixture: {path}')
+    return fixture
+
+
+def save_fixture(fixture, path):
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        json.dump(fixture, f, separators=(',', ':'), sort_keys=True)
+
+
+def snapshot_value(value):
+    """JSON-friendly copy of a WMI property value; references become object paths."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [snapshot_value(item) for item in value]
+    try:
+        return str(value.path().Path)
+    except Exception:
+        return str(value)
+
+
+def _row_columns(row, properties):
+    if properties:
+        return list(properties)
+    try:
+        return list(row.properties)
+    except Exception:
+        return []
+
+
+def encode_rows(rows, properties=None):
+    """Rows as ``{'columns': [...], 'rows': [[...], ...]}``."""
+    columns = []
+    encoded = []
+    for row in rows:
+        values = {}
+        for column in _row_columns(row, properties):
+            try:
+                values[column] = snapshot_value(getattr(row, column))
+            except Exception:
+                values[column] = None
+            if column not in columns:
+                columns.append(column)
+        encoded.append(values)
+
+    return {'columns': columns, 'rows': [[values.get(column) for column in columns] for values in encoded]}
+
+
+def decode_rows(table):
+    columns = table.get('columns', [])
+    return [ReplayRow(dict(zip(columns, values))) for values in table.get('rows', [])]
+
+
+class ReplayRow:
+    """
+    Recorded WMI object: read-only, case-insensitive property access.
+
+    Missing properties raise ``AttributeError`` like a real WMI object;
+    ``associators()`` returns nothing, since relations are recorded as
+    association classes.
+    """
+
+    __slots__ = ('_lower', 'properties')
+
+    def __init__(self, properties):
+        object.__setattr__(self, 'properties', dict(properties))
+        object.__setattr__(self, '_lower', {name.lower(): value for name, value in properties.items()})
+
+    def __getattr__(self, name):
+        try:
+            return self._lower[name.lower()]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Recorded WMI objects are read-only')
+
+    def associators(self, *args, **kwargs):
+        return []
+
+    def __repr__(self):
+        return f'ReplayRow({self.properties!r})'
+
+
+class _WQLFilter:
+    """Recursive-descent evaluator for the WHERE clauses used by hardware classes."""
+
+    _TOKENS = re.compile(
+        r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|(?P<op><>|!=|<=|>=|=|<|>)'
+        r'|(?P<paren>[()])|(?P<word>[\w.]+))'
+    )
+
+    def __init__(self, clause):
+        self.tokens = []
+        position = 0
+        clause = clause.strip()
+        while position < len(clause):
+            match = self._TOKENS.match(clause, position)
+            if not match or match.end() == position:
+                raise ValueError(f'Unsupported WQL condition: {clause}')
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+        self.predicate = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f'Unsupported WQL condition: {clause}')
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _keyword(self, word):
+        kind, value = self._peek()
+        if kind == 'word' and value.upper() == word:
+            self.position += 1
+            return True
+        return False
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _or(self):
+        terms = [self._and()]
+        while self._keyword('OR'):
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+
+        def either(row):
+            return any(term(row) for term in terms)
+
+        if all(hasattr(term, 'equalities') for term in terms):
+            # ``k="a" OR k="b" ...`` is answered from the index too
+            either.equalities = tuple(equality for term in terms for equality in term.equalities)
+        return either
+
+    def _and(self):
+        terms = [self._not()]
+        while self._keyword('AND'):
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else (lambda row: all(term(row) for term in terms))
+
+    def _not(self):
+        if self._keyword('NOT'):
+            term = self._not()
+            return lambda row: not term(row)
+        return self._atom()
+
+    def _atom(self):
+        kind, value = self._next()
+        if kind == 'paren' and value == '(':
+            term = self._or()
+            self._next()
+            return term
+
+        prop = value
+        if self._keyword('IS'):
+            negate = self._keyword('NOT')
+            self._keyword('NULL')
+            return lambda row: (_value(row, prop) is None) != negate
+
+        if self._keyword('LIKE'):
+            pattern = _like(_literal(self._next()))
+            return lambda row: _matches(pattern, _value(row, prop))
+
+        _, op = self._next()
+        literal = _literal(self._next())
+
+        def term(row):
+            return _compare(_value(row, prop), op, literal)
+
+        if op == '=' and isinstance(literal, str):
+            # lets ReplayWMIConnection answer ``prop = "value"`` from an index
+            term.equalities = ((prop, literal, term),)
+        return term
+
+
+def _value(row, prop):
+    return getattr(row, prop, None)
+
+
+def _literal(token):
+    kind, value = token
+    if kind == 'string':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    upper = value.upper()
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    if upper == 'NULL':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _like(pattern):
+    regex = ''.join('.*' if c == '%' else '.' if c == '_' else re.escape(c) for c in str(pattern).lower())
+    return re.compile(f'^{regex}$', re.DOTALL)
+
+
+def _matches(pattern, value):
+    if value is None:
+        return False
+    value = str(value).lower()
+    return bool(pattern.match(value) or pattern.match(value.replace('\\', '')))
+
+
+def _compare(value, op, literal):
+    if isinstance(value, str) or isinstance(literal, str):
+        left = '' if value is None else str(value).lower()
+        right = '' if literal is None else str(literal).lower()
+        if op == '=':
+            return left == right or normalize_device_id(left) == normalize_device_id(right)
+        if op in ('<>', '!='):
+            return not _compare(value, '=', literal)
+    else:
+        left, right = value, literal
+        if op == '=':
+            return left == right
+        if op in ('<>', '!='):
+            return left != right
+
+    try:
+        return {'<': left < right, '>': left > right, '<=': left <= right, '>=': left >= right}[op]
+    except TypeError:
+        return False
+
+
+_SELECT = re.compile(
+    r'^\s*SELECT\s+(?P<fields>.+?)\s+FROM\s+(?P<table>\w+)(?:\s+WHERE\s+(?P<where>.+))?\s*$', re.I | re.S
+)
+
+
+def parse_select(wql):
+    """Split a WQL SELECT into ``(fields, table, predicate)``; fields is None for ``*``."""
+    match = _SELECT.match(wql)
+    if not match:
+        raise ValueError(f'Unsupported WQL query: {wql}')
+    fields = match.group('fields').strip()
+    fields = None if fields == '*' else [field.strip() for field in fields.split(',')]
+    predicate = _WQLFilter(match.group('where')).predicate if match.group('where') else None
+    return fields, match.group('table'), predicate
+
+
+def _merge_table(tables, table, encoded):
+    """Merge recorded rows into the per-class view used to answer unrecorded queries."""
+    merged = tables.setdefault(table.lower(), {'name': table, 'rows': [], 'index': {}})
+    index = merged['index']
+    for values in (dict(zip(encoded['columns'], row)) for row in encoded['rows']):
+        identity = {
+            (prop, str(values[prop]).lower()) for prop in _IDENTITY_PROPERTIES if values.get(prop) not in (None, '')
+        }
+        # rows are indexed by each identifying value, or by all their values if they have none
+        keys = identity or {json.dumps(values, sort_keys=True)}
+        matches = [index[key] for key in keys if key in index]
+        if matches:
+            row = min(matches, key=lambda match: match['position'])
+            row['values'].update(values)
+            row['identity'] |= identity
+        else:
+            row = {'position': len(merged['rows']), 'identity': identity, 'values': values}
+            merged['rows'].append(row)
+
+        for key in keys:
+            if key not in index or index[key]['position'] > row['position']:
+                index[key] = row
+
+
+class RecordingWMIConnection:
+    """
+    Proxy recording every ``query()`` and ``Win32_*()`` result of a real run.
+
+    ``fixture()`` (or ``save(path)``) returns the captured calls plus a
+    merged per-class table view, which ``ReplayWMIConnection`` uses to
+    answer queries that were not recorded verbatim.
+
+    Args:
+        connection: WMI connection to wrap, shared by every thread.
+        connect: Zero-argument callable returning the connection of the
+            current thread, used instead of ``connection`` (see ``CachedWMIConnection``).
+            Defaults to the local WMI service.
+    """
+
+    def __init__(self, connection=None, connect=None):
+        if connection is None and connect is None:
+            from .hardware_class import WMIConnection
+
+            connect = WMIConnection._connect
+
+        self._connection = connection
+        self._connect = connect
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tables = {}
+
+    @property
+    def connection(self):
+        if self._connection is not None:
+            return self._connection
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = self._connect()
+        return self._local.connection
+
+    def _record(self, key, table, rows, properties):
+        encoded = encode_rows(rows, properties)
+        with self._lock:
+            self._calls[key] = encoded
+            _merge_table(self._tables, table, encoded)
+
+    def query(self, wql):
+        rows = list(self.connection.query(wql))
+        try:
+            fields, table, _ = parse_select(wql)
+        except ValueError:
+            fields, table = None, re.search(r'FROM\s+(\w+)', wql, re.I).group(1)
+        self._record(query_key(wql), table, rows, fields)
+        return rows
+
+    def _method(self, name):
+        method = getattr(self.connection, name)
+
+        def call(properties=None, **kwargs):
+            rows = list(method(**kwargs) if properties is None else method(properties, **kwargs))
+            self._record(call_key(name, properties, kwargs), name, rows, properties)
+            return rows
+
+        return call
+
+    def __getattr__(self, name):
+        if name.lower().startswith('win32_'):
+            return self._method(name)
+        return getattr(self.connection, name)
+
+    def fixture(self):
+        with self._lock:
+            tables = {}
+            for merged in self._tables.values():
+                columns = []
+                for row in merged['rows']:
+                    columns.extend(column for column in row['values'] if column not in columns)
+                tables[merged['name']] = {
+                    'columns': columns,
+                    'rows': [[row['values'].get(column) for column in columns] for row in merged['rows']],
+                }
+            return {
+                'format': FIXTURE_FORMAT,
+                'version': FIXTURE_VERSION,
+                'calls': dict(self._calls),
+                'tables': tables,
+            }
+
+    def save(self, path):
+        save_fixture(self.fixture(), path)
+
+
+class ReplayWMIConnection:
+    """
+    WMI connection serving a recorded or synthetic fixture, on any OS.
+
+    Calls recorded verbatim are answered from ``calls``; anything else is
+    evaluated against the per-class ``tables`` (WQL ``WHERE`` clauses with
+    ``=``, ``<>``, ``LIKE``, ``IS NULL``, ``NOT``, ``AND``, ``OR``). Unknown
+    classes return no rows. Thread-safe.
+
+    Args:
+        fixture: Fixture dict or path to a fixture file.
+        latency: Seconds slept per call, modelling the COM round-trip.
+        row_latency: Extra seconds slept per returned row (marshalling cost).
+        value_latency: Extra seconds slept per returned property value: the
+            selected properties of each row, or all of them for ``SELECT *``.
+    """
+
+    def __init__(self, fixture, latency=0.0, row_latency=0.0, value_latency=0.0):
+        if not isinstance(fixture, dict):
+            fixture = load_fixture(fixture)
+        self.latency = latency
+        self.row_latency = row_latency
+        self.value_latency = value_latency
+        self._calls = {key: decode_rows(table) for key, table in fixture.get('calls', {}).items()}
+        self._tables = {name.lower(): decode_rows(table) for name, table in fixture.get('tables', {}).items()}
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rows = 0
+        self.values = 0
+        self.log = []
+
+    def _serve(self, key, answer, fields=None):
+        rows = self._calls[key] if key in self._calls else answer()
+        values = len(rows) * len(fields) if fields else sum(len(row.properties) for row in rows)
+        with self._lock:
+            self.calls += 1
+            self.rows += len(rows)
+            self.values += values
+            self.log.append(key)
+        delay = self.latency + self.row_latency * len(rows) + self.value_latency * values
+        if delay:
+            time.sleep(delay)
+        return list(rows)
+
+    def table(self, name):
+        rows = self._tables.get(name.lower())
+        if rows is None:
+            logger.debug('No rows recorded for %s', name)
+            return []
+        return rows
+
+    def _candidates(self, table, prop, literal):
+        """
+        ``(position, row)`` of the rows of ``table`` that may satisfy
+        ``prop = literal``, from a lazily built index.
+        """
+        key = (table.lower(), prop.lower())
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = {}
+                for position, row in enumerate(self.table(table)):
+                    value = _value(row, prop)
+                    index.setdefault(normalize_device_id('' if value is None else str(value)), []).append(
+                        (position, row)
+                    )
+        return index.get(normalize_device_id(literal), [])
+
+    def query(self, wql):
+        key = query_key(wql)
+        try:
+            fields, table, predicate = parse_select(wql)
+        except ValueError:
+            # recorded verbatim, e.g. an ASSOCIATORS OF query
+            if key not in self._calls:
+                raise
+            fields = None
+
+        def answer():
+            if predicate is None:
+                return self.table(table)
+            equalities = getattr(predicate, 'equalities', None)
+            if equalities is None:
+                return [row for row in self.table(table) if predicate(row)]
+            matched = {}
+            for prop, literal, term in equalities:
+                for position, row in self._candidates(table, prop, literal):
+                    if term(row):
+                        matched[position] = row
+            return [matched[position] for position in sorted(matched)]
+
+        return self._serve(key, answer, fields)
+
+    def _method(self, name):
+        def call(properties=None, **kwargs):
+            def answer():
+                return [
+                    row for row in self.table(name) if all(_compare(_value(row, k), '=', v) for k, v in kwargs.items())
+                ]
+
+            return self._serve(call_key(name, properties, kwargs), answer, properties)
+
+        return call
+
+    def __getattr__(self, name):
+        if name.lower().startswith('win32_'):
+            return self._method(name)
+        raise AttributeError(name)
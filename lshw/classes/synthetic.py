@@ -0,0 +1,339 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Synthetic WMI fixtures of configurable size.
+
+The generated tables are internally consistent (association classes
+reference existing instances), so a full ``ComputerSystem`` collection
+over ``ReplayWMIConnection`` walks every code path of a real machine.
+"""
+
+from lshw.classes.replay import FIXTURE_FORMAT, FIXTURE_VERSION
+
+IDE_CONTROLLER = 'PCI\\VEN_8086&DEV_A282&SUBSYS_86941043&REV_00\\3&11583659&0&B8'
+USB_CONTROLLER = 'PCI\\VEN_8086&DEV_A2AF&SUBSYS_86941043&REV_00\\3&11583659&0&A0'
+DRIVE_LETTERS = 'CDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _table(rows):
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    return {'columns': columns, 'rows': [[row.get(column) for column in columns] for row in rows]}
+
+
+def _reference(wmi_class, device_id):
+    escaped = device_id.replace('\\', '\\\\')
+    return f'\\\\BENCH\\root\\cimv2:{wmi_class}.DeviceID="{escaped}"'
+
+
+def disk_pnp_id(index):
+    return f'SCSI\\DISK&VEN_WDC&PROD_BENCH{index:03d}\\4&2D3F5A1&0&{index:06d}'
+
+
+def usb_device_pnp_id(index):
+    return f'USB\\VID_046D&PID_{index:04X}\\6&2B8A1F0&0&{index}'
+
+
+def ide_controller_pnp_id(index):
+    return IDE_CONTROLLER if index == 0 else f'PCI\\VEN_8086&DEV_A282&SUBSYS_86941043&REV_00\\4&{index:08X}&0&B8'
+
+
+def usb_controller_pnp_id(index):
+    return USB_CONTROLLER if index == 0 else f'PCI\\VEN_8086&DEV_A2AF&SUBSYS_86941043&REV_00\\4&{index:08X}&0&A0'
+
+
+def build_fixture(
+    disks=1, usb_devices=1, nics=1, printers=1, partitions_per_disk=2, buses=2, ide_controllers=1, usb_controllers=1
+):
+    """
+    Fixture of one machine with the given device counts.
+
+    Disks and USB devices are spread round-robin over ``ide_controllers``
+    and ``usb_controllers`` controllers.
+
+    Returns:
+        dict: Fixture for ``ReplayWMIConnection`` (tables only, no recorded calls).
+    """
+    tables = {
+        'Win32_ComputerSystem': [
+            {
+                'Model': 'Bench Model',
+                'Name': 'BENCH',
+                'Description': 'AT/AT COMPATIBLE',
+                'Manufacturer': 'ACME',
+                'NumberOfProcessors': 1,
+                'TotalPhysicalMemory': 34359738368,
+            }
+        ],
+        'Win32_SystemEnclosure': [{'ChassisTypes': [3]}],
+        'Win32_ComputerSystemProduct': [{'UUID': '4C4C4544-0000-1000-8000-000000000000', 'IdentifyingNumber': 'SN-1'}],
+        'Win32_BaseBoard': [{'Model': None, 'SerialNumber': 'BSN-1', 'Manufacturer': 'ACME', 'Product': 'Board'}],
+        'Win32_BIOS': [
+            {'Manufacturer': 'AMI', 'BIOSVersion': ['ACME - 1072009'], 'ReleaseDate': '20240101', 'SerialNumber': 'X'}
+        ],
+        'Win32_Processor': [
+            {
+                'Manufacturer': 'GenuineIntel',
+                'Name': 'Intel(R) Core(TM) i7-8700 CPU @ 3.20GHz',
+                'Description': 'Intel64 Family 6 Model 158',
+                'SocketDesignation': 'LGA1151',
+                'DataWidth': 64,
+                'MaxClockSpeed': 3192,
+            }
+        ],
+        'Win32_CacheMemory': [
+            {
+                'DeviceID': f'Cache Memory {level}',
+                'InstalledSize': 256 * 4**level,
+                'Level': 3 + level,
+                'Purpose': f'L{level + 1}-Cache',
+                'Status': 'OK',
+            }
+            for level in range(3)
+        ],
+        'Win32_PhysicalMemory': [
+            {
+                'Tag': f'Physical Memory {index}',
+                'DeviceLocator': f'ChannelA-DIMM{index}',
+                'Capacity': 8589934592,
+                'Speed': 2666,
+                'MemoryType': 0,
+                'SMBIOSMemoryType': 26,
+                'DataWidth': 64,
+                'Manufacturer': 'Kingston',
+                'SerialNumber': f'MEM{index:04d}',
+                'PartNumber': '9905701-017.A00G',
+            }
+            for index in range(4)
+        ],
+        'Win32_Bus': [
+            {'Caption': 'PCI Bus', 'Description': 'PCI Bus', 'DeviceID': f'PCI_BUS_{index}'} for index in range(buses)
+        ],
+        'Win32_VideoController': [
+            {
+                'AdapterCompatibility': 'Intel Corporation',
+                'Description': 'Intel(R) UHD Graphics 630',
+                'DeviceID': 'VideoController1',
+                'PNPDeviceID': 'PCI\\VEN_8086&DEV_3E92\\3&11583659&0&10',
+                'VideoProcessor': 'Intel(R) UHD Graphics Family',
+            }
+        ],
+        'Win32_SoundDevice': [
+            {
+                'Manufacturer': 'Realtek',
+                'Name': 'Realtek High Definition Audio',
+                'PNPDeviceID': 'HDAUDIO\\FUNC_01&VEN_10EC\\4&1&0&0001',
+                'DeviceID': 'HDAUDIO\\FUNC_01&VEN_10EC\\4&1&0&0001',
+            }
+        ],
+        'Win32_NetworkAdapter': [
+            {
+                'Speed': 1000000000,
+                'SystemCreationClassName': 'Win32_ComputerSystem',
+                'AdapterType': 'Ethernet 802.3',
+                'Autosense': None,
+                'Caption': f'[{index:08d}] Intel(R) Ethernet Connection',
+                'MACAddress': f'00:1B:21:{index // 65536 % 256:02X}:{index // 256 % 256:02X}:{index % 256:02X}',
+                'ProductName': 'Intel(R) Ethernet Connection',
+                'Manufacturer': 'Intel Corporation',
+                'NetConnectionID': f'Ethernet {index}',
+                'Description': f'Intel(R) Ethernet Connection #{index}',
+                'PNPDeviceID': f'PCI\\VEN_8086&DEV_15BC\\3&11583659&0&{index:02X}',
+                'Index': index,
+                'NetConnectionStatus': 2,
+                'ServiceName': 'e1dexpress',
+                'PhysicalAdapter': True,
+            }
+            for index in range(nics)
+        ],
+        'Win32_NetworkAdapterConfiguration': [
+            {'Index': index, 'IPAddress': [f'10.0.{index // 250}.{index % 250 + 1}']} for index in range(nics)
+        ],
+        'Win32_Printer': [
+            {
+                'DeviceID': f'Printer {index}',
+                'Name': f'Printer {index}',
+                'Caption': f'Printer {index}',
+                'DriverName': 'HP Universal Printing PCL 6',
+                'PortName': f'IP_10.1.{index // 250}.{index % 250 + 1}',
+                'Network': True,
+                'Local': False,
+            }
+            for index in range(printers)
+        ],
+        'Win32_USBController': [
+            {
+                'PNPDeviceID': usb_controller_pnp_id(index),
+                'DeviceID': usb_controller_pnp_id(index),
+                'Description': 'Intel(R) USB 3.0 eXtensible Host Controller',
+                'Manufacturer': 'Intel',
+            }
+            for index in range(usb_controllers)
+        ],
+        'Win32_IDEController': [
+            {
+                'Manufacturer': 'Intel',
+                'Caption': 'Standard SATA AHCI Controller',
+                'Description': 'Standard SATA AHCI Controller',
+                'DeviceID': ide_controller_pnp_id(index),
+                'PNPDeviceID': ide_controller_pnp_id(index),
+            }
+            for index in range(ide_controllers)
+        ],
+    }
+
+    pnp_entities = []
+    ide_associations = []
+    disk_rows = []
+    disk_partitions = []
+    partition_links = []
+    logical_disks = []
+    logical_links = []
+    for index in range(disks):
+        pnp_id = disk_pnp_id(index)
+        drive_id = f'\\\\.\\PHYSICALDRIVE{index}'
+        pnp_entities.append(
+            {
+                'Caption': f'WDC BENCH{index:03d}',
+                'Description': 'Disk drive',
+                'DeviceID': pnp_id,
+                'PNPDeviceID': pnp_id,
+                'ClassGuid': '{4d36e967-e325-11ce-bfc1-08002be10318}',
+                'Service': 'disk',
+            }
+        )
+        ide_associations.append(
+            {
+                'Antecedent': _reference('Win32_IDEController', ide_controller_pnp_id(index % ide_controllers)),
+                'Dependent': _reference('Win32_PnPEntity', pnp_id),
+            }
+        )
+        disk_rows.append(
+            {
+                'Caption': f'WDC BENCH{index:03d}',
+                'Description': 'Disk drive',
+                'DeviceID': drive_id,
+                'Index': index,
+                'Manufacturer': '(Standard disk drives)',
+                'PNPDeviceID': pnp_id,
+                'Size': '1000202273280',
+                'SerialNumber': f'WD-BENCH{index:06d}',
+            }
+        )
+        for number in range(partitions_per_disk):
+            partition_id = f'Disk #{index}, Partition #{number}'
+            disk_partitions.append(
+                {
+                    'DeviceID': partition_id,
+                    'Index': number,
+                    'Bootable': number == 0,
+                    'BootPartition': number == 0,
+                    'PNPDeviceID': None,
+                    'Size': '500101136640',
+                    'Description': 'GPT: Basic Data',
+                    'Type': 'GPT: Basic Data',
+                    'PrimaryPartition': True,
+                }
+            )
+            partition_links.append(
+                {
+                    'Antecedent': _reference('Win32_DiskDrive', drive_id),
+                    'Dependent': _reference('Win32_DiskPartition', partition_id),
+                }
+            )
+            # the last partition of the first disks is mounted with a drive letter
+            if number == partitions_per_disk - 1 and index < len(DRIVE_LETTERS):
+                letter = DRIVE_LETTERS[index]
+                logical_disks.append(
+                    {
+                        'Caption': f'{letter}:',
+                        'Name': f'{letter}:',
+                        'ProviderName': None,
+                        'Description': 'Local Fixed Disk',
+                        'FileSystem': 'NTFS',
+                        'MediaType': 12,
+                        'VolumeName': f'Data {index}',
+                        'Size': '500101136640',
+                        'FreeSpace': '250050568320',
+                        'DeviceID': f'{letter}:',
+                        'DriveType': 3,
+                    }
+                )
+                logical_links.append(
+                    {
+                        'Antecedent': _reference('Win32_DiskPartition', partition_id),
+                        'Dependent': _reference('Win32_LogicalDisk', f'{letter}:'),
+                    }
+                )
+
+    # NICs sit on the last PCI bus, every other PCI device on the first one
+    device_buses = [
+        {'Antecedent': _reference('Win32_Bus', 'PCI_BUS_0'), 'Dependent': _reference('Win32_PnPEntity', pnp_id)}
+        for pnp_id in (
+            tables['Win32_VideoController'][0]['PNPDeviceID'],
+            *(controller['PNPDeviceID'] for controller in tables['Win32_IDEController']),
+            *(controller['PNPDeviceID'] for controller in tables['Win32_USBController']),
+        )
+    ]
+    device_buses.extend(
+        {
+            'Antecedent': _reference('Win32_Bus', f'PCI_BUS_{buses - 1}'),
+            'Dependent': _reference('Win32_PnPEntity', nic['PNPDeviceID']),
+        }
+        for nic in tables['Win32_NetworkAdapter']
+    )
+
+    usb_associations = []
+    for index in range(usb_devices):
+        pnp_id = usb_device_pnp_id(index)
+        pnp_entities.append(
+            {
+                'Caption': f'USB Input Device {index}',
+                'Description': 'USB Input Device',
+                'DeviceID': pnp_id,
+                'PNPDeviceID': pnp_id,
+                'ClassGuid': '{36fc9e60-c465-11cf-8056-444553540000}',
+                'Service': 'HidUsb',
+            }
+        )
+        usb_associations.append(
+            {
+                'Antecedent': _reference('Win32_USBController', usb_controller_pnp_id(index % usb_controllers)),
+                'Dependent': _reference('Win32_PnPEntity', pnp_id),
+            }
+        )
+
+    tables.update(
+        {
+            'Win32_PnPEntity': pnp_entities,
+            'Win32_DeviceBus': device_buses,
+            'Win32_IDEControllerDevice': ide_associations,
+            'Win32_USBControllerDevice': usb_associations,
+            'Win32_DiskDrive': disk_rows,
+            'Win32_DiskPartition': disk_partitions,
+            'Win32_DiskDriveToDiskPartition': partition_links,
+            'Win32_LogicalDisk': logical_disks,
+            'Win32_LogicalDiskToPartition': logical_links,
+        }
+    )
+
+    return {
+        'format': FIXTURE_FORMAT,
+        'version': FIXTURE_VERSION,
+        'calls': {},
+        'tables': {name: _table(rows) for name, rows in tables.items()},
+    }
@@ -66,11 +66,12 @@ class Usb(HardwareClass):
         return item_ret
 
     def _fetch_children(self, hardware_list):
-        for hw_instance in hardware_list:
+        results = self._collect_subtrees(
+            self._subtree(self.factory('UsbDevice'), dev_id=[hw_instance.pnpdeviceid]) for hw_instance in hardware_list
+        )
+        for hw_instance, result in zip(hardware_list, results):
             try:
                 # UsbDevice returns List[Hardware]
-                hw_instance.children = self.factory('UsbDevice')(dev_id=[hw_instance.pnpdeviceid]).format_data(
-                    children=True
-                )
+                hw_instance.children = result()
             except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
                 logger.warning(f'Could not get children for Usb {hw_instance.pnpdeviceid}: {e}')
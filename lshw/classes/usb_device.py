@@ -20,8 +20,10 @@ __author__ = [
 ]
 __license__ = 'GPLv3'
 
+from .extractor import compile_extractor
 from .hardware import Hardware
 from .hardware_class import HardwareClass
+from .query_plan import association
 
 
 @HardwareClass.register('UsbDevice', parent='Usb')
@@ -30,6 +32,12 @@ class UsbDevice(HardwareClass):
     Gets plugged usb devices information using WMI
     """
 
+    _prefetch_ = {  # noqa: RUF012
+        'Win32_PNPEntity': ['Caption', 'Description', 'DeviceID', 'PNPDeviceID', 'ClassGuid', 'Service'],
+    }
+
+    _queries_ = (association('Win32_USBControllerdevice'),)
+
     def __init__(self, dev_id=None):
         super().__init__()
 
@@ -53,14 +61,7 @@ class UsbDevice(HardwareClass):
         self.hardware.parent_pnpdeviceid = self.__ERROR__
         self.hardware.deviceid = self.__ERROR__
 
-        self.properties_to_get = [
-            'Caption',
-            'Description',
-            'DeviceID',
-            'PNPDeviceID',
-            'ClassGuid',
-            'Service',
-        ]
+        self.properties_to_get = list(self._prefetch_['Win32_PNPEntity'])
 
         self._update_properties_to_return()
 
@@ -80,43 +81,30 @@ class UsbDevice(HardwareClass):
         # {745a17a0...}: Generic HID Class
         excluded_guids = {'{745a17a0-74d3-11d0-b6fe-00a0c90f57da}'}
 
-        usb_controller_device_set = []
-        usb_controller_device_list = []
-
-        for usb_assoc in self.wmi_system.Win32_USBControllerdevice(['Antecedent', 'Dependent']):
-            ant_value = usb_assoc.antecedent.split('=')[1].replace('"', '').replace('\\\\', '\\')
-            dep_value = usb_assoc.dependent.split('=')[1].replace('"', '').replace('\\\\', '\\')
-            usb_controller_device_list.append(ant_value)
-            usb_controller_device_set.append({'ant_value': ant_value, 'dep_value': dep_value})
-
-        # remove duplicates
-        usb_controller_device_primary = set(usb_controller_device_list)
+        usb_controller_devices = self.associations('Win32_USBControllerdevice')
+        usb_controller_device_primary = usb_controller_devices.antecedents()
 
         # If self.dev_id exist then we find "dev_id" associated only.
         if len(self.dev_id) != 0:
             usb_controller_device_primary = self.dev_id
 
+        devices, parents = [], []
         for usb_ele in usb_controller_device_primary:
-            for element in usb_controller_device_set:
-                if element['ant_value'] == usb_ele:
-                    wql = self.build_wql_select(
-                        'Win32_PNPEntity', f'PNPDeviceID="{self._sanitize_wql_value(element["dep_value"])}"'
-                    )
-                    for hw_item in self.wmi_system.query(wql):
-                        service = getattr(hw_item, 'Service', '')
-                        guid = getattr(hw_item, 'ClassGuid', '')
-
-                        if service in excluded_services or guid in excluded_guids:
-                            continue
-
-                        props = self.properties_to_return.copy()
-                        for prop in props:
-                            if prop != 'Parent_PNPDeviceID':
-                                props[prop] = getattr(hw_item, prop, self.__DESC__)
-                            else:
-                                props['Parent_PNPDeviceID'] = element['ant_value']
-
-                        self.hardware_set_to_return.append(props)
+            for dep_value in usb_controller_devices.dependents(usb_ele):
+                for hw_item in self.lookup('Win32_PNPEntity', 'PNPDeviceID', dep_value):
+                    service = getattr(hw_item, 'Service', '')
+                    guid = getattr(hw_item, 'ClassGuid', '')
+
+                    if service in excluded_services or guid in excluded_guids:
+                        continue
+
+                    devices.append(hw_item)
+                    parents.append(usb_ele)
+
+        extract = compile_extractor(tuple(self.properties_to_get), self.__DESC__)
+        for props, parent in zip(extract(devices), parents):
+            props['Parent_PNPDeviceID'] = parent
+            self.hardware_set_to_return.append(props)
 
     def _populate_hardware(self, item_ret: Hardware, hw_item: dict) -> Hardware:
         usb_id_device = 'usb_device'
@@ -0,0 +1,199 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import re
+import threading
+
+from .profiler import current_profiler
+
+logger = logging.getLogger(__name__)
+
+# Quoted WQL string literals, with backslash escapes
+_WQL_LITERAL = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+_WHITESPACE = re.compile(r'\s+')
+
+_thread = threading.local()
+
+
+def normalize_wql(wql):
+    """Collapse whitespace outside string literals so equivalent WQL strings share a cache key."""
+    parts = _WQL_LITERAL.split(str(wql))
+    parts[::2] = [_WHITESPACE.sub(' ', part) for part in parts[::2]]
+    return ''.join(parts).strip()
+
+
+def join_multithreaded_apartment():
+    """Record that the calling thread joined the COM multithreaded apartment."""
+    _thread.multithreaded = True
+
+
+def apartment():
+    """
+    COM apartment of the calling thread. WMI objects must not leave the
+    apartment that created them: threads of the multithreaded apartment
+    share it, any other thread is a single-threaded apartment of its own.
+    """
+    return 'mta' if getattr(_thread, 'multithreaded', False) else threading.get_ident()
+
+
+def normalize_properties(properties):
+    """WMI property names are case-insensitive and order-independent."""
+    return tuple(sorted({str(prop).lower() for prop in properties or []}))
+
+
+class _Flight:
+    """Fetch of one key in progress; other threads asking for the key wait for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+
+
+class CachedWMIConnection:
+    """
+    Run-scoped memoizing proxy over a WMI connection.
+
+    Results of ``query(wql)`` and of ``Win32_*`` method calls are stored
+    the first time they are requested and served from memory afterwards,
+    so every WMI round-trip happens at most once per inventory run and COM
+    apartment. Results (rows are COM objects) are only served to threads
+    of the apartment that fetched them, see ``apartment()``.
+    Any other attribute is delegated untouched to the wrapped connection.
+
+    Concurrent misses of the same call reach WMI once: the other threads
+    wait for its result. Failed calls are not cached: the exception
+    propagates and the next identical call (or a waiting one) reaches WMI
+    again. Calls made through ``transient()`` are answered from the cache
+    but never stored, so their rows are freed as soon as the caller (and
+    the threads waiting for the same call) drop them.
+
+    Args:
+        connection: WMI connection to wrap, shared by every thread.
+        connect: Zero-argument callable returning the connection, used
+            instead of ``connection`` to defer connecting until first use.
+            It is called once per thread, since COM connections must not
+            cross apartments either.
+    """
+
+    def __init__(self, connection=None, connect=None):
+        self._connection = connection
+        self._connect = connect
+        self._local = threading.local()
+        self._results = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def connection(self):
+        if self._connection is not None:
+            return self._connection
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = self._connect()
+        return self._local.connection
+
+    def _once(self, key, produce, keep=True):
+        """
+        Value of ``key``, produced by ``produce()`` unless stored or in flight.
+
+        Returns:
+            ``(value, hit)``; ``hit`` is False for the thread that produced it.
+        """
+        while True:
+            with self._lock:
+                entry = self._results.get(key)
+                if entry is None:
+                    flight = self._results[key] = _Flight()
+                    break
+            if not isinstance(entry, _Flight):
+                return entry, True
+            entry.done.wait()
+            if not entry.failed:
+                return entry.value, True
+
+        try:
+            value = produce()
+        except BaseException:
+            flight.failed = True
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                if keep and self._results.get(key) is flight:
+                    self._results[key] = value
+            return value, False
+        finally:
+            with self._lock:
+                if self._results.get(key) is flight:
+                    del self._results[key]
+            flight.done.set()
+
+    def _cached(self, key, fetch, label, keep=True):
+        profiler = current_profiler()
+        rows, hit = self._once(
+            (apartment(), *key),
+            lambda: profiler.query(label, lambda: list(fetch())) if profiler is not None else list(fetch()),
+            keep,
+        )
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if hit and profiler is not None:
+            profiler.cache_hit(label)
+        return list(rows) if hit or keep else rows
+
+    def memoize(self, key, build):
+        """Keep a value derived from WMI data (e.g. an index) for the rest of the run."""
+        return self._once((apartment(), 'derived', key), build)[0]
+
+    def query(self, wql):
+        wql_key = normalize_wql(wql)
+        return self._cached(('query', wql_key), lambda: self.connection.query(wql), wql_key)
+
+    def _method(self, name, keep=True):
+        method = getattr(self.connection, name)
+
+        def call(properties=None, **kwargs):
+            key = (
+                name.lower(),
+                normalize_properties(properties),
+                tuple(sorted((k, repr(v)) for k, v in kwargs.items())),
+            )
+            label = f'{name}({",".join(properties or [])})'
+            if properties is None:
+                return self._cached(key, lambda: method(**kwargs), label, keep)
+            return self._cached(key, lambda: method(properties, **kwargs), label, keep)
+
+        return call
+
+    def transient(self, name):
+        """``Win32_*`` method ``name``, whose results are not kept for the rest of the run."""
+        return self._method(name, keep=False)
+
+    def __getattr__(self, name):
+        if name.lower().startswith('win32_'):
+            return self._method(name)
+        return getattr(self.connection, name)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,313 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Properties of the WMI classes lshw reads, as documented by Microsoft.
+
+Only the properties worth selecting are listed: a property missing here is
+either a typo or a property of another WMI class, which WMI would reject.
+Add it here when a hardware class starts selecting it.
+"""
+
+_MANAGED_SYSTEM_ELEMENT = ('Caption', 'Description', 'InstallDate', 'Name', 'Status')
+
+_LOGICAL_DEVICE = (
+    *_MANAGED_SYSTEM_ELEMENT,
+    'Availability',
+    'ConfigManagerErrorCode',
+    'ConfigManagerUserConfig',
+    'CreationClassName',
+    'DeviceID',
+    'ErrorCleared',
+    'ErrorDescription',
+    'LastErrorCode',
+    'PNPDeviceID',
+    'PowerManagementCapabilities',
+    'PowerManagementSupported',
+    'StatusInfo',
+    'SystemCreationClassName',
+    'SystemName',
+)
+
+_PHYSICAL_ELEMENT = (
+    *_MANAGED_SYSTEM_ELEMENT,
+    'CreationClassName',
+    'Manufacturer',
+    'Model',
+    'OtherIdentifyingInfo',
+    'PartNumber',
+    'PoweredOn',
+    'SerialNumber',
+    'SKU',
+    'Tag',
+    'Version',
+)
+
+_ASSOCIATION = ('Antecedent', 'Dependent')
+
+_PROPERTIES = {
+    'Win32_BaseBoard': (*_PHYSICAL_ELEMENT, 'HostingBoard', 'Product'),
+    'Win32_Battery': (
+        *_LOGICAL_DEVICE,
+        'BatteryStatus',
+        'Chemistry',
+        'DesignCapacity',
+        'DesignVoltage',
+        'EstimatedChargeRemaining',
+        'EstimatedRunTime',
+        'FullChargeCapacity',
+    ),
+    'Win32_BIOS': (
+        *_MANAGED_SYSTEM_ELEMENT,
+        'BIOSVersion',
+        'Manufacturer',
+        'ReleaseDate',
+        'SerialNumber',
+        'SMBIOSBIOSVersion',
+        'Version',
+    ),
+    'Win32_Bus': (*_LOGICAL_DEVICE, 'BusNum', 'BusType'),
+    'Win32_CacheMemory': (
+        *_LOGICAL_DEVICE,
+        'BlockSize',
+        'CacheType',
+        'InstalledSize',
+        'Level',
+        'MaxCacheSize',
+        'NumberOfBlocks',
+        'Purpose',
+    ),
+    'Win32_CDROMDrive': (
+        *_LOGICAL_DEVICE,
+        'Drive',
+        'Id',
+        'Manufacturer',
+        'MediaLoaded',
+        'MediaType',
+        'SCSIBus',
+        'SCSILogicalUnit',
+        'SCSIPort',
+        'SCSITargetId',
+        'SerialNumber',
+    ),
+    'Win32_ComputerSystem': (
+        *_MANAGED_SYSTEM_ELEMENT,
+        'Domain',
+        'Manufacturer',
+        'Model',
+        'NumberOfLogicalProcessors',
+        'NumberOfProcessors',
+        'SystemType',
+        'TotalPhysicalMemory',
+        'UserName',
+    ),
+    'Win32_ComputerSystemProduct': (
+        'Caption',
+        'Description',
+        'IdentifyingNumber',
+        'Name',
+        'SKUNumber',
+        'UUID',
+        'Vendor',
+        'Version',
+    ),
+    'Win32_DeviceBus': _ASSOCIATION,
+    'Win32_DiskDrive': (
+        *_LOGICAL_DEVICE,
+        'BytesPerSector',
+        'FirmwareRevision',
+        'Index',
+        'InterfaceType',
+        'Manufacturer',
+        'MediaType',
+        'Model',
+        'Partitions',
+        'SCSIBus',
+        'SCSILogicalUnit',
+        'SCSIPort',
+        'SCSITargetId',
+        'SerialNumber',
+        'Size',
+    ),
+    'Win32_DiskDriveToDiskPartition': _ASSOCIATION,
+    'Win32_DiskPartition': (
+        *_LOGICAL_DEVICE,
+        'BlockSize',
+        'Bootable',
+        'BootPartition',
+        'DiskIndex',
+        'Index',
+        'NumberOfBlocks',
+        'PrimaryPartition',
+        'Size',
+        'StartingOffset',
+        'Type',
+    ),
+    'Win32_IDEController': (*_LOGICAL_DEVICE, 'Manufacturer', 'ProtocolSupported'),
+    'Win32_IDEControllerDevice': _ASSOCIATION,
+    'Win32_LogicalDisk': (
+        *_LOGICAL_DEVICE,
+        'Compressed',
+        'DriveType',
+        'FileSystem',
+        'FreeSpace',
+        'MediaType',
+        'ProviderName',
+        'Size',
+        'VolumeName',
+        'VolumeSerialNumber',
+    ),
+    'Win32_LogicalDiskToPartition': _ASSOCIATION,
+    'Win32_NetworkAdapter': (
+        *_LOGICAL_DEVICE,
+        'AdapterType',
+        'AdapterTypeId',
+        'AutoSense',
+        'GUID',
+        'Index',
+        'InterfaceIndex',
+        'MACAddress',
+        'Manufacturer',
+        'MaxSpeed',
+        'NetConnectionID',
+        'NetConnectionStatus',
+        'NetEnabled',
+        'PermanentAddress',
+        'PhysicalAdapter',
+        'ProductName',
+        'ServiceName',
+        'Speed',
+    ),
+    'Win32_NetworkAdapterConfiguration': (
+        'Caption',
+        'DefaultIPGateway',
+        'Description',
+        'DHCPEnabled',
+        'DNSHostName',
+        'Index',
+        'InterfaceIndex',
+        'IPAddress',
+        'IPEnabled',
+        'IPSubnet',
+        'MACAddress',
+        'ServiceName',
+        'SettingID',
+    ),
+    'Win32_PhysicalMemory': (
+        *_PHYSICAL_ELEMENT,
+        'BankLabel',
+        'Capacity',
+        'ConfiguredClockSpeed',
+        'DataWidth',
+        'DeviceLocator',
+        'FormFactor',
+        'MemoryType',
+        'SMBIOSMemoryType',
+        'Speed',
+        'TotalWidth',
+        'TypeDetail',
+    ),
+    'Win32_PnPEntity': (
+        *_LOGICAL_DEVICE,
+        'ClassGuid',
+        'CompatibleID',
+        'HardwareID',
+        'Manufacturer',
+        'PNPClass',
+        'Present',
+        'Service',
+    ),
+    'Win32_PortableBattery': (
+        *_LOGICAL_DEVICE,
+        'BatteryStatus',
+        'CapacityMultiplier',
+        'Chemistry',
+        'DesignCapacity',
+        'DesignVoltage',
+        'EstimatedChargeRemaining',
+        'Location',
+        'ManufactureDate',
+        'Manufacturer',
+        'MaxBatteryError',
+        'SmartBatteryVersion',
+    ),
+    'Win32_POTSModem': (*_LOGICAL_DEVICE, 'AttachedTo', 'DeviceType', 'Model', 'ProviderName'),
+    'Win32_Printer': (
+        *_LOGICAL_DEVICE,
+        'Comment',
+        'Default',
+        'DriverName',
+        'Hidden',
+        'Local',
+        'Location',
+        'Network',
+        'PortName',
+        'PrinterStatus',
+        'Published',
+        'Queued',
+        'ServerName',
+        'Shared',
+        'ShareName',
+        'WorkOffline',
+    ),
+    'Win32_Processor': (
+        *_LOGICAL_DEVICE,
+        'AddressWidth',
+        'Architecture',
+        'CurrentClockSpeed',
+        'DataWidth',
+        'Family',
+        'L2CacheSize',
+        'L3CacheSize',
+        'Manufacturer',
+        'MaxClockSpeed',
+        'NumberOfCores',
+        'NumberOfLogicalProcessors',
+        'ProcessorId',
+        'SocketDesignation',
+    ),
+    'Win32_SerialPort': (*_LOGICAL_DEVICE, 'Binary', 'MaxBaudRate', 'MaxNumberControlled', 'ProviderType'),
+    'Win32_SoundDevice': (*_LOGICAL_DEVICE, 'Manufacturer', 'ProductName'),
+    'Win32_SystemEnclosure': (*_PHYSICAL_ELEMENT, 'ChassisTypes', 'SMBIOSAssetTag'),
+    'Win32_UninterruptiblePowerSupply': (*_LOGICAL_DEVICE, 'EstimatedChargeRemaining', 'EstimatedRunTime'),
+    'Win32_USBController': (*_LOGICAL_DEVICE, 'Manufacturer', 'ProtocolSupported'),
+    'Win32_USBControllerDevice': _ASSOCIATION,
+    'Win32_VideoController': (
+        *_LOGICAL_DEVICE,
+        'AdapterCompatibility',
+        'AdapterRAM',
+        'CurrentHorizontalResolution',
+        'CurrentVerticalResolution',
+        'DriverVersion',
+        'VideoModeDescription',
+        'VideoProcessor',
+    ),
+}
+
+# WMI names are case-insensitive
+PROPERTIES = {table.lower(): frozenset(prop.lower() for prop in props) for table, props in _PROPERTIES.items()}
+
+
+def unknown_properties(table, properties):
+    """
+    Properties of ``properties`` the WMI class ``table`` does not have.
+
+    Raises:
+        ValueError: If ``table`` is not listed.
+    """
+    known = PROPERTIES.get(table.lower())
+    if known is None:
+        raise ValueError(f'No property schema for {table}')
+    return [prop for prop in properties if prop.lower() not in known]
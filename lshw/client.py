@@ -0,0 +1,131 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Thin client of ``lshw --serve``.
+
+Imports neither the hardware classes nor ``wmi``, so asking a running
+server costs milliseconds::
+
+    lshw-client -c disk --with-children --max-age 60
+
+Each connection carries one request and one response, both JSON
+documents sent as length-prefixed messages over a Unix socket or a
+Windows named pipe (``multiprocessing.connection``).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from multiprocessing.connection import Client
+
+PROTOCOL_VERSION = 1
+
+
+class ServerError(Exception):
+    """The server could not answer the request."""
+
+
+def default_address():
+    """``\\\\.\\pipe\\lshw`` on Windows, a per-user Unix socket elsewhere."""
+    if sys.platform == 'win32':
+        return r'\\.\pipe\lshw'
+    return os.path.join(os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir(), f'lshw-{os.getuid()}.sock')
+
+
+def request(payload, address=None):
+    """
+    Send one request to the server and return its decoded response.
+
+    Raises:
+        OSError: If no server listens on ``address``.
+    """
+    with Client(address or default_address()) as connection:
+        connection.send_bytes(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return json.loads(connection.recv_bytes().decode('utf-8'))
+
+
+def query(classes=None, children=None, max_age=0, address=None):
+    """
+    Inventory nodes from a running ``lshw --serve``, as ``to_dict()`` dictionaries.
+
+    Args:
+        classes: Class names as accepted by ``lshw -c`` (e.g. ``['disk', 'network']``);
+            None for the whole computer.
+        children: True to include the subtree of every class, or the names
+            of the classes collected with their subtree.
+        max_age: Seconds an answer computed earlier by the server may be
+            reused (0 always collects).
+        address: Server socket or pipe, ``default_address()`` if omitted.
+
+    Raises:
+        ServerError: If the server rejected the request or failed to collect.
+        OSError: If no server listens on ``address``.
+    """
+    payload = {'version': PROTOCOL_VERSION, 'max_age': max_age}
+    if classes is not None:
+        payload['classes'] = list(classes)
+    if children is not None:
+        payload['children'] = children if isinstance(children, bool) else list(children)
+
+    response = request(payload, address)
+    if response.get('status') != 'ok':
+        raise ServerError(response.get('error', 'unknown error'))
+    return response['nodes']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='lshw-client', description='Ask a running "lshw --serve" for an inventory')
+    parser.add_argument('--class-hw', '-c', help='hardware classes, comma-separated (default: the whole computer)')
+    parser.add_argument(
+        '--with-children',
+        nargs='?',
+        const=True,
+        metavar='CLASSES',
+        help='include the subtree of every selected class, or only of the comma-separated CLASSES',
+    )
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        default=0,
+        metavar='SECONDS',
+        help='accept an answer the server collected up to SECONDS ago (default: 0, always collect)',
+    )
+    parser.add_argument('--compact', action='store_true', help='output compact JSON')
+    parser.add_argument('--address', help=f'server socket or named pipe (default: {default_address()})')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    classes = [name.strip() for name in args.class_hw.split(',') if name.strip()] if args.class_hw else None
+    children = args.with_children
+    if isinstance(children, str):
+        children = [name.strip() for name in children.split(',') if name.strip()]
+
+    try:
+        nodes = query(classes, children, args.max_age, args.address)
+    except (OSError, EOFError) as e:
+        sys.stderr.write(f'Could not reach the lshw server: {e}\n')
+        return 1
+    except ServerError as e:
+        sys.stderr.write(f'{e}\n')
+        return 1
+
+    print(json.dumps(nodes, separators=(',', ':')) if args.compact else json.dumps(nodes, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import logging
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lshw.classes import HardwareClass
+from lshw.classes.hardware import Hardware
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.parallel import (
+    SERIAL,
+    GuardedExecutor,
+    SubtreeTask,
+    current_executor,
+    parallel_collection,
+    use_executor,
+)
+
+logger = logging.getLogger(__name__)
+
+# asyncio.Lock per event loop, serializing the collect_async() calls awaited on it
+_async_locks = weakref.WeakKeyDictionary()
+
+
+def collect(entity='ComputerSystem', children=True, jobs=1, connection=None, cache=None) -> List[Hardware]:
+    """
+    Collect one hardware class (and optionally its subtree) in a single run.
+
+    Args:
+        entity: Registered hardware class name (e.g. 'ComputerSystem', 'PhysicalDisk').
+        children: Include the registered children of every collected node.
+        jobs: Worker threads used to collect sibling subtrees (1 = serial).
+        connection: WMI connection to use instead of the process singleton.
+            It is shared by every worker, so it must be thread-safe when jobs > 1.
+        cache: ``InventoryCache`` reusing the results of previous runs.
+
+    Returns:
+        List[Hardware]: Same trees, in the same order, whatever ``jobs`` is.
+    """
+    with WMIConnection.session(connection, cache), parallel_collection(jobs):
+        return HardwareClass.factory(entity)().format_data(children=children)
+
+
+def plan_collection(entities: Iterable[str], with_children: Iterable[str] = ()) -> List[Tuple[str, bool]]:
+    """
+    Collections needed for a selection of hardware classes, each class once.
+
+    Args:
+        entities: Registered hardware class names, in output order.
+        with_children: Those of ``entities`` collected with their whole subtree.
+
+    Returns:
+        ``[(entity, children)]`` in ``entities`` order. Classes registered
+        below a class collected with children are dropped, since their
+        nodes are already part of its subtree.
+    """
+    with_children = set(with_children)
+    covered = set()
+    for entity in with_children:
+        covered |= HardwareClass.get_descendants(entity)
+
+    plan = []
+    for entity in entities:
+        if entity not in covered and entity not in dict(plan):
+            plan.append((entity, entity in with_children))
+
+    return plan
+
+
+def collect_classes(entities: Iterable[str], with_children: Iterable[str] = (), jobs=1, connection=None, cache=None):
+    """
+    Collect several hardware classes in one run, sharing one WMI session.
+
+    Only the classes in ``entities`` (and the subtrees of ``with_children``)
+    are queried; see ``plan_collection()``.
+
+    Returns:
+        List[Hardware]: Nodes of every collected class, in ``entities`` order.
+    """
+    with WMIConnection.session(connection, cache), parallel_collection(jobs):
+        results = current_executor().map(
+            SubtreeTask(HardwareClass.factory(entity), children=children)
+            for entity, children in plan_collection(entities, with_children)
+        )
+        return [node for result in results for node in result()]
+
+
+def _bridge(run, loop):
+    """asyncio future settled with the outcome of a guarded run."""
+    future = loop.create_future()
+
+    def settle(run):
+        if future.done():
+            return
+        if run.future.exception() is not None:
+            future.set_exception(run.future.exception())
+        else:
+            future.set_result(run.future.result())
+
+    def notify(run):
+        # abandoned runs may finish after the loop is gone
+        if not loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(settle, run)
+
+    run.add_done_callback(notify)
+    return future
+
+
+async def collect_async(
+    classes: Optional[Iterable[str]] = None,
+    children=True,
+    jobs=4,
+    timeout: Optional[float] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    connection=None,
+    cache=None,
+) -> List[Hardware]:
+    """
+    Collect hardware classes without blocking the running event loop.
+
+    WMI calls run in worker threads; independent sibling subtrees, including
+    the top-level ``classes``, are gathered concurrently. A class subtree
+    that exceeds its timeout is skipped with a warning (the rest of the tree
+    is still returned), and cancelling the awaiting task stops every
+    collector that has not started yet.
+
+    The WMI session and the executor are process-wide, so overlapping calls
+    on the same event loop run one after the other, and a call made while
+    any other collection is running raises ``RuntimeError``.
+
+    Args:
+        classes: Registered hardware class names, defaults to ``['ComputerSystem']``.
+        children: Include the registered children of every collected node.
+        jobs: Maximum sibling subtrees collected at the same time.
+        timeout: Default seconds allowed per class subtree (None = no limit).
+        timeouts: Per-class overrides, e.g. ``{'Printer': 5}``.
+        connection: WMI connection to use instead of the process singleton.
+            It is shared by every worker, so it must be thread-safe.
+        cache: ``InventoryCache`` reusing the results of previous runs.
+
+    Returns:
+        List[Hardware]: Trees of every class, in ``classes`` order, as ``collect`` returns them.
+    """
+    # imported here: asyncio is the largest part of the CLI start-up otherwise
+    import asyncio
+
+    classes = list(classes or ['ComputerSystem'])
+    # get_running_loop() is Python 3.7+, get_event_loop() is deprecated in coroutines since 3.10
+    loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+    lock = _async_locks.get(loop)
+    if lock is None:
+        lock = _async_locks[loop] = asyncio.Lock()
+
+    async with lock:
+        if current_executor() is not SERIAL:
+            raise RuntimeError('Another inventory is running in this process')
+
+        cancelled = threading.Event()
+        executor = GuardedExecutor(
+            jobs,
+            initializer=WMIConnection.initialize_thread,
+            timeout=timeout,
+            timeouts=timeouts,
+            cancelled=cancelled,
+        )
+
+        with WMIConnection.session(connection, cache), use_executor(executor):
+            runs = executor.start(SubtreeTask(HardwareClass.factory(entity), children=children) for entity in classes)
+            try:
+                collected = []
+                for run in runs:
+                    future = _bridge(run, loop)
+                    # the class timeout only runs once the collector holds a slot
+                    await loop.run_in_executor(None, run.started.wait)
+                    try:
+                        collected.extend(await asyncio.wait_for(future, run.remaining()))
+                    except asyncio.TimeoutError:
+                        run.abandon()
+                return collected
+            except asyncio.CancelledError:
+                logger.info('Inventory cancelled, pending collectors are skipped')
+                raise
+            finally:
+                cancelled.set()
+                executor.shutdown()
@@ -0,0 +1,210 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Structural delta between two inventories.
+
+Inventories are the JSON documents ``lshw -j`` writes: lists of node
+dictionaries. ``diff(old, new)`` matches the children of every matched
+node by stable keys and returns a patch with the nodes added, removed,
+reordered and changed. ``apply(old, patch)`` rebuilds ``new`` from it.
+
+Patch format::
+
+    {"format": "lshw-delta", "version": 1, "changes": [
+        {"op": "remove", "path": "/PC-01/core/usb/usb:1"},
+        {"op": "add", "path": "/PC-01/core/usb", "index": 1, "node": {...}},
+        {"op": "order", "path": "/PC-01/core", "children": ["cpu:1", "cpu:0"]},
+        {"op": "change", "path": "/PC-01/core/volume:0", "set": {"size": 5}, "unset": ["serial"]}
+    ]}
+
+Every path points into ``old``: node ids joined with '/', a repeated id
+among siblings suffixed with '#2', '#3'... (as in ``lshw --stream ndjson``).
+``add`` inserts a whole subtree at ``index`` among the final children of
+``path`` ('' for the top level); ``order`` lists the kept children of
+``path`` in their new order; ``change`` sets and drops fields of one
+node (``children`` excluded).
+"""
+
+import copy
+import json
+
+PATCH_FORMAT = 'lshw-delta'
+PATCH_VERSION = 1
+
+# matching passes: a node is paired with the first unmatched sibling that has
+# the same class and the same values of these fields (skipped when all are empty)
+_MATCH_KEYS = (
+    ('id', 'pnpdeviceid', 'deviceid', 'serial'),
+    ('pnpdeviceid',),
+    ('deviceid',),
+    ('serial',),
+    ('id',),
+)
+
+
+def load_snapshot(path):
+    """Read a JSON inventory written by ``lshw -j`` (a list of nodes)."""
+    with open(path, encoding='utf-8') as f:
+        nodes = json.load(f)
+    if not isinstance(nodes, list) or not all(isinstance(node, dict) for node in nodes):
+        raise ValueError(f'Not an lshw JSON inventory: {path}')
+    return nodes
+
+
+def _segments(nodes):
+    """Path segment of each node among its siblings."""
+    seen = {}
+    segments = []
+    for node in nodes:
+        node_id = node.get('id')
+        seen[node_id] = seen.get(node_id, 0) + 1
+        segments.append(node_id if seen[node_id] == 1 else f'{node_id}#{seen[node_id]}')
+    return segments
+
+
+def _key(node, fields):
+    values = tuple(node.get(field) or '' for field in fields)
+    if not any(values):
+        return None
+    return (node.get('class'), *values)
+
+
+def _match(old, new):
+    """Pairs ``(old index, new index)`` of matching siblings, in ``new`` order."""
+    pairs = {}
+    free = set(range(len(old)))
+    for fields in _MATCH_KEYS:
+        candidates = {}
+        for i in sorted(free):
+            key = _key(old[i], fields)
+            if key is not None:
+                candidates.setdefault(key, []).append(i)
+        for j, node in enumerate(new):
+            if j in pairs:
+                continue
+            matches = candidates.get(_key(node, fields))
+            if matches:
+                i = matches.pop(0)
+                pairs[j] = i
+                free.discard(i)
+
+    return [(pairs[j], j) for j in sorted(pairs)]
+
+
+def _fields(old, new):
+    changed = {}
+    for key, value in new.items():
+        if key != 'children' and (key not in old or old[key] != value):
+            changed[key] = value
+    removed = [key for key in old if key != 'children' and key not in new]
+    return changed, removed
+
+
+def _diff_children(path, old, new, changes):
+    segments = _segments(old)
+    pairs = _match(old, new)
+    kept = {i for i, _ in pairs}
+
+    for i, segment in enumerate(segments):
+        if i not in kept:
+            changes.append({'op': 'remove', 'path': f'{path}/{segment}'})
+
+    order = [i for i, _ in pairs]
+    if order != sorted(order):
+        changes.append({'op': 'order', 'path': path, 'children': [segments[i] for i in order]})
+
+    matched = {j for _, j in pairs}
+    for j, node in enumerate(new):
+        if j not in matched:
+            changes.append({'op': 'add', 'path': path, 'index': j, 'node': node})
+
+    for i, j in pairs:
+        child_path = f'{path}/{segments[i]}'
+        changed, removed = _fields(old[i], new[j])
+        if changed or removed:
+            change = {'op': 'change', 'path': child_path}
+            if changed:
+                change['set'] = changed
+            if removed:
+                change['unset'] = removed
+            changes.append(change)
+        _diff_children(child_path, old[i].get('children', []), new[j].get('children', []), changes)
+
+
+def diff(old, new):
+    """
+    Patch turning the inventory ``old`` into ``new``.
+
+    Args:
+        old: Previous inventory, a list of node dictionaries.
+        new: Current inventory, in the same format (e.g. ``to_dict()`` of every node).
+
+    Returns:
+        dict: Patch, see the module documentation; ``changes`` is empty when
+        both inventories are equal.
+    """
+    changes = []
+    _diff_children('', old, new, changes)
+    return {'format': PATCH_FORMAT, 'version': PATCH_VERSION, 'changes': changes}
+
+
+def _index(parent, path, index, parents):
+    nodes = parent.setdefault('children', [])
+    for node, segment in zip(nodes, _segments(nodes)):
+        node_path = f'{path}/{segment}'
+        index[node_path] = node
+        parents[node_path] = parent
+        _index(node, node_path, index, parents)
+
+
+def apply(old, patch):
+    """
+    Inventory ``new`` such that ``diff(old, new)`` returned ``patch``.
+
+    ``old`` is not modified.
+
+    Raises:
+        ValueError: If ``patch`` is not a delta or does not fit ``old``.
+    """
+    if patch.get('format') != PATCH_FORMAT or patch.get('version') != PATCH_VERSION:
+        raise ValueError('Not an lshw delta')
+
+    root = {'children': copy.deepcopy(old)}
+    nodes = {'': root}
+    parents = {}
+    _index(root, '', nodes, parents)
+
+    try:
+        for change in patch['changes']:
+            op = change['op']
+            node = nodes[change['path']]
+            if op == 'remove':
+                siblings = parents[change['path']]['children']
+                del siblings[next(i for i, child in enumerate(siblings) if child is node)]
+            elif op == 'order':
+                node['children'][:] = [nodes[f'{change["path"]}/{segment}'] for segment in change['children']]
+            elif op == 'add':
+                node['children'].insert(change['index'], copy.deepcopy(change['node']))
+            elif op == 'change':
+                node.update(copy.deepcopy(change.get('set', {})))
+                for key in change.get('unset', []):
+                    node.pop(key, None)
+            else:
+                raise ValueError(f'Unknown delta operation: {op}')
+    except (KeyError, StopIteration, TypeError, AttributeError) as e:
+        raise ValueError(f'Delta does not apply: {e!r}') from e
+
+    return root['children']
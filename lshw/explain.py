@@ -0,0 +1,175 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Query plan of a collection: the WMI queries it would issue, without issuing any.
+
+``explain()`` walks the ``_children_`` registry from the collected
+classes and lists the ``planned_queries()`` of every class: how often
+each one reaches WMI (``one-shot``, ``batched`` or ``per-row``) and how
+many times each class is collected per node of its parent. Per-row
+queries are N+1 patterns: their count grows with the rows of the parent.
+
+``add_profile()`` attaches what a ``--profile json`` report recorded for
+the same classes and queries, as cost estimates.
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+from lshw.classes.hardware_class import HardwareClass
+from lshw.classes.query_plan import BATCHED, ONE_SHOT, PER_ROW
+from lshw.classes.wmi_cache import normalize_wql
+
+SCOPES = (ONE_SHOT, BATCHED, PER_ROW)
+
+_LIST_SEPARATOR = re.compile(r'\s*,\s*')
+
+
+def explain(plan: Iterable[Tuple[str, bool]]) -> List[dict]:
+    """
+    Query plan of the ``(entity, children)`` collections of a run (see ``plan_collection()``).
+
+    Returns:
+        One entry per collected class, parents first: its ``entity``,
+        ``parent``, ``depth``, ``fanout`` (``per-row``: once per parent
+        node, ``one-shot``: once per parent collection) and ``queries``
+        (``statement``, ``table``, ``scope``, ``note`` and ``cached``,
+        True when an earlier class issues the same statement, so the
+        session cache answers it).
+    """
+    entries = []
+    issued = set()
+
+    def visit(entity, parent, depth, fanout, children):
+        hardware_class = HardwareClass.factory(entity)
+        queries = []
+        for query in hardware_class().planned_queries():
+            statement = query.statement
+            cached = query.scope != PER_ROW and statement in issued
+            issued.add(statement)
+            queries.append(
+                {
+                    'statement': statement,
+                    'table': query.table,
+                    'scope': query.scope,
+                    'note': query.note,
+                    'cached': cached,
+                }
+            )
+        entries.append({'entity': entity, 'parent': parent, 'depth': depth, 'fanout': fanout, 'queries': queries})
+
+        if children:
+            for child_class in HardwareClass.get_children(entity):
+                visit(child_class._entity_, entity, depth + 1, hardware_class._child_fanout_, True)
+
+    for entity, children in plan:
+        visit(entity, None, 0, ONE_SHOT, children)
+
+    return entries
+
+
+def _recorded(statement, label):
+    """Whether the profiled query ``label`` is an instance of the planned ``statement``."""
+    label = _LIST_SEPARATOR.sub(',', normalize_wql(label))
+    placeholder = statement.find('<')
+    if placeholder < 0:
+        return label == statement
+    return label.startswith(statement[:placeholder])
+
+
+def add_profile(entries: List[dict], report: dict) -> List[dict]:
+    """
+    Attach the measurements of a ``Profiler.report()`` to the entries of ``explain()``.
+
+    Every class gets ``recorded``: its ``collections`` (``get_hardware``
+    calls), their ``multiplier`` relative to the parent collections and
+    its own ``seconds``. Every query not answered by the session cache
+    gets ``recorded``: the ``calls``, ``rows``, ``seconds`` and
+    ``cache_hits`` of the matching profiled queries.
+    """
+    entities = {entry['entity']: entry for entry in report.get('entities', [])}
+    profiled = report.get('queries', [])
+
+    def collections(entity):
+        return entities.get(entity, {}).get('phases', {}).get('get_hardware', {}).get('calls', 0)
+
+    for entry in entries:
+        count = collections(entry['entity'])
+        parent = collections(entry['parent']) if entry['parent'] else 1
+        entry['recorded'] = {
+            'collections': count,
+            'multiplier': round(count / parent, 2) if parent else None,
+            'seconds': entities.get(entry['entity'], {}).get('seconds', 0.0),
+        }
+        for query in entry['queries']:
+            if query['cached']:
+                continue
+            matches = [item for item in profiled if _recorded(query['statement'], item['query'])]
+            query['recorded'] = {
+                'calls': sum(item['calls'] for item in matches),
+                'rows': sum(item['rows'] for item in matches),
+                'seconds': round(sum(item['seconds'] for item in matches), 6),
+                'cache_hits': sum(item.get('cache_hits', 0) for item in matches),
+            }
+
+    return entries
+
+
+def _fanout(entry):
+    if entry['parent'] is None:
+        return ''
+    if entry['fanout'] == PER_ROW:
+        return f'x each {entry["parent"]} node'
+    return f'x1 per {entry["parent"]} collection'
+
+
+def format_text(entries: List[dict]) -> str:
+    """Indented plan, one line per class and per query; per-row (N+1) queries are flagged with '!'."""
+    lines = []
+    totals = dict.fromkeys(SCOPES, 0)
+    cached = 0
+    seconds = 0.0
+    for entry in entries:
+        pad = '  ' * entry['depth']
+        line = f'{pad}{entry["entity"]}  {_fanout(entry)}'.rstrip()
+        recorded = entry.get('recorded')
+        if recorded is not None:
+            multiplier = '' if recorded['multiplier'] is None else f', x{recorded["multiplier"]:g}'
+            line += f'  [collections: {recorded["collections"]}{multiplier}, {recorded["seconds"]:.3f} s]'
+        lines.append(line)
+
+        for query in entry['queries']:
+            flag = '!' if query['scope'] == PER_ROW else ' '
+            line = f'{pad}  {query["scope"]:<8}{flag} {query["statement"]}'
+            notes = [query['note']] if query['note'] else []
+            if query['cached']:
+                cached += 1
+                notes.append('session cache')
+            else:
+                totals[query['scope']] += 1
+            if notes:
+                line += f'  ({"; ".join(notes)})'
+            recorded = query.get('recorded')
+            if recorded is not None:
+                seconds += recorded['seconds']
+                line += f'  [calls: {recorded["calls"]}, rows: {recorded["rows"]}, {recorded["seconds"]:.3f} s]'
+            lines.append(line)
+
+    summary = ', '.join(f'{totals[scope]} {scope}' for scope in SCOPES)
+    lines += ['', f'Queries: {summary} (! = N+1), {cached} answered by the session cache']
+    if any('recorded' in entry for entry in entries):
+        lines.append(f'Recorded WMI time: {seconds:.3f} s')
+    return '\n'.join(lines)
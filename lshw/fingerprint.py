@@ -0,0 +1,84 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Hardware fingerprint: a digest that changes when the hardware does.
+
+A handful of narrow WMI queries (device, disk, partition, volume and
+memory bank identifiers, BIOS and board versions) are hashed into one
+SHA-256 digest, at a fraction of the cost of a full inventory. Values
+that change with usage rather than with the hardware (free space, IP
+addresses, battery charge...) are left out, and so are the software
+devices Windows creates and removes on its own (print queues, virtual
+adapters...) and every volume but local disks, whose media or mapping
+changes at will. The digest is stable from one run to the next.
+"""
+
+import hashlib
+import json
+
+from lshw.classes.hardware_class import HardwareClass, WMIConnection
+
+FINGERPRINT_VERSION = 2
+
+# PnP enumerators of software devices: print queues, virtual adapters and buses...
+SOFTWARE_ENUMERATORS = ('HTREE', 'ROOT', 'SW', 'SWD', 'UMB')
+
+LOCAL_DISK = 3  # Win32_LogicalDisk.DriveType; removable, network and optical drives come and go
+
+# (WMI class, properties, WHERE clause) hashed, in this order
+SOURCES = (
+    ('Win32_BIOS', ('Manufacturer', 'BIOSVersion', 'ReleaseDate', 'SerialNumber'), ''),
+    ('Win32_BaseBoard', ('Manufacturer', 'Product', 'SerialNumber'), ''),
+    ('Win32_Processor', ('Name',), ''),
+    ('Win32_PhysicalMemory', ('BankLabel', 'Capacity', 'SerialNumber'), ''),
+    (
+        'Win32_PnPEntity',
+        ('PNPDeviceID',),
+        ' AND '.join(f'NOT PNPDeviceID LIKE "{enumerator}\\\\%"' for enumerator in SOFTWARE_ENUMERATORS),
+    ),
+    ('Win32_DiskDrive', ('PNPDeviceID', 'Size'), ''),
+    ('Win32_DiskPartition', ('DeviceID', 'Size'), ''),
+    ('Win32_LogicalDisk', ('DeviceID', 'Size'), f'DriveType = {LOCAL_DISK}'),
+    ('Win32_Printer', ('Name', 'DriverName'), ''),
+)
+
+
+def _value(row, prop):
+    value = getattr(row, prop, None)
+    return '' if value is None else str(value).strip()
+
+
+def fingerprint(connection=None) -> str:
+    """
+    Hex SHA-256 digest of the hardware identifiers listed in ``SOURCES``.
+
+    Row order does not matter. WMI errors propagate: a partial
+    fingerprint could match while the hardware has changed.
+
+    Args:
+        connection: WMI connection to use instead of the process singleton.
+    """
+    digest = hashlib.sha256(f'lshw-fingerprint:{FINGERPRINT_VERSION}'.encode())
+    with WMIConnection.session(connection) as session:
+        for table, properties, where in SOURCES:
+            if table.lower() not in HardwareClass._WMI_ENTITY_ALLOWLIST:
+                raise ValueError(f'Unauthorized WMI entity: {table}')
+            wql = f'SELECT {",".join(properties)} FROM {table}'
+            rows = session.query(f'{wql} WHERE {where}' if where else wql)
+            values = sorted([_value(row, prop) for prop in properties] for row in rows)
+            digest.update(json.dumps([table, values], separators=(',', ':')).encode('utf-8'))
+
+    return digest.hexdigest()
@@ -0,0 +1,300 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Live inventory: a collected tree kept up to date by hot-plug events.
+
+``LiveInventory`` patches the nodes affected by each ``HardwareEvent``
+instead of collecting the whole computer again:
+
+* ``Win32_USBControllerDevice`` (a device plugged into or removed from a
+  USB controller): the devices of that controller are collected again.
+* ``Win32_PnPEntity``: a removed device is dropped from the tree, a
+  modified USB device is collected again with its controller.
+* ``Win32_LogicalDisk``: a modified volume is rebuilt from the event
+  itself, without querying WMI; a new one is collected below its
+  partition, a removed one is dropped.
+* ``Win32_NetworkAdapter``: the adapter is collected again and replaced
+  in place, or attached to the bridge of its bus when it is new.
+
+Events come from any iterable, e.g. ``WMIEventSource`` on Windows or a
+list of ``HardwareEvent`` in tests and on other systems.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, List
+
+from lshw.classes import HardwareClass
+from lshw.classes.associations import reference_id
+from lshw.classes.hardware import Hardware
+from lshw.classes.hardware_class import WMIConnection, wmi
+from lshw.classes.prefetch import normalize_device_id
+
+logger = logging.getLogger(__name__)
+
+CREATION = 'creation'
+DELETION = 'deletion'
+MODIFICATION = 'modification'
+
+# WMI classes whose instance events keep the tree up to date
+WATCHED_CLASSES = ('Win32_PnPEntity', 'Win32_USBControllerDevice', 'Win32_LogicalDisk', 'Win32_NetworkAdapter')
+
+
+@dataclass(frozen=True)
+class HardwareEvent:
+    """
+    One WMI instance event.
+
+    Attributes:
+        kind: ``CREATION``, ``DELETION`` or ``MODIFICATION``.
+        wmi_class: WMI class of the instance, one of ``WATCHED_CLASSES``.
+        instance: The created, deleted or modified instance (``TargetInstance``).
+    """
+
+    kind: str
+    wmi_class: str
+    instance: Any
+
+
+class WMIEventSource:
+    """
+    Instance events of ``WATCHED_CLASSES`` from WMI, as ``HardwareEvent``.
+
+    Iterate it in the thread that owns the WMI connection; iteration ends
+    after ``close()``, which may be called from any thread.
+
+    Args:
+        classes: WMI classes to watch.
+        connection: WMI connection to use instead of the process singleton.
+        delay: Seconds between the WMI polls of each watched class.
+        timeout: Seconds waited for an event of each class in turn, which
+            is also how long ``close()`` may take to end the iteration.
+    """
+
+    def __init__(self, classes=WATCHED_CLASSES, connection=None, delay=1, timeout=0.5):
+        for wmi_class in classes:
+            if wmi_class.lower() not in HardwareClass._WMI_ENTITY_ALLOWLIST:
+                raise ValueError(f'Unauthorized WMI entity: {wmi_class}')
+        self.classes = tuple(classes)
+        self.connection = connection
+        self.delay = delay
+        self.timeout = timeout
+        self._closed = threading.Event()
+
+    def close(self):
+        self._closed.set()
+
+    def __iter__(self):
+        connection = self.connection or WMIConnection.get_instance()
+        watchers = [
+            (wmi_class, connection.watch_for(notification_type='Operation', wmi_class=wmi_class, delay_secs=self.delay))
+            for wmi_class in self.classes
+        ]
+        timed_out = getattr(wmi, 'x_wmi_timed_out', ())
+        while not self._closed.is_set():
+            for wmi_class, watcher in watchers:
+                try:
+                    instance = watcher(timeout_ms=int(self.timeout * 1000))
+                except timed_out:
+                    continue
+                yield HardwareEvent(instance.event_type, wmi_class, instance)
+
+
+class LiveInventory:
+    """
+    Collected ``Hardware`` trees, patched in place by ``apply()``.
+
+    Args:
+        nodes: Trees collected with their children, e.g. ``collect()``.
+        connection: WMI connection to use instead of the process singleton.
+    """
+
+    def __init__(self, nodes: List[Hardware], connection=None):
+        self.nodes = nodes
+        self.connection = connection
+        self.lock = threading.RLock()
+        self._handlers = {
+            'win32_usbcontrollerdevice': self._usb_link,
+            'win32_pnpentity': self._pnp_entity,
+            'win32_logicaldisk': self._logical_disk,
+            'win32_networkadapter': self._network_adapter,
+        }
+
+    # --- tree ---
+
+    def _walk(self):
+        """``(siblings, index, node)`` of every node, parents before children."""
+        pending = [self.nodes]
+        while pending:
+            siblings = pending.pop()
+            for index, node in enumerate(siblings):
+                yield siblings, index, node
+                pending.append(node.children)
+
+    def _find(self, predicate):
+        return [(siblings, index, node) for siblings, index, node in self._walk() if predicate(node)]
+
+    @staticmethod
+    def _remove(found):
+        for siblings, _, node in reversed(found):
+            siblings[:] = [sibling for sibling in siblings if sibling is not node]
+        return bool(found)
+
+    @staticmethod
+    def _collect(entity, *args, **kwargs) -> List[Hardware]:
+        return HardwareClass.factory(entity)(*args, **kwargs).format_data(children=True)
+
+    # --- handlers ---
+
+    def _refresh_usb_controller(self, controller_id):
+        controller = normalize_device_id(controller_id)
+        found = self._find(
+            lambda node: (
+                node.class_ == 'bus'
+                and node.id.startswith('usb:')
+                and normalize_device_id(node.pnpdeviceid) == controller
+            )
+        )
+        if not found:
+            logger.debug('USB controller %s is not in the tree', controller_id)
+            return False
+        for _, _, node in found:
+            node.children = self._collect('UsbDevice', dev_id=[node.pnpdeviceid])
+        return True
+
+    def _usb_link(self, event):
+        return self._refresh_usb_controller(reference_id(getattr(event.instance, 'Antecedent', '')))
+
+    def _pnp_entity(self, event):
+        device = normalize_device_id(getattr(event.instance, 'PNPDeviceID', ''))
+        if not device:
+            return False
+        found = self._find(lambda node: normalize_device_id(node.pnpdeviceid) == device)
+        if event.kind == DELETION:
+            return self._remove(found)
+        if event.kind == MODIFICATION:
+            controllers = {node.parent_pnpdeviceid for _, _, node in found if node.parent_pnpdeviceid}
+            changed = False
+            for controller in controllers:
+                changed = self._refresh_usb_controller(controller) or changed
+            return changed
+        # new USB devices are attached by their Win32_USBControllerDevice event
+        return False
+
+    def _logical_disk(self, event):
+        volume = getattr(event.instance, 'DeviceID', '')
+        found = self._find(lambda node: node.id.startswith('logicalvolume:') and node.deviceid == volume)
+        if event.kind == DELETION:
+            return self._remove(found)
+        if event.kind == MODIFICATION and found:
+            for siblings, index, _ in found:
+                siblings[index] = self._from_instance('LogicalDisk', event.instance)
+            return True
+        return self._refresh_partition_of(volume)
+
+    def _refresh_partition_of(self, volume):
+        volumes = HardwareClass.factory('LogicalDisk')().associations('Win32_LogicalDiskToPartition')
+        partitions = {partition.lower() for partition in volumes.antecedents(volume)}
+        found = self._find(lambda node: node.id.startswith('volume:') and node.deviceid.lower() in partitions)
+        if not found:
+            logger.debug('The partition of volume %s is not in the tree', volume)
+            return False
+        for _, _, node in found:
+            node.children = self._collect('LogicalDisk', node.deviceid)
+        return True
+
+    def _network_adapter(self, event):
+        device = normalize_device_id(getattr(event.instance, 'PNPDeviceID', ''))
+        if not device:
+            return False
+        found = self._find(lambda node: node.class_ == 'network' and normalize_device_id(node.pnpdeviceid) == device)
+        if event.kind == DELETION:
+            return self._remove(found)
+
+        fresh = [node for node in self._collect('NetworkCard') if normalize_device_id(node.pnpdeviceid) == device]
+        if not fresh:
+            # not a physical adapter (anymore)
+            return self._remove(found)
+        if found:
+            for siblings, index, _ in found:
+                siblings[index] = fresh[0]
+            return True
+        return self._attach_to_bridge(fresh[0])
+
+    def _attach_to_bridge(self, device):
+        containers = [node for _, _, node in self._walk() if node.id == 'pci' and node.class_ == 'bridge']
+        if not containers:
+            logger.debug('No PCI bridge to attach %s to', device.pnpdeviceid)
+            return False
+        pci = HardwareClass.factory('Pci')()
+        bridges = {}
+        for bridge in containers[0].children:
+            if bridge.class_ == 'bridge':
+                bridges.setdefault(normalize_device_id(bridge.description), bridge)
+        if not bridges:
+            return False
+        pci._place_devices(bridges, [device])
+        return True
+
+    @staticmethod
+    def _from_instance(entity, instance) -> Hardware:
+        """Node of ``entity`` built from an event instance, without querying WMI."""
+        collector = HardwareClass.factory(entity)()
+        collector.hardware_set.append(instance)
+        collector.check_values()
+        node = collector._populate_hardware(collector._new_item(), collector.hardware_set_to_return[0])
+        node.blank_sentinels((collector.__ERROR__, collector.__DESC__))
+        return node
+
+    # --- events ---
+
+    def apply(self, event: HardwareEvent) -> bool:
+        """
+        Patch the tree for one event.
+
+        Returns:
+            True if the tree changed. Events about devices that are not in
+            the tree (e.g. a virtual network adapter) are ignored.
+        """
+        handler = self._handlers.get(event.wmi_class.lower())
+        if handler is None:
+            logger.debug('Ignoring event of %s', event.wmi_class)
+            return False
+        with self.lock, WMIConnection.session(self.connection):
+            try:
+                return handler(event)
+            except (wmi.x_wmi, wmi.x_access_denied, AttributeError, KeyError, TypeError) as e:
+                logger.warning('Could not apply %s event of %s: %s', event.kind, event.wmi_class, e)
+                return False
+
+    def follow(self, events: Iterable[HardwareEvent], callback=None):
+        """
+        Apply every event of ``events`` (e.g. a ``WMIEventSource``) until it ends.
+
+        Args:
+            callback: Called with each event that changed the tree, while
+                the tree is locked.
+        """
+        for event in events:
+            with self.lock:
+                if self.apply(event) and callback is not None:
+                    callback(event)
+
+    def to_dict(self):
+        """Consistent ``to_dict()`` snapshot of the trees."""
+        with self.lock:
+            return [node.to_dict() for node in self.nodes]
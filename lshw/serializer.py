@@ -0,0 +1,168 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+JSON encoding of ``Hardware`` trees.
+
+The output is the text ``json.dumps([node.to_dict() ...], indent=2)``
+returns (or, with ``compact=True``, the one with ``separators=(',', ':')``):
+same key order, same omitted fields, same escaping. Indented documents
+are written field by field, skipping both the intermediate dictionaries
+and the pure Python path ``json`` takes whenever it indents.
+
+When ``orjson`` is installed (``pip install lshw[orjson]``) it encodes
+the tree instead, unless the tree holds floats, which it writes
+differently (``1e16`` for ``1e+16``, ``null`` for ``NaN``). ``dumps()``
+keeps its result whenever it is pure ASCII, so the text is always the
+same with or without it.
+"""
+
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Iterable
+
+from lshw.classes.hardware import OPTIONAL_FIELDS, CompactHardware, Hardware
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+_BASE_FIELDS = (
+    ('id', 'id'),
+    ('class', 'class_'),
+    ('claimed', 'claimed'),
+    ('handle', 'handle'),
+    ('description', 'description'),
+    ('product', 'product'),
+    ('vendor', 'vendor'),
+    ('physid', 'physid'),
+    ('serial', 'serial'),
+)
+_KEYS = {name: encode_basestring_ascii(name) for name in (*dict(_BASE_FIELDS), *OPTIONAL_FIELDS)}
+
+# nodes whose to_dict() is one of these are encoded field by field
+_ENCODED = (Hardware.to_dict, CompactHardware.to_dict)
+
+
+def _value(value, pad):
+    if value.__class__ is str:
+        return encode_basestring_ascii(value)
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if value.__class__ is int:
+        return int.__repr__(value)
+    return json.dumps(value, indent=2).replace('\n', pad)
+
+
+def _nodes(nodes, pad, parts):
+    """Append the JSON array of ``nodes`` to ``parts``; ``pad`` starts the line of its '['."""
+    if not nodes:
+        parts.append('[]')
+        return
+
+    inner = pad + '  '
+    parts.append('[' + inner)
+    for i, node in enumerate(nodes):
+        if i:
+            parts.append(',' + inner)
+        _node(node, inner, parts)
+    parts.append(pad + ']')
+
+
+def _node(node, pad, parts):
+    if type(node).to_dict not in _ENCODED:
+        parts.append(_value(node.to_dict(), pad))
+        return
+
+    inner = pad + '  '
+    separator = ',' + inner
+    get = node.__getattribute__
+
+    parts.append('{' + inner)
+    parts.append(separator.join(_KEYS[key] + ': ' + _value(get(attr), inner) for key, attr in _BASE_FIELDS))
+    parts.append(separator + '"children": ')
+    _nodes(node.children, inner, parts)
+    for attr in OPTIONAL_FIELDS:
+        value = get(attr)
+        if value:
+            parts.append(separator + _KEYS[attr] + ': ' + _value(value, inner))
+    parts.append(pad + '}')
+
+
+def _encode(nodes, compact):
+    if compact:
+        # the C encoder of the stdlib is only used without indentation
+        return json.dumps([node.to_dict() for node in nodes], separators=(',', ':'))
+
+    parts = []
+    _nodes(nodes, '\n', parts)
+    return ''.join(parts)
+
+
+def _has_float(value):
+    cls = value.__class__
+    if cls is float:
+        return True
+    if cls is dict:
+        return any(map(_has_float, value.values()))
+    if cls is list or cls is tuple:
+        return any(map(_has_float, value))
+    return False
+
+
+def _orjson(nodes, compact):
+    data = [node.to_dict() for node in nodes]
+    if _has_float(data):
+        return None
+    try:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    except TypeError:  # e.g. integers wider than 64 bits
+        return None
+
+
+def dumps(nodes: Iterable[Hardware], compact=False) -> str:
+    """
+    JSON text of a list of ``Hardware`` trees, as ``json.dumps`` of their ``to_dict()``.
+
+    Args:
+        nodes: Top-level hardware nodes.
+        compact: No indentation nor spaces after separators (for machine consumers).
+    """
+    nodes = list(nodes)
+    if orjson is not None:
+        data = _orjson(nodes, compact)
+        if data is not None and data.isascii():
+            return data.decode('ascii')
+    return _encode(nodes, compact)
+
+
+def dumpb(nodes: Iterable[Hardware], compact=False) -> bytes:
+    """
+    UTF-8 JSON document of a list of ``Hardware`` trees, ready to write or upload.
+
+    With ``orjson`` non-ASCII characters are written as UTF-8 instead of
+    ``\\uXXXX`` escapes; the decoded JSON is the same.
+    """
+    nodes = list(nodes)
+    if orjson is not None:
+        data = _orjson(nodes, compact)
+        if data is not None:
+            return data
+    return _encode(nodes, compact).encode('utf-8')
@@ -0,0 +1,230 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Long-lived inventory server (``lshw --serve``).
+
+One process keeps the package imported, the WMI connection of its
+serving thread open and the answers it computed, and answers requests
+of ``lshw.client`` over a Unix socket or a Windows named pipe::
+
+    {"classes": ["disk"], "children": true, "max_age": 60}
+
+``classes`` takes the names of ``lshw -c`` (the whole computer when
+omitted), ``children`` is true, false or a list of those names, and
+``max_age`` is how many seconds old a previous answer to the same
+request may be. The response is ``{"status": "ok", "age": seconds,
+"nodes": [...]}`` or ``{"status": "error", "error": message}``.
+
+Requests are served one at a time, in the serving thread, since a WMI
+session is process-wide.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import suppress
+from multiprocessing.connection import Client, Listener
+
+from lshw.classes import HardwareClass
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.parallel import SubtreeTask, current_executor, parallel_collection
+from lshw.client import PROTOCOL_VERSION, default_address
+from lshw.collector import plan_collection
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 10  # seconds a client may take to send its request
+MAX_REQUEST = 64 * 1024  # bytes
+MAX_RESULTS = 32  # answers kept for "max_age", the oldest one is dropped first
+
+
+class RequestError(ValueError):
+    """Malformed request, reported to the client."""
+
+
+class InventoryServer:
+    """
+    Answers inventory requests over a local socket or named pipe.
+
+    Args:
+        address: Unix socket path or ``\\\\.\\pipe\\name``, ``default_address()`` if omitted.
+        connection: WMI connection to use instead of the process singleton.
+        jobs: Worker threads per collection, as ``lshw --jobs``.
+        cache: Optional ``InventoryCache`` shared by every request.
+        classes: Names accepted in ``classes`` -> registered entity, e.g.
+            ``{'disk': 'PhysicalDisk'}``. Entity names are always accepted.
+        clock: Monotonic time source, in seconds.
+    """
+
+    def __init__(self, address=None, connection=None, jobs=1, cache=None, classes=None, clock=time.monotonic):
+        self.address = address or default_address()
+        self.connection = connection
+        self.jobs = jobs
+        self.cache = cache
+        self.classes = dict(classes or {})
+        self._clock = clock
+        self._results = {}
+        self._listener = None
+        self._closed = threading.Event()
+        self.ready = threading.Event()
+
+    # --- requests ---
+
+    def _entity(self, name):
+        if not isinstance(name, str):
+            raise RequestError(f'Invalid class: {name!r}')
+        entity = self.classes.get(name, name)
+        try:
+            HardwareClass.factory(entity)
+        except KeyError:
+            raise RequestError(f'Unknown class: {name}') from None
+        return entity
+
+    def plan(self, request):
+        """``(entity, children)`` collections for a request (see ``plan_collection()``)."""
+        if not isinstance(request, dict):
+            raise RequestError('The request must be a JSON object')
+        if request.get('version', PROTOCOL_VERSION) != PROTOCOL_VERSION:
+            raise RequestError(f'Unsupported protocol version: {request.get("version")}')
+
+        names = request.get('classes')
+        children = request.get('children')
+        if names is None:
+            return [('ComputerSystem', children is not False)]
+        if not isinstance(names, list) or not names:
+            raise RequestError('"classes" must be a non-empty list')
+
+        entities = [self._entity(name) for name in names]
+        if children is True:
+            with_children = entities
+        elif not children:
+            with_children = []
+        elif isinstance(children, list):
+            with_children = [self._entity(name) for name in children]
+            if not set(with_children) <= set(entities):
+                raise RequestError('"children" classes must also be in "classes"')
+        else:
+            raise RequestError('"children" must be a boolean or a list of classes')
+
+        return plan_collection(entities, with_children)
+
+    def _collect(self, plan):
+        with WMIConnection.session(self.connection, cache=self.cache), parallel_collection(self.jobs):
+            tasks = [SubtreeTask(HardwareClass.factory(entity), children=children) for entity, children in plan]
+            return [node.to_dict() for result in current_executor().map(tasks) for node in result()]
+
+    def handle(self, request):
+        """Response to one decoded request."""
+        try:
+            plan = self.plan(request)
+            max_age = request.get('max_age') or 0
+            if not isinstance(max_age, (int, float)):
+                raise RequestError('"max_age" must be a number of seconds')
+        except RequestError as e:
+            return {'status': 'error', 'error': str(e)}
+
+        key = tuple(plan)
+        now = self._clock()
+        cached = self._results.get(key)
+        if cached is not None and max_age > 0 and 0 <= now - cached[0] <= max_age:
+            return {'status': 'ok', 'age': round(now - cached[0], 3), 'nodes': cached[1]}
+
+        try:
+            nodes = self._collect(plan)
+        except Exception as e:
+            # whatever a collector raises, the server must keep serving
+            logger.exception('Could not collect %s', plan)
+            return {'status': 'error', 'error': f'Could not collect the inventory: {e}'}
+
+        self._results.pop(key, None)
+        self._results[key] = (now, nodes)
+        while len(self._results) > MAX_RESULTS:
+            del self._results[next(iter(self._results))]
+        return {'status': 'ok', 'age': 0, 'nodes': nodes}
+
+    # --- transport ---
+
+    def bind(self):
+        """Start listening; a stale Unix socket left by a crashed server is replaced."""
+        if not self.address.startswith('\\\\') and os.path.exists(self.address):
+            try:
+                Client(self.address).close()
+            except OSError:
+                os.unlink(self.address)
+            else:
+                raise OSError(f'Another lshw server listens on {self.address}')
+
+        if self.address.startswith('\\\\'):
+            self._listener = Listener(self.address)
+        else:
+            # created owner-only: no other user may connect, even before chmod
+            umask = os.umask(0o077)
+            try:
+                self._listener = Listener(self.address)
+            finally:
+                os.umask(umask)
+            os.chmod(self.address, 0o600)
+        self.ready.set()
+
+    def _answer(self, connection):
+        try:
+            if not connection.poll(REQUEST_TIMEOUT):
+                return
+            request = json.loads(connection.recv_bytes(MAX_REQUEST).decode('utf-8'))
+        except (EOFError, OSError) as e:
+            logger.debug('Dropping client: %s', e)
+            return
+        except ValueError as e:
+            response = {'status': 'error', 'error': f'Invalid JSON request: {e}'}
+        else:
+            if self._closed.is_set():
+                return
+            start = time.perf_counter()
+            response = self.handle(request)
+            logger.debug('Answered %s in %.3f s', request, time.perf_counter() - start)
+
+        try:
+            connection.send_bytes(json.dumps(response, separators=(',', ':')).encode('utf-8'))
+        except OSError as e:
+            logger.debug('Could not answer client: %s', e)
+
+    def serve_forever(self):
+        """Answer requests until ``shutdown()`` (or KeyboardInterrupt)."""
+        if self._listener is None:
+            self.bind()
+        if threading.current_thread() is not threading.main_thread():
+            WMIConnection.initialize_thread()
+
+        try:
+            while not self._closed.is_set():
+                try:
+                    connection = self._listener.accept()
+                except OSError:
+                    if self._closed.is_set():
+                        break
+                    raise
+                with connection:
+                    self._answer(connection)
+        finally:
+            self._listener.close()
+
+    def shutdown(self):
+        """Stop ``serve_forever()`` from another thread."""
+        self._closed.set()
+        with suppress(OSError):
+            Client(self.address).close()  # wakes up accept()
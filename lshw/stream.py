@@ -0,0 +1,211 @@
+# Copyright (c) 2026 Jose Antonio Chavarría <jachavar@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Streaming output: hardware nodes are written as soon as they are final.
+
+``iter_events()`` walks the class registry instead of building the whole
+tree first. A class that keeps the default ``format_data`` and
+``_fetch_children`` is *opened*: its nodes are final before its children
+are collected, so they are emitted right away and their children follow
+class by class, each node as soon as its WMI row is converted (see
+``HardwareClass.iter_hardware()``). Any other class arranges its own
+subtree, which is emitted whole once collected. Emitted subtrees are not kept, so memory
+stays bounded by the largest such subtree instead of the whole inventory.
+"""
+
+import json
+import logging
+from typing import Iterator, Tuple
+
+from lshw.classes import HardwareClass
+from lshw.classes.hardware import Hardware
+from lshw.classes.parallel import SubtreeTask, current_executor
+
+logger = logging.getLogger(__name__)
+
+# iter_events() kinds
+OPEN = 'open'  # node whose children follow, up to the matching CLOSE
+NODE = 'node'  # complete subtree
+CLOSE = 'close'
+
+
+def _expandable(hardware_class):
+    """Whether the children of ``hardware_class`` nodes can be streamed one class at a time."""
+    return (
+        hardware_class.format_data is HardwareClass.format_data
+        and hardware_class._fetch_children is HardwareClass._fetch_children
+    )
+
+
+def iter_events(entity='ComputerSystem', children=True) -> Iterator[Tuple[str, Hardware]]:
+    """
+    Collect ``entity`` as a stream of ``(kind, node)`` events, in output order.
+
+    Must run inside a ``WMIConnection.session()`` (and optionally a
+    ``parallel_collection()``, which collects sibling subtrees ahead of
+    the one being written). The nodes, and their order, are the ones
+    ``format_data(children)`` returns; errors in a child class are logged
+    and skipped, as ``_fetch_children`` does.
+
+    Yields:
+        ``(OPEN, node)`` and later ``(CLOSE, node)`` around the events of
+        its children, or ``(NODE, node)`` for a complete subtree. Opened
+        nodes have no children attached.
+    """
+    hardware_class = HardwareClass.factory(entity)
+    if not (children and _expandable(hardware_class)):
+        for node in hardware_class().format_data(children=children):
+            yield NODE, node
+        return
+
+    yield from _open_nodes(hardware_class, hardware_class().iter_hardware())
+
+
+def _open_nodes(hardware_class, nodes):
+    child_classes = HardwareClass.get_children(hardware_class._entity_)
+    for node in nodes:
+        yield OPEN, node
+
+        # subtrees that cannot be streamed are collected ahead, in the executor
+        opaque = [child_class for child_class in child_classes if not _expandable(child_class)]
+        pending = dict(zip(opaque, current_executor().map(SubtreeTask(child_class) for child_class in opaque)))
+
+        for child_class in child_classes:
+            try:
+                if child_class in pending:
+                    for child in pending[child_class]():
+                        yield NODE, child
+                else:
+                    yield from _open_nodes(child_class, child_class().iter_hardware())
+            except Exception as e:
+                logger.warning(
+                    'Could not get children %s for %s: %s',
+                    child_class.__name__,
+                    hardware_class._entity_,
+                    e,
+                    exc_info=True,
+                )
+
+        yield CLOSE, node
+
+
+class JSONStreamWriter:
+    """
+    Writes the document ``json.dumps([n.to_dict() for n in nodes], indent=2)``
+    would, byte for byte, flushing after every event.
+    """
+
+    _CHILDREN = '\n  "children": []'
+
+    def __init__(self, out):
+        self.out = out
+        # per open array: [indent level of its items, has items, text closing its owner]
+        self._arrays = []
+
+    def _write(self, text):
+        self.out.write(text)
+        self.out.flush()
+
+    def _item(self, text):
+        array = self._arrays[-1]
+        pad = '  ' * array[0]
+        self._write((',\n' if array[1] else '\n') + pad + text.replace('\n', '\n' + pad))
+        array[1] = True
+
+    def _close_array(self):
+        level, has_items, tail = self._arrays.pop()
+        self._write(('\n' + '  ' * (level - 1) + ']' if has_items else ']') + tail)
+
+    def start(self):
+        self._arrays.append([1, False, '\n'])
+        self._write('[')
+
+    def write(self, kind, node):
+        if kind == CLOSE:
+            self._close_array()
+            return
+
+        text = json.dumps(node.to_dict(), indent=2)
+        if kind == NODE:
+            self._item(text)
+            return
+
+        # open the children array; the rest of the object follows it
+        split = text.index(self._CHILDREN) + len(self._CHILDREN) - 2
+        level = self._arrays[-1][0]
+        self._item(text[:split] + '[')
+        self._arrays.append([level + 2, False, text[split + 2 :].replace('\n', '\n' + '  ' * level)])
+
+    def finish(self):
+        self._close_array()
+
+
+class NDJSONWriter:
+    """
+    Writes one compact JSON object per line and per node, parents first.
+
+    Every line holds the ``to_dict()`` fields of one node, without
+    ``children``, plus its ``path`` and its ``parent`` path (None at the
+    top). Paths join the node ids with '/'; a repeated id among siblings
+    gets a '#2', '#3'... suffix, so paths are unique.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self._stack = [('', {})]  # (path, id counts of its children)
+
+    def _line(self, node):
+        parent, seen = self._stack[-1]
+        seen[node.id] = seen.get(node.id, 0) + 1
+        segment = node.id if seen[node.id] == 1 else f'{node.id}#{seen[node.id]}'
+        path = f'{parent}/{segment}'
+
+        data = {'path': path, 'parent': parent or None}
+        data.update((key, value) for key, value in node.to_dict().items() if key != 'children')
+        self.out.write(json.dumps(data, separators=(',', ':')) + '\n')
+        return path
+
+    def _subtree(self, node):
+        self._stack.append((self._line(node), {}))
+        for child in node.children:
+            self._subtree(child)
+        self._stack.pop()
+
+    def start(self):
+        pass
+
+    def write(self, kind, node):
+        if kind == NODE:
+            self._subtree(node)
+        elif kind == OPEN:
+            self._stack.append((self._line(node), {}))
+        else:
+            self._stack.pop()
+        self.out.flush()
+
+    def finish(self):
+        self.out.flush()
+
+
+WRITERS = {'json': JSONStreamWriter, 'ndjson': NDJSONWriter}
+
+
+def write_stream(writer, entity='ComputerSystem', children=True):
+    """Collect ``entity`` and write it with ``writer`` as it is collected."""
+    writer.start()
+    for kind, node in iter_events(entity, children):
+        writer.write(kind, node)
+    writer.finish()
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from lshw.classes.associations import AssociationGraph, reference_id
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+
+def _link(antecedent, dependent):
+    return SimpleNamespace(antecedent=antecedent, dependent=dependent)
+
+
+def test_reference_id():
+    assert reference_id('\\\\PC\\root\\cimv2:Win32_Bus.DeviceID="PCI_BUS_0"') == 'PCI_BUS_0'
+    assert reference_id('Win32_PnPEntity.DeviceID="USB\\\\VID_046D&PID_C52B\\\\6&1"') == 'USB\\VID_046D&PID_C52B\\6&1'
+    assert reference_id("Win32_DiskPartition.DeviceID='Disk #0, Partition #1'") == 'Disk #0, Partition #1'
+    assert reference_id('Win32_LogicalDisk.DeviceID="C:"') == 'C:'
+    assert reference_id(SimpleNamespace(DeviceID='E:')) == 'E:'
+    assert reference_id('no key here') == ''
+    assert reference_id(None) == ''
+
+
+def test_graph_lookups_in_both_directions():
+    graph = AssociationGraph(
+        [
+            _link('Win32_USBController.DeviceID="PCI\\\\HUB_A"', 'Win32_PnPEntity.DeviceID="USB\\\\MOUSE"'),
+            _link('Win32_USBController.DeviceID="PCI\\\\HUB_B"', 'Win32_PnPEntity.DeviceID="USB\\\\DISK"'),
+            _link('Win32_USBController.DeviceID="PCI\\\\HUB_A"', 'Win32_PnPEntity.DeviceID="USB\\\\KEYBOARD"'),
+            _link('', 'Win32_PnPEntity.DeviceID="USB\\\\ORPHAN"'),
+        ]
+    )
+
+    assert len(graph) == 3
+    assert graph.antecedents() == ['PCI\\HUB_A', 'PCI\\HUB_B']
+    assert graph.dependents('PCI\\HUB_A') == ['USB\\MOUSE', 'USB\\KEYBOARD']
+    assert graph.dependents('pci\\hub_a ') == ['USB\\MOUSE', 'USB\\KEYBOARD']
+    assert graph.antecedents('USB\\DISK') == ['PCI\\HUB_B']
+    assert graph.dependents('PCI\\NOPE') == []
+    assert graph.antecedents('USB\\ORPHAN') == []
+
+
+def test_graph_prefers_object_paths_over_referenced_objects():
+    row = SimpleNamespace(
+        antecedent='Win32_DiskPartition.DeviceID="Disk #0, Partition #0"',
+        Antecedent=SimpleNamespace(DeviceID='ignored'),
+        dependent=None,
+        Dependent=SimpleNamespace(DeviceID='C:'),
+    )
+
+    graph = AssociationGraph([row])
+
+    assert graph.dependents('Disk #0, Partition #0') == ['C:']
+
+
+def test_each_association_class_is_parsed_once_per_run(mocker):
+    built = mocker.spy(AssociationGraph, '__init__')
+
+    collect(connection=ReplayWMIConnection(build_fixture(disks=3, usb_devices=3)))
+
+    tables = {
+        'Win32_DeviceBus',
+        'Win32_IDEControllerDevice',
+        'Win32_USBControllerDevice',
+        'Win32_DiskDriveToDiskPartition',
+        'Win32_LogicalDiskToPartition',
+    }
+    assert built.call_count == len(tables)
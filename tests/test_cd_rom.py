@@ -41,10 +41,12 @@ def test_cd_rom_no_media(mock_wmi_connection):
 def test_cd_rom_dev_id(mock_wmi_connection):
     mock_cd = MagicMock()
     mock_cd.PNPDeviceID = 'PNP_SPECIFIC'
+    mock_other = MagicMock()
+    mock_other.PNPDeviceID = 'PNP_OTHER'
 
     def mock_query(wql):
-        if 'PNP_SPECIFIC' in wql:
-            return [mock_cd]
+        if 'FROM Win32_cdromdrive' in wql:
+            return [mock_other, mock_cd]
         return []
 
     mock_wmi_connection.query.side_effect = mock_query
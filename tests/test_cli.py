@@ -1,5 +1,7 @@
 import json
 import logging
+import subprocess
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,6 +17,9 @@ from lshw.__main__ import (
     pretty,
 )
 from lshw.classes.hardware import Hardware
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import plan_collection
 
 
 def test_json_output_serialization(capsys):
@@ -27,7 +32,7 @@ def test_json_output_serialization(capsys):
 
     # Mock HardwareClass factory and instance
     # We need to patch where main imports HardwareClass, or patch the class itself if it was already imported
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         # User requests full system info by default
         mock_instance = MagicMock()
 
@@ -70,7 +75,7 @@ def test_standard_output_generation(capsys):
     # Mock argv (no arguments)
     test_argv = []
 
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         # User requests full system info by default
         mock_instance = MagicMock()
 
@@ -187,7 +192,7 @@ def test_main_class_hw_list(capsys):
 
 def test_main_class_hw_valid(capsys):
     """main dispatches to a single valid hardware class."""
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         hw = Hardware(id='mem0', product='DIMM 16GB')
         mock_instance.format_data.return_value = [hw]
@@ -212,7 +217,7 @@ def test_main_class_hw_access_denied(capsys):
     """main returns class-specific exit code when WMI access is denied."""
     from lshw.classes.hardware_class import wmi
 
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = wmi.x_access_denied('denied')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
@@ -226,7 +231,7 @@ def test_main_class_hw_wmi_error(capsys):
     """main returns class-specific exit code on WMI error."""
     from lshw.classes.hardware_class import wmi
 
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = wmi.x_wmi('WMI error')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
@@ -237,7 +242,7 @@ def test_main_class_hw_wmi_error(capsys):
 
 def test_main_class_hw_type_error(capsys):
     """main returns class-specific exit code on TypeError."""
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = TypeError('bad type')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
@@ -250,7 +255,7 @@ def test_main_system_access_denied(capsys):
     """main returns exit code 13 when full system scan gets access denied."""
     from lshw.classes.hardware_class import wmi
 
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = wmi.x_access_denied('denied')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
@@ -263,18 +268,19 @@ def test_main_system_wmi_error(capsys):
     """main returns exit code 1 on WMI error during full scan."""
     from lshw.classes.hardware_class import wmi
 
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = wmi.x_wmi('WMI error')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
 
         exit_code = main([])
         assert exit_code == 1
+        assert 'There was a critical error getting hardware information' in capsys.readouterr().err
 
 
 def test_main_system_type_error(capsys):
     """main returns exit code 1 on TypeError during full scan."""
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         mock_instance.format_data.side_effect = TypeError('bad')
         mock_hardware_class.factory.return_value = MagicMock(return_value=mock_instance)
@@ -312,7 +318,7 @@ def test_dash_json_flag():
 
 def test_main_defaults_to_sys_argv():
     """main() without argv defaults to sys.argv[1:] patched to empty."""
-    with patch('lshw.__main__.HardwareClass') as mock_hardware_class:
+    with patch('lshw.classes.HardwareClass') as mock_hardware_class:
         mock_instance = MagicMock()
         hw = Hardware(id='test')
         mock_instance.format_data.return_value = [hw]
@@ -321,3 +327,85 @@ def test_main_defaults_to_sys_argv():
         with patch('sys.argv', ['lshw']):
             exit_code = main()
             assert exit_code == ALL_OK
+
+
+def test_plan_collection_prunes_covered_classes():
+    plan = plan_collection(['PhysicalDisk', 'Pci', 'NetworkCard', 'Printer', 'Pci'], with_children=['Pci'])
+
+    assert plan == [('Pci', True), ('Printer', False)]
+
+
+def test_main_collects_several_classes_in_one_run(tmp_path, capsys):
+    path = tmp_path / 'machine.json'
+    path.write_text(json.dumps(build_fixture(disks=2, nics=1, printers=3)))
+    queried = []
+
+    def replay(fixture):
+        connection = ReplayWMIConnection(fixture)
+        queried.append(connection)
+        return connection
+
+    with patch('lshw.classes.replay.ReplayWMIConnection', side_effect=replay):
+        exit_code = main(['--replay', str(path), '-c', 'disk,network,memory', '--with-children', 'disk', '-j'])
+
+    assert exit_code == ALL_OK
+    output = json.loads(capsys.readouterr().out)
+    assert [node['id'] for node in output] == ['disk', 'disk', 'network', 'memory:0']
+    assert output[0]['children']
+    assert not output[2]['children']
+    # unrequested branches are never queried
+    log = ' '.join(map(str, queried[0].log)).lower()
+    assert 'win32_printer' not in log
+    assert 'win32_usbcontrollerdevice' not in log
+
+
+def test_main_with_children_must_be_selected(capsys):
+    assert main(['-c', 'disk', '--with-children', 'network']) == EXIT_USAGE
+    assert '--with-children' in capsys.readouterr().err
+
+
+def test_with_children_requires_class_hw(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(['--with-children'])
+
+    assert exit_info.value.code == EXIT_USAGE
+    assert '--with-children requires -c' in capsys.readouterr().err
+
+
+def test_class_list_loads_no_feature_module():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'lshw', '-c', 'list'],
+        capture_output=True,
+        check=True,
+    )
+    imported = {line.split('|')[-1].strip() for line in result.stderr.decode().splitlines() if '|' in line}
+
+    assert 'memory' in result.stdout.decode()
+    # neither hardware classes nor feature modules (caches, replay, diff, streaming...) nor their dependencies
+    assert not {name for name in imported if name.startswith(('lshw.', 'concurrent.', 'orjson', 'asyncio', 'wmi'))}
+
+
+def test_main_explain_does_not_collect(tmp_path, capsys):
+    path = tmp_path / 'machine.json'
+    path.write_text(json.dumps(build_fixture(disks=2)))
+    assert main(['--replay', str(path), '-c', 'disk', '--with-children', '--profile', 'json']) == ALL_OK
+    profile = tmp_path / 'profile.json'
+    profile.write_text(capsys.readouterr().err)
+
+    with patch('lshw.__main__._collect') as collect:
+        assert main(['--explain', '-c', 'disk', '--with-children']) == ALL_OK
+        assert 'PartitionDisk  x each PhysicalDisk node' in capsys.readouterr().out
+        assert main(['--explain', str(profile), '-c', 'disk', '--with-children', '-j']) == ALL_OK
+        entries = json.loads(capsys.readouterr().out)
+        assert main(['--explain', str(tmp_path / 'missing.json')]) == EXIT_USAGE
+
+    collect.assert_not_called()
+    assert [entry['entity'] for entry in entries] == ['PhysicalDisk', 'PartitionDisk', 'LogicalDisk']
+    assert entries[1]['recorded']['collections'] == 2
+
+
+def test_stream_formats_match_the_writers():
+    from lshw.__main__ import STREAM_FORMATS
+    from lshw.stream import WRITERS
+
+    assert sorted(STREAM_FORMATS) == sorted(WRITERS)
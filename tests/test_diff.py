@@ -0,0 +1,109 @@
+import copy
+import json
+
+import pytest
+
+from lshw.__main__ import main
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+from lshw.diff import apply, diff
+
+
+def _inventory(**sizes):
+    return [node.to_dict() for node in collect(connection=ReplayWMIConnection(build_fixture(**sizes)))]
+
+
+def _node(node_id, children=(), **fields):
+    return {'id': node_id, 'class': 'disk', 'children': list(children), **fields}
+
+
+def test_equal_inventories_have_no_changes():
+    old = _inventory(disks=2, nics=2)
+
+    assert diff(old, copy.deepcopy(old))['changes'] == []
+
+
+@pytest.mark.parametrize(
+    'old_sizes, new_sizes',
+    [
+        ({'disks': 2, 'usb_devices': 2, 'nics': 1}, {'disks': 3, 'usb_devices': 1, 'nics': 2}),
+        ({'disks': 4, 'printers': 3}, {'disks': 1, 'printers': 0}),
+        ({}, {'disks': 2, 'usb_devices': 4, 'nics': 2, 'printers': 2}),
+    ],
+)
+def test_apply_rebuilds_the_new_inventory(old_sizes, new_sizes):
+    old, new = _inventory(**old_sizes), _inventory(**new_sizes)
+
+    patch = diff(old, new)
+
+    assert patch['changes']
+    assert apply(old, patch) == new
+    assert old == _inventory(**old_sizes)
+
+
+def test_small_change_gives_a_small_patch():
+    old = _inventory(disks=4, usb_devices=4, nics=2, printers=2)
+    new = copy.deepcopy(old)
+    new[0]['product'] = 'Renamed'
+
+    patch = diff(old, new)
+
+    assert patch['changes'] == [{'op': 'change', 'path': f'/{old[0]["id"]}', 'set': {'product': 'Renamed'}}]
+    assert len(json.dumps(patch)) * 50 < len(json.dumps(new))
+
+
+def test_renumbered_nodes_are_matched_by_device_id():
+    old = [_node('pc', [_node('disk:0', pnpdeviceid='A', size=1), _node('disk:1', pnpdeviceid='B', size=2)])]
+    new = [_node('pc', [_node('disk:0', pnpdeviceid='B', size=2)])]
+
+    patch = diff(old, new)
+
+    assert patch['changes'] == [
+        {'op': 'remove', 'path': '/pc/disk:0'},
+        {'op': 'change', 'path': '/pc/disk:1', 'set': {'id': 'disk:0'}},
+    ]
+    assert apply(old, patch) == new
+
+
+def test_repeated_ids_reorder_and_unset_fields():
+    old = [_node('pc', [_node('bank', serial='1'), _node('bank', serial='2', size=4)])]
+    new = [_node('pc', [_node('bank', serial='2'), _node('bank', serial='1'), _node('bank', serial='3')])]
+
+    patch = diff(old, new)
+
+    assert {'op': 'order', 'path': '/pc', 'children': ['bank#2', 'bank']} in patch['changes']
+    assert {'op': 'change', 'path': '/pc/bank#2', 'unset': ['size']} in patch['changes']
+    assert apply(old, patch) == new
+
+
+def test_apply_rejects_patches_that_do_not_fit():
+    old = [_node('pc')]
+
+    with pytest.raises(ValueError):
+        apply(old, {'format': 'lshw-delta', 'version': 1, 'changes': [{'op': 'remove', 'path': '/other'}]})
+    with pytest.raises(ValueError):
+        apply(old, {'changes': []})
+
+
+def test_cli_diff_and_delta(tmp_path, capsys):
+    fixture = tmp_path / 'machine.json'
+    fixture.write_text(json.dumps(build_fixture(printers=2)))
+    old = _inventory(printers=1)
+    (tmp_path / 'old.json').write_text(json.dumps(old))
+    (tmp_path / 'new.json').write_text(json.dumps(_inventory(printers=2)))
+
+    assert main(['diff', str(tmp_path / 'old.json'), str(tmp_path / 'new.json'), '--compact']) == 0
+    from_files = json.loads(capsys.readouterr().out)
+    assert main(['--replay', str(fixture), '--delta', str(tmp_path / 'old.json')]) == 0
+    from_run = json.loads(capsys.readouterr().out)
+
+    assert from_files == from_run
+    assert [change['op'] for change in from_run['changes']] == ['add']
+    assert apply(old, from_run) == _inventory(printers=2)
+
+
+def test_cli_delta_errors(tmp_path, capsys):
+    assert main(['--delta', str(tmp_path / 'missing.json')]) == 2
+    assert main(['--delta', str(tmp_path / 'missing.json'), '--stream']) == 2
+    assert main(['diff', str(tmp_path / 'missing.json'), str(tmp_path / 'missing.json')]) == 2
@@ -0,0 +1,78 @@
+from lshw.classes.hardware_class import HardwareClass, WMIConnection
+from lshw.classes.profiler import profiling
+from lshw.classes.query_plan import BATCHED, ONE_SHOT, PER_ROW, PlannedQuery
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+from lshw.explain import add_profile, explain, format_text
+
+
+def _entry(entries, entity):
+    return next(entry for entry in entries if entry['entity'] == entity)
+
+
+def test_explain_walks_the_registry_without_wmi(mock_wmi_connection):
+    entries = explain([('ComputerSystem', True)])
+
+    expected = {'ComputerSystem'} | HardwareClass.get_descendants('ComputerSystem')
+    assert {entry['entity'] for entry in entries} == expected
+    assert [entry['entity'] for entry in entries][:3] == ['ComputerSystem', 'BaseBoard', 'Firmware']
+    assert _entry(entries, 'LogicalDisk')['depth'] == 6
+    assert WMIConnection._instance is None
+    assert not mock_wmi_connection.mock_calls
+
+
+def test_explain_reports_scopes_and_fanout():
+    entries = explain([('Pci', True)])
+
+    partitions = _entry(entries, 'PartitionDisk')
+    assert partitions['parent'] == 'PhysicalDisk'
+    assert partitions['fanout'] == PER_ROW
+    assert [query['scope'] for query in partitions['queries']] == [ONE_SHOT, ONE_SHOT, BATCHED, PER_ROW, PER_ROW]
+    # Pci collects each child class once, whatever its bridges
+    assert _entry(entries, 'Ide')['fanout'] == ONE_SHOT
+
+    text = format_text(entries)
+    assert '  PartitionDisk  x each PhysicalDisk node' in text
+    assert 'per-row ! SELECT DeviceID FROM Win32_diskdrive WHERE DeviceID="<disk>"' in text
+    assert 'Queries: ' in text and '4 per-row (! = N+1)' in text
+
+
+def test_statements_issued_earlier_are_answered_by_the_session_cache():
+    entries = explain([('Pci', True)])
+
+    def prefetch(entity):
+        return next(query for query in _entry(entries, entity)['queries'] if query['table'] == 'Win32_PNPEntity')
+
+    assert prefetch('Ide')['statement'] == prefetch('UsbDevice')['statement']
+    assert not prefetch('Ide')['cached']
+    assert prefetch('UsbDevice')['cached']
+
+
+def test_planned_queries_derive_declarations():
+    from lshw.classes.printer import Printer
+    from lshw.classes.processor import Processor
+
+    processor = Processor()
+    assert processor.planned_queries() == [
+        PlannedQuery('Win32_processor', tuple(processor.properties_to_get), method=True)
+    ]
+    assert [query.statement for query in Printer().planned_queries()] == [
+        'SELECT DeviceID,Name,Caption,DriverName,PortName,Network,Local FROM Win32_Printer'
+    ]
+
+
+def test_add_profile_attaches_recorded_timings():
+    connection = ReplayWMIConnection(build_fixture(disks=3, partitions_per_disk=2))
+    with profiling() as profiler:
+        collect('PhysicalDisk', connection=connection)
+
+    entries = add_profile(explain([('PhysicalDisk', True)]), profiler.report())
+
+    assert _entry(entries, 'PartitionDisk')['recorded']['collections'] == 3
+    assert _entry(entries, 'LogicalDisk')['recorded']['multiplier'] == 2
+    queries = {query['statement']: query for query in _entry(entries, 'PartitionDisk')['queries']}
+    batched = next(query for query in queries.values() if query['scope'] == BATCHED)
+    assert batched['recorded']['calls'] == 1
+    assert batched['recorded']['rows'] == 6
+    assert 'Recorded WMI time:' in format_text(entries)
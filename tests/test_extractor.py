@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from lshw.classes.extractor import RowExtractor, compile_extractor
+from lshw.classes.replay import ReplayRow
+
+
+def test_rows_listing_their_properties_are_read_without_exceptions(mocker):
+    warning = mocker.patch('lshw.classes.extractor.logger.warning')
+    extract = RowExtractor(['DeviceID', 'Name', 'Size'], 'Unknown')
+    rows = [ReplayRow({'deviceid': f'D{index}', 'Name': f'Disk {index}'}) for index in range(3)]
+
+    records = extract(rows)
+
+    assert records == [{'DeviceID': f'D{index}', 'Name': f'Disk {index}', 'Size': 'Unknown'} for index in range(3)]
+    assert list(records[0]) == ['DeviceID', 'Name', 'Size']
+    assert len(extract._plans) == 1
+    warning.assert_called_once_with('WMI rows have no property %s', 'Size')
+
+
+def test_single_absent_and_unusual_properties():
+    assert RowExtractor(['Name'], '')([ReplayRow({'Name': 'A'})]) == [{'Name': 'A'}]
+    assert RowExtractor(['Name'], '')([ReplayRow({'Other': 'A'})]) == [{'Name': ''}]
+    assert RowExtractor(['odd-name', 'class'], '')([ReplayRow({'Odd-Name': 1, 'Class': 2})]) == [
+        {'odd-name': 1, 'class': 2}
+    ]
+
+
+def test_other_rows_are_read_with_a_default(mocker):
+    warning = mocker.patch('lshw.classes.extractor.logger.warning')
+    rows = [SimpleNamespace(Name='A'), SimpleNamespace(Name='B', Size=1)]
+
+    records = RowExtractor(['Name', 'Size'], 'Unknown')(rows)
+
+    assert records == [{'Name': 'A', 'Size': 'Unknown'}, {'Name': 'B', 'Size': 1}]
+    assert warning.call_count == 1
+
+
+def test_listed_but_unreadable_properties_fall_back_to_the_default():
+    class Row:
+        properties = {'Name': None, 'Size': None}  # noqa: RUF012
+        Name = 'A'
+
+        @property
+        def Size(self):  # noqa: N802
+            raise AttributeError('Size')
+
+    assert RowExtractor(['Name', 'Size'], 'Unknown')([Row()]) == [{'Name': 'A', 'Size': 'Unknown'}]
+
+
+def test_extractors_are_shared_per_property_list():
+    assert compile_extractor(('Name',), '') is compile_extractor(('Name',), '')
+    assert compile_extractor(('Name',), '') is not compile_extractor(('Name', 'Size'), '')
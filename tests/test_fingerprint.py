@@ -0,0 +1,82 @@
+import json
+
+from lshw.__main__ import EXIT_UNCHANGED, main
+from lshw.classes.hardware_class import wmi
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.fingerprint import SOURCES, fingerprint
+
+
+def _fingerprint(fixture):
+    return fingerprint(ReplayWMIConnection(fixture))
+
+
+def test_fingerprint_is_stable_and_cheap():
+    connection = ReplayWMIConnection(build_fixture(disks=2, usb_devices=2))
+
+    digest = fingerprint(connection)
+
+    assert len(digest) == 64
+    assert digest == _fingerprint(build_fixture(disks=2, usb_devices=2))
+    assert connection.calls == len(SOURCES)
+
+
+def test_fingerprint_ignores_row_order_and_usage():
+    base = _fingerprint(build_fixture(disks=2))
+    fixture = build_fixture(disks=2)
+    fixture['tables']['Win32_PnPEntity']['rows'].reverse()
+    volumes = fixture['tables']['Win32_LogicalDisk']
+    free_space = volumes['columns'].index('FreeSpace')
+    for row in volumes['rows']:
+        row[free_space] = '1'
+
+    assert _fingerprint(fixture) == base
+
+
+def test_fingerprint_ignores_software_devices_and_removable_volumes():
+    base = _fingerprint(build_fixture(disks=2))
+    fixture = build_fixture(disks=2)
+    for table, values in (
+        ('Win32_PnPEntity', {'PNPDeviceID': 'SWD\\PRINTENUM\\{0001}', 'Name': 'Printer queue'}),
+        ('Win32_PnPEntity', {'PNPDeviceID': 'ROOT\\NET\\0001', 'Name': 'VPN adapter'}),
+        ('Win32_LogicalDisk', {'DeviceID': 'E:', 'DriveType': 2, 'Size': 8000000000}),
+        ('Win32_LogicalDisk', {'DeviceID': 'Z:', 'DriveType': 4, 'Size': 1000000000000}),
+    ):
+        columns = fixture['tables'][table]['columns']
+        fixture['tables'][table]['rows'].append([values.get(column) for column in columns])
+
+    assert _fingerprint(fixture) == base
+
+
+def test_fingerprint_changes_with_the_hardware():
+    base = _fingerprint(build_fixture(disks=2, usb_devices=2))
+
+    assert _fingerprint(build_fixture(disks=3, usb_devices=2)) != base
+    assert _fingerprint(build_fixture(disks=2, usb_devices=3)) != base
+    assert _fingerprint(build_fixture(disks=2, usb_devices=2, partitions_per_disk=3)) != base
+
+
+def test_cli_if_changed(tmp_path, capsys):
+    fixture = tmp_path / 'machine.json'
+    fixture.write_text(json.dumps(build_fixture(printers=2)))
+
+    assert main(['--replay', str(fixture), '--fingerprint']) == 0
+    digest = capsys.readouterr().out.strip()
+    assert digest == _fingerprint(build_fixture(printers=2))
+
+    assert main(['--replay', str(fixture), '-c', 'printer', '-j', '--if-changed', digest]) == EXIT_UNCHANGED
+    assert capsys.readouterr().out == ''
+
+    assert main(['--replay', str(fixture), '-c', 'printer', '-j', '--if-changed', '0' * 64]) == 0
+    assert [node['id'] for node in json.loads(capsys.readouterr().out)] == ['printer:0', 'printer:1']
+
+
+def test_cli_if_changed_collects_when_the_fingerprint_fails(mocker, tmp_path, capsys, caplog):
+    fixture = tmp_path / 'machine.json'
+    fixture.write_text(json.dumps(build_fixture(printers=1)))
+    mocker.patch('lshw.fingerprint.fingerprint', side_effect=wmi.x_wmi('boom'))
+
+    assert main(['--replay', str(fixture), '-c', 'printer', '-j', '--if-changed', '0' * 64]) == 0
+    assert json.loads(capsys.readouterr().out)[0]['id'] == 'printer:0'
+    assert 'Could not compute the hardware fingerprint' in caplog.text
+    assert main(['--replay', str(fixture), '--fingerprint']) == 1
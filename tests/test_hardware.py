@@ -0,0 +1,104 @@
+import copy
+import pickle
+
+import pytest
+
+from benchmarks import memory
+from lshw.classes.hardware import CompactHardware, Hardware
+
+
+def _template():
+    hardware = Hardware(id='disk', class_='disk', claimed=True)
+    hardware.configuration = {'driver': '', 'speed': 'Error getting data'}
+    hardware.capabilities = {'removable': ''}
+    hardware.children = [Hardware(id='child')]
+    hardware.extra = 'dynamic attribute'
+    return hardware
+
+
+def test_copy_matches_deepcopy():
+    template = _template()
+
+    assert copy.deepcopy(template).to_dict() == template.copy().to_dict()
+    assert template.copy().extra == 'dynamic attribute'
+
+
+def test_copy_does_not_share_containers():
+    template = _template()
+
+    item = template.copy()
+    item.configuration['driver'] = 'e1000'
+    item.capabilities['removable'] = True
+    item.children[0].id = 'changed'
+    item.children.append(Hardware())
+
+    assert template.configuration['driver'] == ''
+    assert template.capabilities['removable'] == ''
+    assert [child.id for child in template.children] == ['child']
+
+
+def test_blank_sentinels_clears_placeholders_only():
+    hardware = Hardware(product='Error getting data', vendor='  ', serial='UNKNOWN', version='1.0')
+    hardware.slot = 'Unknown'
+    hardware.width = 64
+
+    hardware.blank_sentinels(('Error getting data', 'Unknown'))
+
+    assert (hardware.product, hardware.vendor, hardware.serial, hardware.slot) == ('', '', '', '')
+    assert (hardware.version, hardware.width) == ('1.0', 64)
+    # fields outside SENTINEL_FIELDS are kept
+    assert hardware.physid == '0'
+
+
+def _tree():
+    root = Hardware(id='root', class_='system', claimed=True, width=64)
+    root.configuration = {'uuid': 'U-1'}
+    leaf = Hardware(id='usb_device', class_='usb', pnpdeviceid='USB\\X')
+    leaf.class_guid = '{guid}'
+    root.children = [leaf, Hardware(id='cpu:0', capabilities={'x86-64': True})]
+    return root
+
+
+def test_compact_to_dict_matches_hardware():
+    tree = _tree()
+    compact = CompactHardware.from_hardware(tree)
+
+    assert compact.to_dict() == tree.to_dict()
+    assert CompactHardware.from_dict(tree.to_dict()) == compact
+    assert compact.children[0].class_guid == '{guid}'
+
+
+def test_compact_containers_are_created_lazily():
+    leaf = CompactHardware(id='leaf')
+    leaf.to_dict()
+
+    assert (leaf._children, leaf._configuration, leaf._capabilities) == (None, None, None)
+
+    leaf.configuration['driver'] = 'usbhub'
+    leaf.children.append(CompactHardware(id='child'))
+
+    assert leaf.to_dict()['configuration'] == {'driver': 'usbhub'}
+    assert [child['id'] for child in leaf.to_dict()['children']] == ['child']
+    assert leaf._capabilities is None
+
+
+def test_compact_keeps_extra_attributes_in_a_slot():
+    node = CompactHardware.from_hardware(_tree()).children[0]
+
+    assert not hasattr(node, '__dict__')
+    assert node._extra == {'class_guid': '{guid}'}
+    assert copy.deepcopy(node).class_guid == pickle.loads(pickle.dumps(node)).class_guid == '{guid}'
+    assert CompactHardware(id='leaf')._extra is None
+    with pytest.raises(AttributeError, match='colour'):
+        assert CompactHardware(id='leaf').colour
+
+
+def test_compact_rejects_unknown_constructor_fields():
+    with pytest.raises(TypeError):
+        CompactHardware(colour='red')
+
+
+def test_compact_nodes_use_less_memory():
+    result = memory.measure(machines=1)
+
+    assert result['compact_bytes_per_node'] < result['hardware_bytes_per_node']
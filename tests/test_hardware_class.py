@@ -1,8 +1,16 @@
+import importlib
+import pkgutil
+import subprocess
+import sys
+import weakref
 from unittest.mock import MagicMock
 
 import pytest
 
-from lshw.classes.hardware_class import HardwareClass
+import lshw.classes
+from lshw.classes.hardware import Hardware
+from lshw.classes.hardware_class import HardwareClass, WMIConnection
+from lshw.classes.wmi_schema import unknown_properties
 
 
 class ConcreteHardware(HardwareClass):
@@ -74,6 +82,80 @@ def test_execute_wql_query(mock_wmi_connection):
     assert hw.hardware_set[0] == mock_item
 
 
+def test_select_by_keys_batches_or_queries(mocker, mock_wmi_connection):
+    """Test keys are sanitized, OR-ed in short statements and fanned back out."""
+    hw = ConcreteHardware()
+    hw.properties_to_get = ['Name']
+    mocker.patch.object(ConcreteHardware, '_WQL_MAX_LENGTH', 100)
+    rows = {f'c{index}:': MagicMock(DeviceID=f'C{index}:') for index in range(6)}
+    mock_wmi_connection.query.side_effect = lambda wql: [row for key, row in rows.items() if f'"{key}"' in wql.lower()]
+
+    result = hw.select_by_keys('Win32_LogicalDisk', 'DeviceID', ['c0:', 'C1:', 'c"2:', 'c3:', 'c4:', 'c5:', 'Z:'])
+
+    queries = [call.args[0] for call in mock_wmi_connection.query.call_args_list]
+    assert queries[0].startswith('SELECT Name,DeviceID FROM Win32_LogicalDisk WHERE DeviceID="c0:" OR ')
+    assert len(queries) > 1
+    assert all(len(wql) <= 100 for wql in queries)
+    assert 'c2:' in ''.join(queries)
+    assert result['C1:'] == [rows['c1:']]
+    assert result['c"2:'] == [rows['c2:']]
+    assert result['Z:'] == []
+    assert len(result) == 7
+
+
+def test_build_wql_select_projects_declared_schema(mock_wmi_connection):
+    """Test each table only gets the properties its schema declares."""
+    hw = ConcreteHardware()
+    hw.properties_to_get = ['DeviceID', 'Name', 'MaxBaudRate', 'AttachedTo']
+    hw._schema_ = {
+        'Win32_SerialPort': ['DeviceID', 'Name', 'MaxBaudRate'],
+        'Win32_POTSModem': ['DeviceID', 'AttachedTo'],
+    }
+
+    assert hw.build_wql_select('Win32_SerialPort') == 'SELECT DeviceID,Name,MaxBaudRate FROM Win32_SerialPort'
+    assert hw.build_wql_select('win32_potsmodem') == 'SELECT DeviceID,AttachedTo FROM win32_potsmodem'
+    with pytest.raises(ValueError, match='No property schema'):
+        hw.build_wql_select('Win32_Printer')
+    hw.properties_to_get = ['Name']
+    with pytest.raises(ValueError, match='No property of Win32_POTSModem'):
+        hw.build_wql_select('Win32_POTSModem')
+
+
+def test_declared_schemas_are_valid():
+    HardwareClass.load()
+    declared = [cls for cls in HardwareClass._entities_.values() if cls._schema_]
+
+    assert {cls._entity_ for cls in declared} >= {'Communication', 'Power'}
+    for cls in declared:
+        hw = cls()
+        for table in cls._schema_:
+            hw._validate_entity(table)
+            assert hw.build_wql_select(table).startswith('SELECT DeviceID,')
+        # a schema only selecting properties_to_get everywhere is a redundant copy of it
+        assert any(hw.projection(table) != hw.properties_to_get for table in cls._schema_)
+
+
+def test_every_planned_query_selects_properties_of_its_table():
+    HardwareClass.load()
+    for cls in HardwareClass._entities_.values():
+        for query in cls().planned_queries():
+            assert not unknown_properties(query.table, query.properties), (cls._entity_, query.statement)
+
+
+def test_selecting_a_property_the_table_lacks_is_rejected(mock_wmi_connection):
+    hw = ConcreteHardware()
+    hw.properties_to_get = ['Name', 'MaxBaudRate']
+    hw.wmi_method = 'Win32_Printer'
+
+    with pytest.raises(ValueError, match='Win32_Printer has no property MaxBaudRate'):
+        hw.build_wql_select('Win32_Printer')
+    with pytest.raises(ValueError, match='has no property MaxBaudRate'):
+        list(hw._iter_rows())
+    with pytest.raises(ValueError, match='No property schema for Win32_Unknown'):
+        hw.projection('Win32_Unknown')
+    mock_wmi_connection.Win32_Printer.assert_not_called()
+
+
 def test_check_values_handles_missing_attributes(mock_wmi_connection):
     """Test that check_values handles missing attributes gracefully (logs warning)."""
     hw = ConcreteHardware()
@@ -144,3 +226,140 @@ def test_baseboard_error_isolation(mocker):
     assert board.serial == 'BOARD1'
     # Verify bios is there (one of the successful children)
     assert any(child.id == 'bios:0' for child in board.children)
+
+
+def test_format_data_leaves_template_untouched(mock_wmi_connection):
+    """Rows are built from copies of self.hardware, with sentinels blanked."""
+
+    class TemplateHardware(HardwareClass):
+        def __init__(self):
+            super().__init__()
+            self.hardware = Hardware(id='item', configuration={'driver': ''})
+            self.hardware_set_to_return = [{'product': 'A'}, {'product': 'Unknown'}]
+
+        def get_hardware(self):
+            pass
+
+        def _populate_hardware(self, item_ret, hw_item):
+            item_ret.product = hw_item['product']
+            item_ret.configuration['driver'] = hw_item['product']
+            return item_ret
+
+    hw = TemplateHardware()
+    items = hw.format_data()
+
+    assert [(item.product, item.configuration['driver'], item.vendor) for item in items] == [
+        ('A', 'A', ''),
+        ('', 'Unknown', ''),
+    ]
+    assert hw.hardware.configuration == {'driver': ''}
+    assert hw.hardware.product == 'Error getting data'
+
+
+class TrackedRow:
+    """WMI row with the properties of a processor that can be weakly referenced."""
+
+    def __init__(self, index):
+        values = {'Name': f'CPU {index}', 'Manufacturer': 'Vendor', 'DataWidth': 64}
+        self.properties = dict.fromkeys(values)
+        self.__dict__.update(values)
+
+
+def _tracked_rows(mock_wmi_connection, count):
+    """Make ``Win32_processor`` return ``count`` fresh rows; returns weak references to them."""
+    refs = []
+
+    def query(properties):
+        rows = [TrackedRow(index) for index in range(count)]
+        refs.extend(weakref.ref(row) for row in rows)
+        return rows
+
+    mock_wmi_connection.Win32_processor.side_effect = query
+    return refs
+
+
+def test_iter_hardware_releases_each_row_once_converted(mock_wmi_connection):
+    from lshw.classes.processor import Processor
+
+    refs = _tracked_rows(mock_wmi_connection, 3)
+    items = Processor().iter_hardware()
+
+    assert next(items).product == 'CPU 0'
+    assert next(items).product == 'CPU 1'
+    # the first row is gone while the last one has not been read yet
+    assert refs[0]() is None
+    assert refs[2]() is not None
+    assert [item.product for item in items] == ['CPU 2']
+    assert all(ref() is None for ref in refs)
+
+
+def test_iter_hardware_releases_rows_inside_a_session(mock_wmi_connection):
+    from lshw.classes.processor import Processor
+
+    refs = _tracked_rows(mock_wmi_connection, 3)
+    with WMIConnection.session():
+        items = Processor().iter_hardware()
+        assert next(items).product == 'CPU 0'
+        assert next(items).product == 'CPU 1'
+        assert refs[0]() is None
+        assert [item.product for item in items] == ['CPU 2']
+        assert all(ref() is None for ref in refs)
+
+
+def test_format_data_keeps_no_rows_or_records(mock_wmi_connection):
+    from lshw.classes.processor import Processor
+
+    refs = _tracked_rows(mock_wmi_connection, 3)
+    processor = Processor()
+    items = processor.format_data()
+
+    assert [item.id for item in items] == ['cpu:0', 'cpu:1', 'cpu:2']
+    assert processor.hardware_set == []
+    assert processor.hardware_set_to_return == []
+    assert all(ref() is None for ref in refs)
+    assert [item.to_dict() for item in Processor().iter_hardware()] == [item.to_dict() for item in items]
+
+
+def test_iter_hardware_of_classes_with_their_own_get_hardware(mock_wmi_connection):
+    from lshw.classes.printer import Printer
+
+    mock_wmi_connection.query.side_effect = lambda wql: [TrackedRow(0)]
+    printer = Printer()
+    items = list(printer.iter_hardware())
+
+    assert [item.to_dict() for item in items] == [item.to_dict() for item in Printer().format_data()]
+    assert printer.hardware_set_to_return == []
+
+
+def test_get_descendants_walks_the_registry():
+    assert HardwareClass.get_descendants('PhysicalDisk') == {'PartitionDisk', 'LogicalDisk'}
+    assert {'Ide', 'PhysicalDisk', 'Usb', 'UsbDevice'} <= HardwareClass.get_descendants('Pci')
+    assert HardwareClass.get_descendants('Printer') == set()
+
+
+def test_module_manifest_matches_registered_classes():
+    for module in pkgutil.iter_modules(lshw.classes.__path__):
+        importlib.import_module(f'lshw.classes.{module.name}')
+
+    registered = {entity: cls.__module__.rsplit('.', 1)[1] for entity, cls in HardwareClass._entities_.items()}
+    assert HardwareClass._modules_ == registered
+
+
+def test_children_order_does_not_depend_on_import_order():
+    code = (
+        'import lshw.classes.usb_device, lshw.classes.printer, lshw.classes.base_board\n'
+        'from lshw.classes.hardware_class import HardwareClass as H\n'
+        'H.load()\n'
+        'print(",".join(H._children_["BaseBoard"]))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True).stdout.decode().strip()
+
+    assert out.split(',') == HardwareClass._children_['BaseBoard']
+
+
+def test_importing_the_registry_loads_no_run_module():
+    code = 'import sys, lshw.classes\nprint(",".join(sorted(m for m in sys.modules if m.startswith("lshw."))))\n'
+    out = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True).stdout.decode().strip()
+
+    run_modules = {'inventory_cache', 'parallel', 'profiler', 'query_plan', 'replay', 'wmi_cache'}
+    assert not {name.rsplit('.', 1)[1] for name in out.split(',')} & run_modules
@@ -22,10 +22,8 @@ def test_ide_basic(mock_wmi_connection):
     mock_ide_secondary.Manufacturer = 'Intel'
 
     def mock_query(wql):
-        if 'PCI\\VEN_8086' in wql:
-            return [mock_ide_primary]
-        if 'PCI\\SECONDARY' in wql:
-            return [mock_ide_secondary]
+        if 'FROM Win32_IDEController' in wql:
+            return [mock_ide_primary, mock_ide_secondary]
         return []
 
     mock_wmi_connection.query.side_effect = mock_query
@@ -36,6 +34,8 @@ def test_ide_basic(mock_wmi_connection):
     assert len(result) == 1
     assert result[0].product == 'Intel IDE'
     assert result[0].pnpdeviceid == 'PCI\\VEN_8086'
+    assert [child.id for child in result[0].children] == ['channel:Y']
+    assert mock_wmi_connection.query.call_count == 1
 
 
 def test_ide_exception(mocker, mock_wmi_connection):
@@ -65,7 +65,7 @@ def test_ide_with_children(mock_wmi_connection):
     def mock_query(wql):
         if 'Win32_PNPEntity' in wql:
             return [mock_pnp_entity]
-        if 'PCI\\VEN_8086' in wql:
+        if 'FROM Win32_IDEController' in wql:
             return [mock_ide_primary]
         return []
 
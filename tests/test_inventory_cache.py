@@ -0,0 +1,139 @@
+import copy
+import json
+
+from lshw.__main__ import main
+from lshw.classes.firmware import Firmware
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.inventory_cache import CACHE_FORMAT, STATIC, InventoryCache
+from lshw.classes.replay import ReplayWMIConnection, call_key, query_key
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+FIXTURE = build_fixture(disks=2, usb_devices=2, nics=2, printers=1)
+
+
+def _run(cache):
+    connection = ReplayWMIConnection(FIXTURE)
+    nodes = collect(connection=connection, cache=cache)
+    return [node.to_dict() for node in nodes], connection
+
+
+def test_second_run_reuses_static_classes(tmp_path):
+    first, cold = _run(InventoryCache(str(tmp_path)))
+    second, warm = _run(InventoryCache(str(tmp_path)))
+
+    assert second == first
+    assert warm.calls < cold.calls
+    # static hardware comes from disk, volatile classes are always queried
+    assert call_key('Win32_bios', ['Manufacturer', 'BIOSVersion', 'ReleaseDate', 'SerialNumber']) not in warm.log
+    assert any('win32_networkadapter' in key.lower() for key in warm.log)
+    assert any('win32_logicaldisk' in key.lower() for key in warm.log)
+    assert (tmp_path / 'Firmware.json').exists()
+    assert not (tmp_path / 'LogicalDisk.json').exists()
+
+
+def test_host_name_and_cpu_count_are_never_cached(tmp_path):
+    _run(InventoryCache(str(tmp_path)))
+    renamed = copy.deepcopy(FIXTURE)
+    table = renamed['tables']['Win32_ComputerSystem']
+    for row in table['rows']:
+        row[table['columns'].index('Name')] = 'RENAMED'
+        row[table['columns'].index('NumberOfProcessors')] = 64
+
+    connection = ReplayWMIConnection(renamed)
+    (root,) = collect(connection=connection, cache=InventoryCache(str(tmp_path)))
+
+    assert root.id == 'RENAMED'
+    assert root.configuration['cpus'] == 64
+    # chassis, UUID and serial number still come from disk
+    assert not any(key.startswith(('win32_systemenclosure', 'win32_computersystemproduct')) for key in connection.log)
+
+
+def test_ide_keeps_only_its_controllers_on_disk(tmp_path):
+    _run(InventoryCache(str(tmp_path)))
+
+    calls = json.loads((tmp_path / 'Ide.json').read_text(encoding='utf-8'))['calls']
+    assert list(calls) == [
+        query_key('SELECT Manufacturer,Caption,Description,DeviceID,PNPDeviceID FROM Win32_IDEController')
+    ]
+
+
+def test_values_shared_by_classes_never_reach_disk(tmp_path):
+    cache = InventoryCache(str(tmp_path))
+    with WMIConnection.session(ReplayWMIConnection(FIXTURE), cache):
+        firmware = Firmware()  # the first class to build them has a lifetime
+        firmware.associations('Win32_DeviceBus')
+        firmware.lookup('Win32_PNPEntity', 'PNPDeviceID', 'PCI\\NONE')
+
+    assert not (tmp_path / 'Firmware.json').exists()
+
+
+def test_expired_and_max_age_results_are_queried_again(tmp_path):
+    now = [1000.0]
+    _, cold = _run(InventoryCache(str(tmp_path), clock=lambda: now[0]))
+
+    now[0] += STATIC + 1
+    _, expired = _run(InventoryCache(str(tmp_path), clock=lambda: now[0]))
+    assert expired.calls == cold.calls
+
+    now[0] += 60
+    _, capped = _run(InventoryCache(str(tmp_path), max_age=30, clock=lambda: now[0]))
+    assert capped.calls == cold.calls
+
+
+def test_max_age_zero_refreshes_the_cache(tmp_path):
+    cache = InventoryCache(str(tmp_path), clock=lambda: 1000.0)
+    _run(cache)
+
+    _, refreshed = _run(InventoryCache(str(tmp_path), max_age=0, clock=lambda: 2000.0))
+    data = json.loads((tmp_path / 'Firmware.json').read_text())
+
+    assert refreshed.calls == _run(None)[1].calls
+    assert data['format'] == CACHE_FORMAT
+    assert {entry['time'] for entry in data['calls'].values()} == {2000.0}
+
+
+def test_unreadable_cache_files_are_ignored(tmp_path):
+    (tmp_path / 'Firmware.json').write_text('{"format": "lshw-inventory-cache", "calls"')
+    (tmp_path / 'Processor.json').write_text('[]')
+
+    nodes, _ = _run(InventoryCache(str(tmp_path)))
+
+    assert nodes == _run(None)[0]
+    assert json.loads((tmp_path / 'Firmware.json').read_text())['entity'] == 'Firmware'
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith('.')] == []
+
+
+def test_write_errors_do_not_fail_the_run(tmp_path, caplog):
+    blocker = tmp_path / 'cache'
+    blocker.write_text('not a directory')
+
+    nodes, _ = _run(InventoryCache(str(blocker)))
+
+    assert nodes == _run(None)[0]
+    assert 'Could not write the inventory cache' in caplog.text
+
+
+def test_cli_cache_dir(tmp_path, capsys):
+    fixture = tmp_path / 'machine.json'
+    fixture.write_text(json.dumps(FIXTURE))
+    cache_dir = tmp_path / 'cache'
+
+    assert main(['--replay', str(fixture), '--cache-dir', str(cache_dir), '-c', 'bios', '-j']) == 0
+    first = capsys.readouterr().out
+    assert main(['--replay', str(fixture), '--cache-dir', str(cache_dir), '-c', 'bios', '-j']) == 0
+
+    assert capsys.readouterr().out == first
+    assert sorted(path.name for path in cache_dir.iterdir()) == ['Firmware.json']
+
+
+def test_cli_max_age_uses_the_default_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    fixture = tmp_path / 'machine.json'
+    fixture.write_text(json.dumps(FIXTURE))
+
+    assert main(['--replay', str(fixture), '--max-age', '60', '-c', 'bios', '--record', str(tmp_path / 'r.json')]) == 0
+    assert not (tmp_path / 'lshw').exists()
+
+    assert main(['--replay', str(fixture), '--max-age', '60', '-c', 'bios']) == 0
+    assert (tmp_path / 'lshw' / 'Firmware.json').exists()
@@ -0,0 +1,179 @@
+import copy
+
+import pytest
+
+from lshw import live
+from lshw.classes.replay import ReplayRow, ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+from lshw.live import CREATION, DELETION, MODIFICATION, HardwareEvent, LiveInventory, WMIEventSource
+
+
+def _tree(fixture):
+    return collect(connection=ReplayWMIConnection(fixture))
+
+
+def _expected(fixture):
+    return [node.to_dict() for node in _tree(fixture)]
+
+
+def _row(fixture, table, index=-1):
+    return ReplayWMIConnection(fixture).table(table)[index]
+
+
+def _set(fixture, table, index, **values):
+    fixture = copy.deepcopy(fixture)
+    data = fixture['tables'][table]
+    for column, value in values.items():
+        data['rows'][index][data['columns'].index(column)] = value
+    return fixture
+
+
+def _drop(fixture, table, column, value):
+    fixture = copy.deepcopy(fixture)
+    data = fixture['tables'][table]
+    position = data['columns'].index(column)
+    data['rows'] = [row for row in data['rows'] if value not in row[position]]
+    return fixture
+
+
+def _live(before, after):
+    connection = ReplayWMIConnection(after)
+    return LiveInventory(_tree(before), connection), connection
+
+
+def test_usb_device_plugged_in():
+    before, after = build_fixture(usb_devices=2), build_fixture(usb_devices=3)
+    inventory, connection = _live(before, after)
+
+    assert inventory.apply(
+        HardwareEvent(CREATION, 'Win32_USBControllerDevice', _row(after, 'Win32_USBControllerDevice'))
+    )
+
+    assert inventory.to_dict() == _expected(after)
+    full = ReplayWMIConnection(after)
+    collect(connection=full)
+    assert connection.calls <= 2 < full.calls
+
+
+def test_usb_device_unplugged():
+    before, after = build_fixture(usb_devices=3), build_fixture(usb_devices=2)
+    inventory, _ = _live(before, after)
+    device = _row(before, 'Win32_PnPEntity')
+
+    assert inventory.apply(HardwareEvent(DELETION, 'Win32_PnPEntity', device))
+    assert inventory.to_dict() == _expected(after)
+
+    # the association event that follows finds the tree already up to date
+    link = _row(before, 'Win32_USBControllerDevice')
+    assert inventory.apply(HardwareEvent(DELETION, 'Win32_USBControllerDevice', link))
+    assert inventory.to_dict() == _expected(after)
+
+
+def test_usb_device_modified():
+    before = build_fixture(usb_devices=2)
+    after = _set(before, 'Win32_PnPEntity', -1, Description='USB Composite Keyboard')
+    inventory, _ = _live(before, after)
+
+    assert inventory.apply(HardwareEvent(MODIFICATION, 'Win32_PnPEntity', _row(after, 'Win32_PnPEntity')))
+
+    assert inventory.to_dict() == _expected(after)
+    assert inventory.to_dict() != _expected(before)
+
+
+def test_volume_modified_without_querying_wmi():
+    before = build_fixture(disks=2)
+    after = _set(before, 'Win32_LogicalDisk', 0, VolumeName='Backup')
+    inventory, connection = _live(before, after)
+
+    assert inventory.apply(HardwareEvent(MODIFICATION, 'Win32_LogicalDisk', _row(after, 'Win32_LogicalDisk', 0)))
+
+    assert inventory.to_dict() == _expected(after)
+    assert connection.calls == 0
+
+
+def test_volume_mounted_and_removed():
+    mounted = build_fixture(disks=2)
+    unmounted = _drop(
+        _drop(mounted, 'Win32_LogicalDisk', 'DeviceID', 'D:'), 'Win32_LogicalDiskToPartition', 'Dependent', 'D:'
+    )
+    volume = _row(mounted, 'Win32_LogicalDisk', 1)
+
+    inventory, _ = _live(unmounted, mounted)
+    assert inventory.apply(HardwareEvent(CREATION, 'Win32_LogicalDisk', volume))
+    assert inventory.to_dict() == _expected(mounted)
+
+    inventory, connection = _live(mounted, unmounted)
+    assert inventory.apply(HardwareEvent(DELETION, 'Win32_LogicalDisk', volume))
+    assert inventory.to_dict() == _expected(unmounted)
+    assert connection.calls == 0
+
+
+@pytest.mark.parametrize(('kind', 'before', 'after'), [(CREATION, 1, 2), (DELETION, 2, 1)])
+def test_network_adapter_added_and_removed(kind, before, after):
+    before, after = build_fixture(nics=before), build_fixture(nics=after)
+    adapter = _row(build_fixture(nics=2), 'Win32_NetworkAdapter')
+    inventory, _ = _live(before, after)
+
+    assert inventory.apply(HardwareEvent(kind, 'Win32_NetworkAdapter', adapter))
+
+    assert inventory.to_dict() == _expected(after)
+
+
+def test_network_link_change_replaces_the_adapter():
+    before = build_fixture(nics=2)
+    after = _set(before, 'Win32_NetworkAdapter', 0, NetConnectionStatus=7)
+    inventory, _ = _live(before, after)
+
+    assert inventory.apply(HardwareEvent(MODIFICATION, 'Win32_NetworkAdapter', _row(after, 'Win32_NetworkAdapter', 0)))
+
+    assert inventory.to_dict() == _expected(after)
+    assert inventory.to_dict() != _expected(before)
+
+
+def test_unrelated_events_leave_the_tree_alone():
+    fixture = build_fixture()
+    inventory, _ = _live(fixture, fixture)
+    expected = _expected(fixture)
+
+    assert not inventory.apply(HardwareEvent(CREATION, 'Win32_Printer', _row(fixture, 'Win32_Printer')))
+    assert not inventory.apply(HardwareEvent(DELETION, 'Win32_PnPEntity', ReplayRow({'PNPDeviceID': 'USB\\NOPE'})))
+    assert not inventory.apply(
+        HardwareEvent(CREATION, 'Win32_USBControllerDevice', ReplayRow({'Antecedent': '', 'Dependent': ''}))
+    )
+    assert inventory.to_dict() == expected
+
+
+def test_follow_reports_changes(mocker):
+    before, after = build_fixture(usb_devices=1), build_fixture(usb_devices=2)
+    inventory, _ = _live(before, after)
+    callback = mocker.Mock()
+    events = [
+        HardwareEvent(CREATION, 'Win32_PnPEntity', _row(after, 'Win32_PnPEntity')),
+        HardwareEvent(CREATION, 'Win32_USBControllerDevice', _row(after, 'Win32_USBControllerDevice')),
+    ]
+
+    inventory.follow(events, callback)
+
+    callback.assert_called_once_with(events[1])
+    assert inventory.to_dict() == _expected(after)
+
+
+def test_wmi_event_source(mocker):
+    timed_out = type('x_wmi_timed_out', (Exception,), {})
+    mocker.patch.object(live.wmi, 'x_wmi_timed_out', timed_out, create=True)
+    plugged = mocker.Mock(event_type=CREATION)
+    connection = mocker.Mock()
+    connection.watch_for.side_effect = lambda **kwargs: mocker.Mock(
+        side_effect=[plugged] if kwargs['wmi_class'] == 'Win32_PnPEntity' else timed_out
+    )
+    source = WMIEventSource(['Win32_PnPEntity', 'Win32_LogicalDisk'], connection=connection, timeout=0.1)
+
+    events = iter(source)
+    assert next(events) == HardwareEvent(CREATION, 'Win32_PnPEntity', plugged)
+    source.close()
+    assert list(events) == []
+    connection.watch_for.assert_any_call(notification_type='Operation', wmi_class='Win32_LogicalDisk', delay_secs=1)
+
+    with pytest.raises(ValueError, match='Unauthorized WMI entity'):
+        WMIEventSource(['Win32_Process'])
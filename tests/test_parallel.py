@@ -0,0 +1,361 @@
+import asyncio
+import json
+import re
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.parallel import GuardedExecutor, SubtreeExecutor, current_executor, parallel_collection
+from lshw.collector import collect, collect_async, collect_classes
+
+
+class FakeWMIConnection:
+    """Thread-safe stand-in for wmi.WMI() serving canned rows per WMI class."""
+
+    def __init__(self, tables):
+        self._tables = {name.lower(): rows for name, rows in tables.items()}
+        self._lock = threading.Lock()
+        self.threads = set()
+
+    def _rows(self, table):
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+        return list(self._tables.get(table.lower(), []))
+
+    def query(self, wql):
+        table = re.search(r'FROM\s+(\w+)', wql).group(1)
+        rows = self._rows(table)
+        where = re.search(r'WHERE\s+(\w+)="([^"]*)"', wql)
+        if where:
+            prop, value = where.groups()
+            rows = [row for row in rows if str(getattr(row, prop, '')).lower() == value.lower()]
+        return rows
+
+    def __getattr__(self, name):
+        if name.lower().startswith('win32_'):
+            return lambda properties=None, **kwargs: self._rows(name)
+        raise AttributeError(name)
+
+
+def _fake_tables():
+    return {
+        'Win32_ComputerSystem': [
+            SimpleNamespace(Model='M', Name='PC', Description='AT/AT', Manufacturer='ACME', NumberOfProcessors=1)
+        ],
+        'Win32_SystemEnclosure': [SimpleNamespace(ChassisTypes=[3])],
+        'Win32_ComputerSystemProduct': [SimpleNamespace(UUID='U-1', IdentifyingNumber='SN-1')],
+        'Win32_BaseBoard': [SimpleNamespace(Model='B', SerialNumber='BSN', Manufacturer='ACME', Product='Board')],
+        'Win32_BIOS': [SimpleNamespace(Manufacturer='AMI', BIOSVersion=['1.0'], ReleaseDate='2020', SerialNumber='X')],
+        'Win32_Processor': [
+            SimpleNamespace(
+                Manufacturer='Intel',
+                Name=f'CPU {index}',
+                Description='x64',
+                SocketDesignation=f'S{index}',
+                DataWidth=64,
+                MaxClockSpeed=3000,
+            )
+            for index in range(2)
+        ],
+        'Win32_CacheMemory': [
+            SimpleNamespace(DeviceID='Cache 0', InstalledSize=32, Level=3, Purpose='L1', Status='OK')
+        ],
+        'Win32_PhysicalMemory': [
+            SimpleNamespace(Tag=f'Physical Memory {index}', DeviceLocator=f'DIMM{index}', Capacity=8, Speed=3200)
+            for index in range(4)
+        ],
+        'Win32_Bus': [SimpleNamespace(Caption='PCI Bus', Description='PCI Bus', DeviceID='PCI_BUS_0')],
+        'Win32_NetworkAdapter': [
+            SimpleNamespace(
+                Description=f'NIC {index}', Manufacturer='Intel', PNPDeviceID=f'PCI\\NIC_{index}', Index=index
+            )
+            for index in range(3)
+        ],
+        'Win32_VideoController': [SimpleNamespace(Description='GPU', VideoProcessor='GPU', PNPDeviceID='PCI\\GPU')],
+        'Win32_USBController': [SimpleNamespace(PNPDeviceID='PCI\\USB', Description='USB', Manufacturer='Intel')],
+        'Win32_DiskDrive': [
+            SimpleNamespace(
+                Caption=f'Disk {index}',
+                Description='Disk drive',
+                DeviceID=f'\\\\.\\PHYSICALDRIVE{index}',
+                Index=index,
+                Manufacturer='WD',
+                PNPDeviceID=f'SCSI\\DISK_{index}',
+                Size='1000',
+                SerialNumber=f'D{index}',
+            )
+            for index in range(2)
+        ],
+        'Win32_Printer': [
+            SimpleNamespace(DeviceID=f'P{index}', Name=f'Printer {index}', DriverName='HP Driver') for index in range(3)
+        ],
+    }
+
+
+def _as_json(nodes):
+    return json.dumps([node.to_dict() for node in nodes], sort_keys=False)
+
+
+def test_executor_is_serial_by_default():
+    assert not current_executor().concurrent
+    calls = []
+    getters = SubtreeExecutor().map([lambda: calls.append(1) or 'a'])
+
+    assert calls == []
+    assert [get() for get in getters] == ['a']
+
+
+def test_executor_keeps_submission_order_and_surfaces_errors():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def task(value):
+        def run():
+            barrier.wait()  # only passes if the three tasks run at the same time
+            if value == 'boom':
+                raise KeyError(value)
+            return value
+
+        return run
+
+    getters = SubtreeExecutor(jobs=3).map([task('a'), task('boom'), task('c')])
+
+    assert getters[0]() == 'a'
+    with pytest.raises(KeyError):
+        getters[1]()
+    assert getters[2]() == 'c'
+
+
+def test_parallel_collection_is_scoped():
+    with parallel_collection(jobs=4) as executor:
+        assert current_executor() is executor
+        assert executor.jobs == 4
+
+    assert not current_executor().concurrent
+
+
+def test_parallel_inventory_matches_serial(monkeypatch):
+    """Full inventory through a thread-safe fake: same tree, several worker threads."""
+    initialized = []
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: initialized.append(threading.get_ident()))
+
+    serial_connection = FakeWMIConnection(_fake_tables())
+    serial = collect('ComputerSystem', children=True, connection=serial_connection)
+
+    parallel_connection = FakeWMIConnection(_fake_tables())
+    parallel = collect('ComputerSystem', children=True, jobs=4, connection=parallel_connection)
+
+    assert _as_json(parallel) == _as_json(serial)
+    assert 1 < len(parallel_connection.threads) <= 4 + 1
+    assert len(serial_connection.threads) == 1
+    assert 0 < len(initialized) <= 4
+
+
+def test_nested_fanouts_use_idle_workers_of_the_shared_pool():
+    executor = SubtreeExecutor(jobs=3)
+    barrier = threading.Barrier(3, timeout=5)
+    threads = set()
+
+    def leaf():
+        threads.add(threading.current_thread().name)
+        barrier.wait()  # only passes if the three leaves run at the same time
+        return 'leaf'
+
+    def branch():
+        return [get() for get in executor.map([leaf, leaf, leaf])]
+
+    try:
+        results = [get() for get in executor.map([branch, lambda: 'other'])]
+    finally:
+        executor.shutdown()
+
+    assert results == [['leaf'] * 3, 'other']
+    assert len(threads) == 3
+
+
+def test_nested_fanouts_never_exceed_the_pool():
+    executor = SubtreeExecutor(jobs=2)
+    threads = set()
+
+    def leaf():
+        threads.add(threading.current_thread().name)
+        return threading.get_ident()
+
+    def branch():
+        return [get() for get in executor.map([leaf, leaf, leaf])]
+
+    try:
+        results = [get() for get in executor.map([branch, branch, branch])]
+    finally:
+        executor.shutdown()
+
+    assert len(results) == 3 and all(len(idents) == 3 for idents in results)
+    assert len(threads) <= 2
+    assert threading.current_thread().name not in threads
+
+
+def test_collect_classes_keeps_selection_order(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+    classes = ['Printer', 'PhysicalMemory', 'Processor']
+
+    serial = collect_classes(classes, connection=FakeWMIConnection(_fake_tables()))
+    parallel = collect_classes(classes, jobs=3, connection=FakeWMIConnection(_fake_tables()))
+
+    assert _as_json(parallel) == _as_json(serial)
+    assert [node.id.split(':')[0] for node in serial] == ['printer'] * 3 + ['memory', 'cpu', 'cpu']
+
+
+def test_worker_threads_get_their_own_connection(mock_wmi_connection):
+    """Outside the main thread the singleton is never shared."""
+
+    def task():
+        return WMIConnection.get_instance()
+
+    getters = SubtreeExecutor(jobs=2, initializer=WMIConnection.initialize_thread).map([task, task])
+
+    assert [get() for get in getters] == [mock_wmi_connection, mock_wmi_connection]
+    assert WMIConnection._instance is None
+
+
+class HangingWMIConnection(FakeWMIConnection):
+    """Fake whose printer provider blocks until ``release`` is set."""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.release = threading.Event()
+
+    def _rows(self, table):
+        if table.lower() == 'win32_printer':
+            self.release.wait(10)
+        return super()._rows(table)
+
+
+def _entities(node):
+    yield node.id
+    for child in node.children or []:
+        yield from _entities(child)
+
+
+def test_async_inventory_matches_sync(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+
+    serial = collect('ComputerSystem', children=True, connection=FakeWMIConnection(_fake_tables()))
+    collected = asyncio.run(collect_async(['ComputerSystem'], jobs=3, connection=FakeWMIConnection(_fake_tables())))
+
+    assert _as_json(collected) == _as_json(serial)
+
+
+def test_async_keeps_class_order(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+
+    collected = asyncio.run(
+        collect_async(['Printer', 'Processor'], children=False, connection=FakeWMIConnection(_fake_tables()))
+    )
+
+    assert [node.id.split(':')[0] for node in collected] == ['printer'] * 3 + ['cpu'] * 2
+
+
+def test_async_hung_provider_is_skipped_after_its_timeout(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+    connection = HangingWMIConnection(_fake_tables())
+
+    try:
+        collected = asyncio.run(collect_async(['ComputerSystem'], timeouts={'Printer': 0.2}, connection=connection))
+    finally:
+        connection.release.set()
+
+    ids = list(_entities(collected[0]))
+    assert not any(node_id.startswith('printer') for node_id in ids)
+    assert any(node_id.startswith('cpu') for node_id in ids)
+
+
+def test_async_cancellation_skips_pending_collectors(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+    connection = HangingWMIConnection(_fake_tables())
+
+    async def run():
+        task = asyncio.ensure_future(collect_async(['Printer', 'Processor'], jobs=1, connection=connection))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(asyncio.wait_for(run(), 5))
+    finally:
+        connection.release.set()
+
+    assert current_executor() is not None and not current_executor().concurrent
+    assert WMIConnection._session is None
+
+
+def test_guarded_executor_drops_slow_subtrees():
+    release = threading.Event()
+    executor = GuardedExecutor(jobs=2, timeout=0.1)
+
+    getters = executor.map([lambda: release.wait(5) or ['slow'], lambda: ['fast']])
+
+    try:
+        assert getters[0]() == []
+        assert getters[1]() == ['fast']
+    finally:
+        release.set()
+
+
+class _SlowTask:
+    entity = 'Slow'
+
+    def __init__(self, release):
+        self.release = release
+
+    def __call__(self):
+        return self.release.wait(5) or ['slow']
+
+
+def test_guarded_fanouts_share_one_bounded_pool():
+    release = threading.Event()
+    executor = GuardedExecutor(jobs=2, timeouts={'Slow': 0.1})
+    threads = set()
+
+    def leaf():
+        threads.add(threading.current_thread())
+        return 'leaf'
+
+    def branch():
+        threads.add(threading.current_thread())
+        return [get() for get in executor.map([leaf, leaf, leaf])]
+
+    try:
+        getters = executor.map([_SlowTask(release), branch, branch, branch])
+        assert getters[0]() == []
+        assert [get() for get in getters[1:]] == [['leaf'] * 3] * 3
+    finally:
+        release.set()
+        executor.shutdown()
+
+    # the abandoned task kept its worker: no thread was started to replace it
+    assert len(threads) == 1
+
+
+def test_overlapping_async_inventories_run_one_after_the_other(monkeypatch):
+    monkeypatch.setattr(WMIConnection, 'initialize_thread', lambda: None)
+    expected = _as_json(collect('ComputerSystem', children=True, connection=FakeWMIConnection(_fake_tables())))
+
+    async def both():
+        return await asyncio.gather(
+            collect_async(['ComputerSystem'], connection=FakeWMIConnection(_fake_tables())),
+            collect_async(['ComputerSystem'], connection=FakeWMIConnection(_fake_tables())),
+        )
+
+    first, second = asyncio.run(both())
+
+    assert _as_json(first) == _as_json(second) == expected
+    assert not current_executor().concurrent
+    assert WMIConnection._session is None
+    assert _as_json(collect('ComputerSystem', children=True, connection=FakeWMIConnection(_fake_tables()))) == expected
+
+
+def test_async_inventory_refuses_to_run_inside_another_collection():
+    with parallel_collection(jobs=2), pytest.raises(RuntimeError):
+        asyncio.run(collect_async(['Printer'], connection=FakeWMIConnection(_fake_tables())))
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from lshw.classes.graphic_card import GraphicCard
+from lshw.classes.hardware import Hardware
+from lshw.classes.network_card import NetworkCard
+from lshw.classes.pci import Pci
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+
+def _bus(device_id):
+    return SimpleNamespace(Caption='PCI Bus', Description='PCI Bus', DeviceID=device_id)
+
+
+def _link(bus, pnp_id):
+    escaped = pnp_id.replace('\\', '\\\\')
+    return SimpleNamespace(
+        antecedent=f'\\\\PC\\root\\cimv2:Win32_Bus.DeviceID="{bus}"',
+        dependent=f'\\\\PC\\root\\cimv2:Win32_PnPEntity.DeviceID="{escaped}"',
+    )
+
+
+def test_pci_basic(mock_wmi_connection):
+    mock_wmi_connection.Win32_Bus.return_value = [_bus('PCI_BUS_0'), _bus('ACPI_BUS_0')]
+
+    (container,) = Pci().format_data()
+
+    assert container.id == 'pci'
+    assert container.children == []
+
+
+def test_pci_collects_each_child_class_once(mocker, mock_wmi_connection):
+    mock_wmi_connection.Win32_Bus.return_value = [_bus('ACPI_BUS_0'), _bus('PCI_BUS_0'), _bus('PCI_BUS_1')]
+    mock_wmi_connection.Win32_DeviceBus.return_value = [_link('PCI_BUS_1', 'PCI\\VEN_8086&DEV_15BC\\3&0')]
+    nic = Hardware(id='network', pnpdeviceid='PCI\\VEN_8086&DEV_15BC\\3&0')
+    gpu = Hardware(id='display', pnpdeviceid='PCI\\VEN_10DE\\4&0')
+    nics = mocker.patch.object(NetworkCard, 'format_data', return_value=[nic])
+    gpus = mocker.patch.object(GraphicCard, 'format_data', return_value=[gpu])
+
+    (container,) = Pci().format_data(children=True)
+
+    nics.assert_called_once()
+    gpus.assert_called_once()
+    acpi, pci0, pci1 = container.children[:3]
+    assert acpi.children == []
+    # unknown bus: first PCI bridge
+    assert [child.id for child in pci0.children] == ['display']
+    assert [child.id for child in pci1.children] == ['network']
+
+
+def test_pci_without_device_buses_uses_first_bridge(mocker, mock_wmi_connection, caplog):
+    mock_wmi_connection.Win32_Bus.return_value = [_bus('PCI_BUS_0'), _bus('PCI_BUS_1')]
+    mock_wmi_connection.Win32_DeviceBus.side_effect = AttributeError('Win32_DeviceBus')
+    mocker.patch.object(GraphicCard, 'format_data', return_value=[Hardware(id='display', pnpdeviceid='PCI\\GPU')])
+
+    (container,) = Pci().format_data(children=True)
+
+    assert [child.id for child in container.children[0].children] == ['display']
+    assert container.children[1].children == []
+    assert 'Could not get device buses' in caplog.text
+
+
+def test_full_inventory_does_not_grow_with_bus_count():
+    def devices(buses):
+        nodes = collect(connection=ReplayWMIConnection(build_fixture(disks=2, nics=3, buses=buses)))
+        (container,) = [node for node in nodes[0].children[0].children if node.id == 'pci']
+        return [child.pnpdeviceid for bridge in container.children for child in bridge.children]
+
+    assert sorted(devices(2)) == sorted(devices(16))
+    assert len(devices(16)) == len(set(devices(16)))
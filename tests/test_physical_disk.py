@@ -30,9 +30,9 @@ def test_disk_duplication(mock_wmi_connection):
     mock_ide.DeviceID = 'PCI\\VEN_8086&DEV_7111&SUBSYS_00000000&REV_01\\3&267A6103&0&39'
 
     def mock_query(wql):
-        if 'Win32_IDEController' in wql and 'PCI\\VEN' in wql:
+        if 'FROM Win32_IDEController' in wql:
             return [mock_ide]
-        if 'Win32_PNPEntity' in wql and 'IDE\\DISK' in wql:
+        if 'Win32_PNPEntity' in wql:
             mock_disk_entity = MagicMock()
             mock_disk_entity.PNPDeviceID = (
                 'IDE\\DISK_VBOX_HARDDISK___________________________1.0_____\\4&29D9344&0&0.0.0'
@@ -180,11 +180,14 @@ def test_physical_disk_dev_id_filtering(mock_wmi_connection):
     mock_disk.Manufacturer = 'M'
     mock_disk.SerialNumber = 'SN-SPECIFIC'
 
-    # When dev_id is provided, get_hardware uses execute_wql_query
-    # and build_wql_select. We need to mock query() for the WQL string.
+    mock_other = MagicMock()
+    mock_other.PNPDeviceID = 'PNP_OTHER'
+
+    # When dev_id is provided, get_hardware looks the disk up in the
+    # prefetched Win32_diskdrive rows instead of issuing a LIKE query.
     def mock_query(wql):
-        if 'WHERE PNPDeviceID LIKE "%PNP_SPECIFIC%"' in wql:
-            return [mock_disk]
+        if wql.startswith('SELECT') and 'FROM Win32_diskdrive' in wql and 'WHERE' not in wql:
+            return [mock_other, mock_disk]
         return []
 
     mock_wmi_connection.query.side_effect = mock_query
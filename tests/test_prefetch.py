@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+from lshw.classes.hardware_class import HardwareClass, WMIConnection
+from lshw.classes.physical_disk import PhysicalDisk
+from lshw.classes.prefetch import RowIndex, normalize_device_id
+from lshw.classes.usb_device import UsbDevice
+
+
+def _row(**props):
+    row = MagicMock()
+    for name, value in props.items():
+        setattr(row, name, value)
+    return row
+
+
+def test_normalize_device_id():
+    assert normalize_device_id(' USB\\\\VID_1234\\5 ') == 'usbvid_12345'
+    assert normalize_device_id(None) == ''
+
+
+def test_row_index_exact_and_partial_lookups():
+    first = _row(PNPDeviceID='USB\\VID_1\\A')
+    second = _row(PNPDeviceID='USB\\VID_2\\B')
+    index = RowIndex([first, second, _row(PNPDeviceID=None)], 'PNPDeviceID')
+
+    assert len(index) == 3
+    assert index.get('usb\\\\vid_1\\a') == [first]
+    assert index.get('USB\\VID_3') == []
+    assert index.search('VID_') == [first, second]
+    assert index.search('') == []
+
+
+def test_prefetch_properties_is_union_of_registered_classes():
+    properties = HardwareClass.prefetch_properties('WIN32_DISKDRIVE')
+
+    assert {'PNPDeviceID', 'Caption', 'SerialNumber'} <= set(properties)
+    assert len(properties) == len({prop.lower() for prop in properties})
+
+
+def test_usb_devices_issue_one_pnp_entity_query(mock_wmi_connection):
+    """PnP entities are fetched once per run, not once per association."""
+    associations = []
+    entities = []
+    for index in range(20):
+        assoc = MagicMock()
+        assoc.antecedent = 'Win32_USBController.DeviceID="USB\\\\ROOT_HUB"'
+        assoc.dependent = f'Win32_PNPEntity.DeviceID="USB\\\\VID_{index:04}"'
+        associations.append(assoc)
+        entities.append(_row(PNPDeviceID=f'USB\\VID_{index:04}', ClassGuid='', Service='mouhid', Description='HID'))
+    mock_wmi_connection.Win32_USBControllerdevice.return_value = associations
+    mock_wmi_connection.query.return_value = entities
+
+    result = UsbDevice().format_data()
+
+    assert len(result) == 20
+    assert [hw.pnpdeviceid for hw in result] == [entity.PNPDeviceID for entity in entities]
+    mock_wmi_connection.query.assert_called_once()
+    wql = mock_wmi_connection.query.call_args[0][0]
+    fields = wql.split(' FROM ')[0][len('SELECT ') :].split(',')
+    assert set(UsbDevice._prefetch_['Win32_PNPEntity']) <= set(fields)
+    assert wql.endswith('FROM Win32_PNPEntity')
+
+
+def test_disk_rows_are_shared_across_instances_in_session(mock_wmi_connection):
+    disks = [_row(PNPDeviceID=f'IDE\\DISK_{index}', Index=index, Size='1', DeviceID=f'D{index}') for index in range(4)]
+    mock_wmi_connection.query.return_value = disks
+
+    with WMIConnection.session():
+        results = [PhysicalDisk(dev_id=f'DISK_{index}').format_data() for index in range(4)]
+
+    assert [result[0].deviceid for result in results] == ['D0', 'D1', 'D2', 'D3']
+    mock_wmi_connection.query.assert_called_once()
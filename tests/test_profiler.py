@@ -0,0 +1,140 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from lshw.__main__ import main
+from lshw.classes.cache_memory import CacheMemory
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.printer import Printer
+from lshw.classes.processor import Processor
+from lshw.classes.profiler import current_profiler, profiling
+
+
+def _cpu(name):
+    return SimpleNamespace(
+        Manufacturer='Intel', Name=name, Description='x64', SocketDesignation='S0', DataWidth=64, MaxClockSpeed=3000
+    )
+
+
+def test_phases_and_queries_are_recorded_per_entity(mock_wmi_connection):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0'), _cpu('CPU 1')]
+
+    with profiling() as profiler, WMIConnection.session():
+        Processor().format_data()
+        Processor().format_data()
+
+    report = profiler.report()
+    (entity,) = report['entities']
+    assert entity['entity'] == 'Processor'
+    assert entity['phases']['get_hardware']['calls'] == 2
+    assert entity['phases']['check_values']['calls'] == 2
+    assert entity['phases']['_populate_hardware']['calls'] == 4
+    # the session does not keep the rows of Processor: each collection reads them
+    assert (entity['queries'], entity['rows'], entity['errors']) == (2, 4, 0)
+
+    (query,) = report['queries']
+    assert query['query'].startswith('Win32_processor(')
+    assert (query['calls'], query['rows'], query['cache_hits']) == (2, 4, 0)
+
+
+def test_cache_hits_of_shared_rows_are_recorded(mock_wmi_connection):
+    mock_wmi_connection.Win32_CacheMemory.return_value = [
+        SimpleNamespace(DeviceID='Cache 0', InstalledSize=32, Level=3, Purpose='L1', Status='OK')
+    ]
+
+    with profiling() as profiler, WMIConnection.session():
+        CacheMemory().format_data()
+        CacheMemory().format_data()
+
+    (query,) = profiler.report()['queries']
+    assert query['query'].startswith('Win32_CacheMemory(')
+    assert (query['calls'], query['rows'], query['cache_hits']) == (1, 1, 1)
+
+
+def test_wql_strings_and_exceptions_are_recorded(mock_wmi_connection):
+    mock_wmi_connection.query.side_effect = RuntimeError('provider failure')
+
+    with profiling() as profiler, WMIConnection.session():
+        # Printer logs provider failures and returns an empty list
+        assert Printer().format_data() == []
+
+    report = profiler.report()
+    (query,) = report['queries']
+    assert query['entity'] == 'Printer'
+    assert query['query'] == 'SELECT DeviceID,Name,Caption,DriverName,PortName,Network,Local FROM Win32_Printer'
+    assert query['errors'] == 1
+    assert report['entities'][0]['phases']['execute_wql_query']['errors'] == 1
+    assert report['entities'][0]['phases']['get_hardware']['errors'] == 0
+
+
+def test_callback_receives_report_and_profiler_is_scoped(mock_wmi_connection):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0')]
+    reports = []
+
+    with profiling(callback=reports.append):
+        Processor().format_data()
+
+    assert current_profiler() is None
+    assert reports[0]['entities'][0]['entity'] == 'Processor'
+
+
+def test_callback_errors_are_not_raised(mock_wmi_connection):
+    with profiling(callback=MagicMock(side_effect=ValueError('telemetry down'))):
+        pass
+
+
+def test_nothing_is_recorded_without_profiling(mock_wmi_connection):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0')]
+
+    with profiling() as profiler:
+        pass
+    Processor().format_data()
+
+    assert profiler.report()['entities'] == []
+
+
+def test_cli_profile_json_goes_to_stderr(mock_wmi_connection, capsys):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0')]
+
+    assert main(['-c', 'processor', '-j', '--profile', 'json']) == 0
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)[0]['product'] == 'CPU 0'
+    assert json.loads(captured.err)['entities'][0]['entity'] == 'Processor'
+
+
+def test_cli_profile_text_report(mock_wmi_connection, capsys):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0')]
+
+    assert main(['-c', 'processor', '--profile']) == 0
+
+    err = capsys.readouterr().err
+    assert err.startswith('Profile:')
+    assert 'Processor' in err and 'Win32_processor(' in err
+
+
+def test_streamed_collection_records_the_same_phases(mock_wmi_connection):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0'), _cpu('CPU 1')]
+
+    with profiling() as collected, WMIConnection.session():
+        Processor().format_data()
+    with profiling() as streamed, WMIConnection.session():
+        assert len(list(Processor().iter_hardware())) == 2
+
+    def phases(profiler):
+        (entity,) = profiler.report()['entities']
+        return {phase: timing['calls'] for phase, timing in entity['phases'].items()}, entity['queries']
+
+    assert phases(streamed) == phases(collected) == ({'get_hardware': 1, 'check_values': 1, '_populate_hardware': 2}, 1)
+
+
+def test_cli_profile_of_a_streamed_run(mock_wmi_connection, capsys):
+    mock_wmi_connection.Win32_processor.return_value = [_cpu('CPU 0'), _cpu('CPU 1')]
+
+    assert main(['-c', 'processor', '--with-children', '--stream', 'ndjson', '--profile', 'json']) == 0
+
+    entities = {entry['entity']: entry for entry in json.loads(capsys.readouterr().err)['entities']}
+    assert entities['Processor']['phases']['get_hardware']['calls'] == 1
+    assert entities['Processor']['phases']['_populate_hardware']['calls'] == 2
+    # CacheMemory is collected once per processor, Processor itself once
+    assert entities['CacheMemory']['phases']['get_hardware']['calls'] == 2
@@ -0,0 +1,215 @@
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.run import compare, measure
+from lshw.__main__ import main
+from lshw.classes.replay import (
+    RecordingWMIConnection,
+    ReplayRow,
+    ReplayWMIConnection,
+    load_fixture,
+    parse_select,
+)
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node.children or [])
+
+
+def _count(nodes, node_id):
+    return sum(node.id.startswith(node_id) for node in _walk(nodes))
+
+
+def test_replay_row_is_case_insensitive_and_read_only():
+    row = ReplayRow({'PNPDeviceID': 'PCI\\X', 'Size': None})
+
+    assert row.pnpdeviceid == 'PCI\\X'
+    assert row.Size is None
+    with pytest.raises(AttributeError):
+        row.Caption  # noqa: B018
+    with pytest.raises(AttributeError):
+        row.Size = 1
+    assert row.associators() == []
+
+
+@pytest.mark.parametrize(
+    ('where', 'expected'),
+    [
+        ('PNPDeviceID="PCI\\VEN_1"', ['a']),
+        ('(NOT PNPDeviceID LIKE "%ROOT%")', ['a', 'c']),
+        ('(PhysicalAdapter=True)', ['a', 'b']),
+        ('Index > 1 AND PhysicalAdapter=False', ['c']),
+        ('DeviceID="a" OR DeviceID="c"', ['a', 'c']),
+        ('Caption IS NULL', ['b']),
+    ],
+)
+def test_where_clauses_are_evaluated_against_tables(where, expected):
+    rows = [
+        {'DeviceID': 'a', 'PNPDeviceID': 'PCI\\VEN_1', 'PhysicalAdapter': True, 'Index': 1, 'Caption': 'A'},
+        {'DeviceID': 'b', 'PNPDeviceID': 'ROOT\\NET\\0000', 'PhysicalAdapter': True, 'Index': 2, 'Caption': None},
+        {'DeviceID': 'c', 'PNPDeviceID': 'USB\\VID_1', 'PhysicalAdapter': False, 'Index': 3, 'Caption': 'C'},
+    ]
+    columns = list(rows[0])
+    connection = ReplayWMIConnection(
+        {
+            'format': 'lshw-wmi-fixture',
+            'tables': {'Win32_NetworkAdapter': {'columns': columns, 'rows': [list(row.values()) for row in rows]}},
+        }
+    )
+
+    result = connection.query(f'SELECT DeviceID FROM Win32_NetworkAdapter WHERE {where}')
+
+    assert [row.DeviceID for row in result] == expected
+
+
+def test_parse_select_rejects_other_statements():
+    with pytest.raises(ValueError):
+        parse_select('ASSOCIATORS OF {Win32_DiskDrive.DeviceID="x"}')
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    disk = SimpleNamespace(DeviceID='\\\\.\\PHYSICALDRIVE0', PNPDeviceID='SCSI\\DISK_0', Size='100')
+    partition = SimpleNamespace(DeviceID='Disk #0, Partition #0', Size='50')
+    partition.path = lambda: SimpleNamespace(Path='\\\\HOST\\root\\cimv2:Win32_DiskPartition.DeviceID="Disk #0"')
+    link = SimpleNamespace(Antecedent='Win32_DiskDrive.DeviceID="x"', Dependent=partition)
+
+    real = MagicMock()
+    real.query.return_value = [disk]
+    real.Win32_DiskDriveToDiskPartition.return_value = [link]
+    recorder = RecordingWMIConnection(real)
+
+    recorder.query('SELECT DeviceID, PNPDeviceID, Size FROM Win32_DiskDrive')
+    recorder.Win32_DiskDriveToDiskPartition(['Antecedent', 'Dependent'])
+    path = tmp_path / 'machine.json.gz'
+    recorder.save(path)
+
+    replay = ReplayWMIConnection(load_fixture(path))
+    (row,) = replay.query('SELECT DeviceID,  PNPDeviceID, Size FROM Win32_DiskDrive')
+    assert (row.DeviceID, row.Size) == ('\\\\.\\PHYSICALDRIVE0', '100')
+
+    (assoc,) = replay.Win32_DiskDriveToDiskPartition(['Dependent', 'Antecedent'])
+    assert assoc.Dependent.endswith('DeviceID="Disk #0"')
+
+    # not recorded verbatim: answered from the merged table view
+    (row,) = replay.query('SELECT Size FROM Win32_DiskDrive WHERE PNPDeviceID="SCSI\\DISK_0"')
+    assert row.Size == '100'
+    assert replay.query('SELECT Size FROM Win32_Printer') == []
+
+
+def test_recorded_rows_are_merged_by_identity():
+    real = MagicMock()
+    real.Win32_PnPEntity.side_effect = [
+        [SimpleNamespace(PNPDeviceID=f'USB\\DEV_{index}', Name=f'Device {index}') for index in range(3)],
+        [SimpleNamespace(PNPDeviceID=f'usb\\dev_{index}', Status='OK') for index in reversed(range(3))],
+        [SimpleNamespace(Name='No id'), SimpleNamespace(Name='No id')],
+    ]
+    recorder = RecordingWMIConnection(real)
+    recorder.Win32_PnPEntity(['PNPDeviceID', 'Name'])
+    recorder.Win32_PnPEntity(['PNPDeviceID', 'Status'])
+    recorder.Win32_PnPEntity(['Name'])
+
+    table = recorder.fixture()['tables']['Win32_PnPEntity']
+    rows = [dict(zip(table['columns'], row)) for row in table['rows']]
+    assert [(row['Name'], row['PNPDeviceID'], row['Status']) for row in rows] == [
+        ('Device 0', 'usb\\dev_0', 'OK'),
+        ('Device 1', 'usb\\dev_1', 'OK'),
+        ('Device 2', 'usb\\dev_2', 'OK'),
+        ('No id', None, None),
+    ]
+
+
+def test_replay_latency_models_round_trips():
+    connection = ReplayWMIConnection(build_fixture(), latency=0.01)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        connection.Win32_Processor()
+
+    assert time.perf_counter() - start >= 0.03
+    assert connection.calls == 3
+
+
+def test_synthetic_fixture_collects_every_device():
+    nodes = collect(connection=ReplayWMIConnection(build_fixture(disks=3, usb_devices=5, nics=2, printers=4)))
+
+    assert _count(nodes, 'printer') == 4
+    assert _count(nodes, 'usb_device') == 5
+    assert len({node.pnpdeviceid for node in _walk(nodes) if node.id == 'disk'}) == 3
+
+
+def test_query_count_does_not_grow_with_flat_device_lists():
+    small = measure(build_fixture(), repeat=1)
+    large = measure(build_fixture(usb_devices=40, nics=10, printers=60), repeat=1)
+
+    assert large['queries'] == small['queries']
+    assert large['nodes'] > small['nodes']
+
+
+def test_partitions_and_volumes_are_fetched_in_batches():
+    small = measure(build_fixture(disks=3), repeat=1)
+    large = measure(build_fixture(disks=60), repeat=1)
+
+    # at most one more OR-ed query for partitions and one for volumes
+    assert large['queries'] - small['queries'] <= 2
+    assert large['nodes'] > small['nodes']
+
+
+def test_compare_reports_regressions():
+    baseline = {'baseline': {'queries': 10, 'seconds': 1.0, 'peak_kib': 100.0}}
+    current = {'baseline': {'queries': 12, 'seconds': 2.0, 'peak_kib': 100.0}}
+
+    failures = compare(current, baseline)
+
+    assert len(failures) == 2
+    assert compare(baseline, baseline) == []
+
+
+def test_cli_replays_fixture(tmp_path, capsys):
+    path = tmp_path / 'machine.json'
+    path.write_text(json.dumps(build_fixture(printers=2)))
+
+    assert main(['--replay', str(path), '-c', 'printer', '-j']) == 0
+
+    assert [node['id'] for node in json.loads(capsys.readouterr().out)] == ['printer:0', 'printer:1']
+
+
+def test_cli_rejects_unreadable_fixture(tmp_path):
+    assert main(['--replay', str(tmp_path / 'missing.json')]) == 2
+
+
+def test_topology_queries_do_not_grow_with_controllers():
+    def queries(controllers):
+        connection = ReplayWMIConnection(
+            build_fixture(disks=40, usb_devices=40, ide_controllers=controllers, usb_controllers=controllers)
+        )
+        nodes = collect('Ide', connection=connection) + collect('Usb', connection=connection)
+        assert sum(len(node.children) for node in nodes) == 80
+        return connection.calls
+
+    assert queries(20) == queries(1)
+
+
+def test_equality_lookups_match_a_full_scan():
+    connection = ReplayWMIConnection(build_fixture(disks=5))
+    disk = connection.table('Win32_DiskDrive')[3]
+    wql = 'SELECT DeviceID FROM Win32_DiskDrive WHERE PNPDeviceID="{}"'
+
+    assert [row.DeviceID for row in connection.query(wql.format(disk.PNPDeviceID.lower()))] == [disk.DeviceID]
+    assert connection.query(wql.format('SCSI\\NOPE')) == []
+
+
+def test_marshalled_values_follow_the_projection():
+    connection = ReplayWMIConnection(build_fixture(printers=3))
+
+    connection.query('SELECT Name,DriverName FROM Win32_Printer')
+    assert connection.values == 6
+    connection.query('SELECT * FROM Win32_Printer')
+    assert connection.values == 6 + 3 * 7
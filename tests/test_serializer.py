@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from lshw import serializer
+from lshw.__main__ import main
+from lshw.classes.hardware import CompactHardware, Hardware
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+
+
+def _tree():
+    nodes = collect(connection=ReplayWMIConnection(build_fixture(disks=2, usb_devices=2, nics=2, printers=2)))
+    extra = Hardware(id='usb:0', vendor='Señor "Tech" \\ Ltd', width=64, configuration={'speed': 1.5, 'ips': ['a']})
+    extra.capabilities = {'usb-3.0': True}
+    extra.children.append(Hardware(id='ñ', claimed=None))
+    return [*nodes, extra]
+
+
+def _expected(nodes, compact):
+    data = [node.to_dict() for node in nodes]
+    return json.dumps(data, separators=(',', ':')) if compact else json.dumps(data, indent=2)
+
+
+@pytest.fixture(params=['stdlib', 'orjson'])
+def backend(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(serializer, 'orjson', None)
+    elif serializer.orjson is None:
+        pytest.skip('orjson is not installed')
+    return request.param
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_dumps_matches_json_dumps_of_to_dict(backend, compact):
+    nodes = _tree()
+
+    assert serializer.dumps(nodes, compact=compact) == _expected(nodes, compact)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_dumpb_decodes_to_the_same_document(backend, compact):
+    nodes = _tree()
+
+    assert json.loads(serializer.dumpb(nodes, compact=compact)) == json.loads(_expected(nodes, compact))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_floats_are_written_as_json_dumps_writes_them(backend, compact):
+    nodes = [Hardware(id='cpu:0', configuration={'ratio': 1e16, 'load': [1e-05, float('nan')]})]
+
+    assert serializer.dumps(nodes, compact=compact) == _expected(nodes, compact)
+    assert serializer.dumpb(nodes, compact=compact) == _expected(nodes, compact).encode()
+
+
+def test_compact_hardware_is_encoded_like_hardware(backend):
+    nodes = _tree()
+
+    assert serializer.dumps([CompactHardware.from_hardware(node) for node in nodes]) == _expected(nodes, False)
+
+
+def test_empty_list(backend):
+    assert serializer.dumps([]) == '[]'
+    assert serializer.dumpb([], compact=True) == b'[]'
+
+
+def test_cli_compact_output(tmp_path, capsys):
+    path = tmp_path / 'machine.json'
+    path.write_text(json.dumps(build_fixture(printers=2)))
+
+    assert main(['--replay', str(path), '-c', 'printer', '--compact']) == 0
+
+    out = capsys.readouterr().out
+    assert '\n' not in out.rstrip('\n')
+    assert [node['id'] for node in json.loads(out)] == ['printer:0', 'printer:1']
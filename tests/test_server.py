@@ -0,0 +1,137 @@
+import copy
+import json
+import os
+import stat
+import threading
+from multiprocessing.connection import Client
+
+import pytest
+
+from lshw import client
+from lshw import server as server_module
+from lshw.__main__ import AVAILABLE_CLASSES, EXIT_USAGE, main
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect_classes
+from lshw.server import InventoryServer
+
+FIXTURE = build_fixture(disks=2, nics=2, printers=2)
+
+
+@pytest.fixture
+def server(tmp_path):
+    now = [100.0]
+    server = InventoryServer(
+        str(tmp_path / 'lshw.sock'), ReplayWMIConnection(FIXTURE), classes=AVAILABLE_CLASSES, clock=lambda: now[0]
+    )
+    server.now = now
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_query_matches_a_local_collection(server):
+    nodes = client.query(['disk', 'network'], children=['disk'], address=server.address)
+
+    expected = collect_classes(
+        ['PhysicalDisk', 'NetworkCard'], ['PhysicalDisk'], connection=ReplayWMIConnection(FIXTURE)
+    )
+    assert nodes == [node.to_dict() for node in expected]
+
+
+def test_whole_computer_by_default(server):
+    nodes = client.query(address=server.address)
+
+    assert [node['class'] for node in nodes] == ['system']
+    assert nodes[0]['children']
+
+
+def test_max_age_reuses_previous_answers(server):
+    connection = server.connection
+    first = client.query(['printer'], address=server.address)
+    calls = connection.calls
+
+    server.now[0] += 30
+    assert client.query(['printer'], max_age=60, address=server.address) == first
+    assert connection.calls == calls
+
+    assert client.request({'classes': ['printer'], 'max_age': 10}, server.address)['age'] == 0
+    assert connection.calls > calls
+
+
+def test_bad_requests_are_answered_with_errors(server):
+    with pytest.raises(client.ServerError, match='Unknown class: nope'):
+        client.query(['nope'], address=server.address)
+    with pytest.raises(client.ServerError, match='must also be in'):
+        client.query(['disk'], children=['network'], address=server.address)
+
+    with Client(server.address) as connection:
+        connection.send_bytes(b'{not json')
+        assert json.loads(connection.recv_bytes())['status'] == 'error'
+
+    # the server keeps serving
+    assert client.query(['printer'], address=server.address)
+
+
+def test_collector_errors_are_answered_without_stopping_the_server(server):
+    broken = copy.deepcopy(FIXTURE)
+    broken['tables']['Win32_SystemEnclosure']['rows'] = [[[]]]  # ChassisTypes=[] raises IndexError
+    healthy, server.connection = server.connection, ReplayWMIConnection(broken)
+
+    with pytest.raises(client.ServerError, match='Could not collect the inventory'):
+        client.query(address=server.address)
+
+    server.connection = healthy
+    assert client.query(['printer'], address=server.address)
+
+
+def test_only_the_latest_answers_are_kept(server, monkeypatch):
+    monkeypatch.setattr(server_module, 'MAX_RESULTS', 2)
+    for name in ('printer', 'memory', 'processor'):
+        assert server.handle({'classes': [name], 'max_age': 60})['status'] == 'ok'
+
+    assert list(server._results) == [(('PhysicalMemory', False),), (('Processor', False),)]
+
+
+def test_socket_is_created_owner_only(tmp_path, monkeypatch):
+    modes = []
+    real_listener = server_module.Listener
+
+    def listener(address):
+        created = real_listener(address)
+        modes.append(stat.S_IMODE(os.stat(address).st_mode))
+        return created
+
+    monkeypatch.setattr(server_module, 'Listener', listener)
+    inventory_server = InventoryServer(str(tmp_path / 'private.sock'))
+    inventory_server.bind()
+    inventory_server._listener.close()
+
+    assert modes and not modes[0] & 0o077
+
+
+def test_client_cli(server, capsys):
+    assert client.main(['-c', 'printer', '--compact', '--address', server.address]) == 0
+    assert [node['id'] for node in json.loads(capsys.readouterr().out)] == ['printer:0', 'printer:1']
+
+    assert client.main(['-c', 'nope', '--address', server.address]) == 1
+    assert 'Unknown class' in capsys.readouterr().err
+
+
+def test_client_without_server(tmp_path, capsys):
+    assert client.main(['--address', str(tmp_path / 'missing.sock')]) == 1
+    assert 'Could not reach the lshw server' in capsys.readouterr().err
+
+
+def test_serve_refuses_a_busy_address_and_replaces_stale_sockets(server, tmp_path):
+    assert main(['--serve', server.address]) == EXIT_USAGE
+
+    stale = tmp_path / 'stale.sock'
+    stale.write_text('')
+    other = InventoryServer(str(stale))
+    other.bind()
+    other._listener.close()
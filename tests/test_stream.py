@@ -0,0 +1,86 @@
+import io
+import json
+
+import pytest
+
+from lshw.__main__ import main
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.parallel import parallel_collection
+from lshw.classes.processor import Processor
+from lshw.classes.replay import ReplayWMIConnection
+from lshw.classes.synthetic import build_fixture
+from lshw.collector import collect
+from lshw.stream import CLOSE, NODE, OPEN, JSONStreamWriter, NDJSONWriter, iter_events, write_stream
+
+FIXTURE = build_fixture(disks=2, usb_devices=3, nics=2, printers=2)
+
+
+def _stream(writer_class, jobs=1, entity='ComputerSystem', children=True):
+    out = io.StringIO()
+    with WMIConnection.session(ReplayWMIConnection(FIXTURE)), parallel_collection(jobs):
+        write_stream(writer_class(out), entity, children)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_json_stream_matches_json_output(jobs):
+    nodes = collect(connection=ReplayWMIConnection(FIXTURE))
+
+    assert _stream(JSONStreamWriter, jobs) == json.dumps([node.to_dict() for node in nodes], indent=2) + '\n'
+
+
+def test_json_stream_of_empty_class():
+    assert _stream(JSONStreamWriter, entity='Power', children=False) == '[]\n'
+
+
+def test_ndjson_lines_rebuild_the_tree():
+    expected = [node.to_dict() for node in collect(connection=ReplayWMIConnection(FIXTURE))]
+
+    roots = []
+    by_path = {}
+    for line in _stream(NDJSONWriter).splitlines():
+        data = json.loads(line)
+        path, parent = data.pop('path'), data.pop('parent')
+        assert path not in by_path
+        # to_dict() key order: children after the base fields
+        node = dict(list(data.items())[:9], children=[], **dict(list(data.items())[9:]))
+        by_path[path] = node
+        (by_path[parent]['children'] if parent else roots).append(node)
+
+    assert roots == expected
+
+
+def test_nodes_are_written_before_the_collection_ends():
+    connection = ReplayWMIConnection(FIXTURE)
+    calls = []
+    with WMIConnection.session(connection):
+        for kind, node in iter_events():
+            calls.append((kind, node.id, connection.calls))
+
+    assert calls[0][:2] == (OPEN, 'BENCH')
+    assert calls[-1][:2] == (CLOSE, 'BENCH')
+    assert calls[0][2] < calls[-1][2]
+    assert any(kind == NODE for kind, _, _ in calls)
+
+
+def test_failing_child_class_is_skipped(monkeypatch, caplog):
+    def fail(self):
+        raise AttributeError('Win32_Processor')
+
+    monkeypatch.setattr(Processor, 'get_hardware', fail)
+    with WMIConnection.session(ReplayWMIConnection(FIXTURE)):
+        ids = [node.id for kind, node in iter_events() if kind != CLOSE]
+
+    assert 'printer:0' in ids
+    assert not any(node_id.startswith('cpu') for node_id in ids)
+    assert 'Could not get children Processor' in caplog.text
+
+
+def test_cli_streams_ndjson(tmp_path, capsys):
+    path = tmp_path / 'machine.json'
+    path.write_text(json.dumps(build_fixture(printers=2)))
+
+    assert main(['--replay', str(path), '-c', 'printer', '--stream', 'ndjson']) == 0
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line['path'], line['parent']) for line in lines] == [('/printer:0', None), ('/printer:1', None)]
@@ -18,7 +18,7 @@ def test_usb_device_basic(mock_wmi_connection):
     mock_pnp.Service = 'mouhid'
 
     def mock_query(wql):
-        if 'USB\\VID_1234' in wql:
+        if 'FROM Win32_PNPEntity' in wql:
             return [mock_pnp]
         return []
 
@@ -42,6 +42,7 @@ def test_usb_device_excluded(mock_wmi_connection):
 
     mock_pnp = MagicMock()
     mock_pnp.Caption = 'USB 2.0 Root Hub'  # Should be excluded
+    mock_pnp.PNPDeviceID = 'USB\\VID_1234'
     mock_pnp.Service = 'usbhub'
 
     def mock_query(wql):
@@ -0,0 +1,181 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from lshw.classes import wmi_cache
+from lshw.classes.hardware_class import WMIConnection
+from lshw.classes.partition_disk import PartitionDisk
+from lshw.classes.wmi_cache import (
+    CachedWMIConnection,
+    join_multithreaded_apartment,
+    normalize_properties,
+    normalize_wql,
+)
+
+
+def test_normalize_wql_collapses_whitespace():
+    assert normalize_wql('SELECT  Name\n FROM   Win32_Bus ') == 'SELECT Name FROM Win32_Bus'
+
+
+def test_normalize_wql_keeps_whitespace_inside_string_literals():
+    assert (
+        normalize_wql('SELECT Name FROM Win32_Bus WHERE  Name="a  b"') == 'SELECT Name FROM Win32_Bus WHERE Name="a  b"'
+    )
+    assert (
+        normalize_wql("SELECT * FROM T WHERE A='x \\' y'  AND B=\"1\"")
+        == "SELECT * FROM T WHERE A='x \\' y' AND B=\"1\""
+    )
+    assert normalize_wql('SELECT * FROM T WHERE A="a b"') != normalize_wql('SELECT * FROM T WHERE A="a  b"')
+
+
+def test_normalize_properties_is_order_and_case_insensitive():
+    assert normalize_properties(['Name', 'DeviceID']) == normalize_properties(['deviceid', 'NAME'])
+    assert normalize_properties(None) == ()
+
+
+def test_query_is_memoized(mock_wmi_connection):
+    """Identical WQL (modulo whitespace) reaches WMI only once."""
+    mock_wmi_connection.query.return_value = [MagicMock()]
+    cache = CachedWMIConnection(mock_wmi_connection)
+
+    first = cache.query('SELECT Name FROM Win32_Bus')
+    second = cache.query('SELECT Name  FROM Win32_Bus')
+
+    assert first == second
+    mock_wmi_connection.query.assert_called_once_with('SELECT Name FROM Win32_Bus')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_method_calls_are_keyed_by_class_and_properties(mock_wmi_connection):
+    mock_wmi_connection.Win32_DiskDrive.return_value = [MagicMock()]
+    cache = CachedWMIConnection(mock_wmi_connection)
+
+    cache.Win32_DiskDrive(['PNPDeviceID', 'Index'])
+    cache.Win32_DiskDrive(['Index', 'PNPDeviceID'])
+    cache.Win32_DiskDrive(['Size'])
+    cache.Win32_DiskDrive()
+
+    assert mock_wmi_connection.Win32_DiskDrive.call_count == 3
+
+
+def test_failed_calls_are_not_cached(mock_wmi_connection):
+    mock_wmi_connection.query.side_effect = [RuntimeError('boom'), ['row']]
+    cache = CachedWMIConnection(mock_wmi_connection)
+
+    with pytest.raises(RuntimeError):
+        cache.query('SELECT Name FROM Win32_Bus')
+
+    assert cache.query('SELECT Name FROM Win32_Bus') == ['row']
+
+
+def test_rows_never_leave_their_com_apartment(mock_wmi_connection):
+    """Rows fetched by the main thread are not served to workers, which share theirs."""
+    mock_wmi_connection.query.side_effect = lambda wql: [MagicMock()]
+    cache = CachedWMIConnection(mock_wmi_connection)
+    main_rows = cache.query('SELECT Name FROM Win32_Bus')
+    worker_rows = []
+
+    def worker():
+        join_multithreaded_apartment()
+        worker_rows.append(cache.query('SELECT Name FROM Win32_Bus'))
+
+    for _ in range(2):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert worker_rows[0] == worker_rows[1] != main_rows
+    assert cache.query('SELECT Name FROM Win32_Bus') == main_rows
+    assert mock_wmi_connection.query.call_count == 2
+
+
+def test_concurrent_misses_reach_wmi_once(monkeypatch, mock_wmi_connection):
+    """Workers asking for a call in flight wait for it; after a failure one of them retries."""
+    started, release = threading.Event(), threading.Event()
+    waiting = threading.Semaphore(0)
+
+    class CountedFlight(wmi_cache._Flight):
+        def __init__(self):
+            super().__init__()
+            wait = self.done.wait
+            self.done.wait = lambda: (waiting.release(), wait())[1]
+
+    monkeypatch.setattr(wmi_cache, '_Flight', CountedFlight)
+    replies = iter([RuntimeError('boom'), ['row'], ['other']])
+
+    def query(wql):
+        started.set()
+        release.wait(5)
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    mock_wmi_connection.query.side_effect = query
+    mock_wmi_connection.Win32_Bus.side_effect = lambda properties: (started.set(), release.wait(5), ['bus'])[2]
+    cache = CachedWMIConnection(mock_wmi_connection)
+    results, errors = [], []
+
+    def worker(call):
+        join_multithreaded_apartment()
+        try:
+            results.append(call())
+        except RuntimeError as e:
+            errors.append(e)
+
+    for call in (lambda: cache.query('SELECT Name FROM Win32_Bus'), lambda: cache.transient('Win32_Bus')(['Name'])):
+        started.clear()
+        release.clear()
+        threads = [threading.Thread(target=worker, args=(call,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        for _ in range(3):
+            waiting.acquire(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert len(errors) == 1
+    assert results == [['row']] * 3 + [['bus']] * 4
+    assert mock_wmi_connection.query.call_count == 2
+    assert mock_wmi_connection.Win32_Bus.call_count == 1
+    assert cache.misses == 2
+    # transient rows are not kept once every waiter has them
+    assert len(cache._results) == 1
+
+
+def test_non_wmi_attributes_are_delegated(mock_wmi_connection):
+    cache = CachedWMIConnection(mock_wmi_connection)
+    assert cache.watch_for is mock_wmi_connection.watch_for
+
+
+def test_connect_is_deferred_until_first_use(mock_wmi_connection):
+    connect = MagicMock(return_value=mock_wmi_connection)
+    cache = CachedWMIConnection(connect=connect)
+
+    connect.assert_not_called()
+    cache.query('SELECT Name FROM Win32_Bus')
+    connect.assert_called_once_with()
+
+
+def test_session_is_shared_and_scoped(mock_wmi_connection):
+    with WMIConnection.session() as session:
+        assert WMIConnection.get_instance() is session
+        with WMIConnection.session() as nested:
+            assert nested is session
+
+    assert WMIConnection.get_instance() is mock_wmi_connection
+
+
+def test_partitions_share_association_scan_in_session(mock_wmi_connection):
+    """Several disks in one run scan Win32_DiskDriveToDiskPartition once."""
+    mock_wmi_connection.Win32_DiskDriveToDiskPartition.return_value = []
+    mock_wmi_connection.query.return_value = []
+
+    with WMIConnection.session():
+        for index in range(3):
+            PartitionDisk(dev_id=f'\\\\.\\PHYSICALDRIVE{index}').format_data()
+
+    assert mock_wmi_connection.Win32_DiskDriveToDiskPartition.call_count == 1